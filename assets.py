@@ -0,0 +1,197 @@
+"""
+assets.py — Pipeline de assets estáticos (CSS + fontes)
+As folhas de estilo ficam em assets/*.css. O app nunca acessa
+fonts.googleapis.com: as fontes (IBM Plex, Outfit, Cormorant Garamond) são
+servidas pelo próprio app a partir de static/fonts/ (server.enableStaticServing)
+quando os .woff2 estão lá. Eles não vêm no repositório: ``fetch-fonts`` os
+baixa numa máquina com internet, e a pasta é copiada para o servidor. Sem
+eles, as páginas usam as fontes do sistema (monospace, sans-serif, serif).
+
+Cada bundle é minificado e gravado em static/<bundle>.<hash>.css. Dois modos:
+  - "inline" (padrão): o CSS minificado vai num <style> a cada rerun. Os
+    @font-face entram compactos e só para fontes presentes em static/fonts/,
+    então o rerun envia menos bytes que o CSS original com o @import.
+  - "link": a página recebe só um <link> para o arquivo com hash, que o
+    navegador guarda em cache. O servidor estático do Streamlit entrega .css
+    como text/plain, então este modo exige um proxy (ex.: NGinx) servindo
+    /app/static/ direto do disco — ver DEPLOY_GUIDE.md.
+
+Uso:
+    python assets.py build         # gera static/*.css + manifest.json
+    python assets.py report        # bytes enviados por rerun: antes × depois
+    python assets.py fetch-fonts   # baixa as fontes (uma vez, com internet)
+Sem dependência de Streamlit.
+"""
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+ROOT       = Path(__file__).resolve().parent
+SRC_DIR    = ROOT / "assets"
+OUT_DIR    = ROOT / "static"
+FONT_DIR   = OUT_DIR / "fonts"
+STATIC_URL = "app/static"
+
+# bundle → arquivos-fonte, na ordem em que são concatenados. Cada bundle
+# recebe só os @font-face (de fonts.css) das famílias que ele usa.
+BUNDLES = {
+    "app":     ("app.css",),
+    "login":   ("login.css",),
+    "sidebar": ("sidebar.css",),
+}
+
+
+def minify(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"\s*:\s*(?=[^{}]*;)", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+_FACE = re.compile(
+    r"font-family:\s*'([^']+)';\s*font-style:\s*(\w+);\s*font-weight:\s*(\d+);.*?url\(fonts/([^)]+)\)",
+    re.S,
+)
+
+
+def _font_faces(body):
+    """@font-face compactos das famílias usadas em ``body`` cujo .woff2 está em static/fonts/.
+
+    Só o necessário vai para o bundle (sem ``local()``, ``format()`` nem o
+    ``font-style`` padrão): no modo inline estas regras viajam a cada rerun.
+    """
+    faces = []
+    for family, style, weight, fname in _FACE.findall((SRC_DIR / "fonts.css").read_text(encoding="utf-8")):
+        if f"'{family}'" not in body or not (FONT_DIR / fname).exists():
+            continue
+        italic = "font-style:italic;" if style == "italic" else ""
+        faces.append(
+            f"@font-face{{font-family:'{family}';{italic}font-weight:{weight};font-display:swap;src:url(fonts/{fname})}}"
+        )
+    return faces
+
+
+def missing_fonts():
+    """Arquivos de assets/fonts.css ainda não baixados para static/fonts/."""
+    names = [m[3] for m in _FACE.findall((SRC_DIR / "fonts.css").read_text(encoding="utf-8"))]
+    return [f for f in names if not (FONT_DIR / f).exists()]
+
+
+def _source(name):
+    body = "".join((SRC_DIR / f).read_text(encoding="utf-8") for f in BUNDLES[name])
+    return "\n".join(_font_faces(body) + [body])
+
+
+@lru_cache(maxsize=None)
+def build():
+    """Minifica os bundles e grava os arquivos com hash (uma vez por processo).
+
+    Retorna ``{bundle: {"file", "css", "inline_css", "raw_bytes"}}``. Se
+    static/ não for gravável, ``file`` fica ``None`` e o modo "link" cai para inline.
+    """
+    manifest = {}
+    for name in BUNDLES:
+        raw = _source(name)
+        css = minify(raw)
+        digest = hashlib.sha256(css.encode()).hexdigest()[:10]
+        fname = f"{name}.{digest}.css"
+        try:
+            OUT_DIR.mkdir(exist_ok=True)
+            out = OUT_DIR / fname
+            if not out.exists():
+                out.write_text(css, encoding="utf-8")
+        except OSError:
+            fname = None
+        manifest[name] = {
+            "file": fname,
+            "css": css,
+            # Inline, as URLs relativas ao arquivo passam a ser relativas à página
+            "inline_css": css.replace("url(fonts/", f"url({STATIC_URL}/fonts/"),
+            "raw_bytes": len(raw.encode()),
+        }
+    try:
+        (OUT_DIR / "manifest.json").write_text(
+            json.dumps({k: v["file"] for k, v in manifest.items()}, indent=2), encoding="utf-8"
+        )
+    except OSError:
+        pass
+    return manifest
+
+
+def style_block(name, link=False):
+    """HTML que aplica o bundle ``name``: ``<link>`` com hash ou ``<style>`` minificado."""
+    entry = build()[name]
+    if link and entry["file"]:
+        return f'<link rel="stylesheet" href="{STATIC_URL}/{entry["file"]}">'
+    return f"<style>{entry['inline_css']}</style>"
+
+
+# ── Relatório ────────────────────────────────────────────────
+def report():
+    """Bytes de CSS enviados por rerun em cada situação: antes × inline × link."""
+    # Antes: CSS original sem minificar + @import do Google Fonts, injetado a cada rerun
+    google = "@import url('https://fonts.googleapis.com/css2?family=...&display=swap');"
+    rows = []
+    for label, bundles in (("App (sidebar + página)", ("app", "sidebar")), ("Tela de login", ("login",))):
+        before = sum(
+            len(f"<style>{google}".encode())
+            + sum(len((SRC_DIR / f).read_bytes()) for f in BUNDLES[b])
+            + len(b"</style>")
+            for b in bundles
+        )
+        inline = sum(len(style_block(b).encode()) for b in bundles)
+        linked = sum(len(style_block(b, link=True).encode()) for b in bundles)
+        rows.append((label, before, inline, linked))
+    return rows
+
+
+# ── Download das fontes ──────────────────────────────────────
+def fetch_fonts():
+    """Baixa o subconjunto latin de cada @font-face de assets/fonts.css para static/fonts/."""
+    import urllib.parse
+    import urllib.request
+
+    ua = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36"}
+    FONT_DIR.mkdir(parents=True, exist_ok=True)
+    for family, style, weight, fname in _FACE.findall((SRC_DIR / "fonts.css").read_text(encoding="utf-8")):
+        axis = f"ital,wght@{1 if style == 'italic' else 0},{weight}"
+        url = "https://fonts.googleapis.com/css2?" + urllib.parse.urlencode({"family": f"{family}:{axis}"})
+        with urllib.request.urlopen(urllib.request.Request(url, headers=ua), timeout=30) as r:
+            css = r.read().decode()
+        m = re.search(r"/\* latin \*/.*?url\((https://[^)]+\.woff2)\)", css, re.S)
+        if not m:
+            print(f"!! {family} {weight} {style}: subconjunto latin não encontrado")
+            continue
+        with urllib.request.urlopen(urllib.request.Request(m.group(1), headers=ua), timeout=30) as r:
+            (FONT_DIR / fname).write_bytes(r.read())
+        print(f"ok {fname}")
+
+
+# ── Linha de comando ─────────────────────────────────────────
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    cmd = argv[0] if argv else "build"
+    if cmd == "build":
+        for name, entry in build().items():
+            print(f"{name:8} → static/{entry['file']}  ({entry['raw_bytes']} → {len(entry['css'])} bytes)")
+    elif cmd == "report":
+        print(f"{'Situação':24} {'antes':>8} {'inline':>8} {'link':>8}   (bytes por rerun)")
+        for label, before, inline, linked in report():
+            print(f"{label:24} {before:>8} {inline:>8} {linked:>8}")
+    elif cmd == "fetch-fonts":
+        fetch_fonts()
+    else:
+        return f"comando desconhecido: {cmd} (use build | report | fetch-fonts)"
+    missing = missing_fonts() if cmd != "fetch-fonts" else []
+    if missing:
+        print(f"!! {len(missing)} fonte(s) ausente(s) em static/fonts/: as páginas usam as fontes do sistema."
+              " Rode `python assets.py fetch-fonts` numa máquina com internet e copie a pasta.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
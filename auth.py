@@ -3,22 +3,137 @@ auth.py — Camada de Autenticação para Business Modeling Studio
 Usa: streamlit-authenticator + secrets.toml (Streamlit Community Cloud compatible)
 Sem dependências externas além de hashlib (stdlib).
 """
+import base64
 import hashlib
 import hmac
+import json
+import os
+import statistics
+import threading
+import time
 import streamlit as st
-from datetime import datetime, timedelta
+from html import escape
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import assets
+from ratelimit import TokenBuckets
+from views.common import md
+from revocations import RevokedTokens
 
 # ─────────────────────────────────────────────────────────────────
 # UTILITÁRIOS DE SENHA
+# Formato novo: scrypt$N$r$p$<salt>$<hash> (salt aleatório por usuário);
+# sem scrypt no OpenSSL: pbkdf2_sha256$<iterações>$<salt>$<hash>.
+# Hashes antigos (SHA-256 hex com AUTH_SALT) continuam aceitos.
+# A verificação roda num pool de threads limitado: o KDF libera o GIL,
+# então uma rajada de logins não trava o rerun das outras sessões.
 # ─────────────────────────────────────────────────────────────────
 
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1     # ~16 MB e ~50 ms por verificação
+PBKDF2_ITERATIONS = 600_000
+KDF_WORKERS       = 4                            # verificações simultâneas (AUTH_KDF_WORKERS)
+VERIFY_TIMEOUT_S  = 15
+
+def _b64(b: bytes) -> str:
+    return base64.b64encode(b).decode()
+
+def _auth_salt() -> str:
+    try:
+        return st.secrets.get("AUTH_SALT", "bms_poc_salt_2025")
+    except Exception:
+        return "bms_poc_salt_2025"
+
 def hash_password(password: str) -> str:
-    """SHA-256 com salt fixo por app. Para produção, use bcrypt."""
-    salt = st.secrets.get("AUTH_SALT", "bms_poc_salt_2025")
+    """Hash com KDF e salt aleatório — é o que vai em ``password_hash``."""
+    salt = os.urandom(16)
+    if hasattr(hashlib, "scrypt"):
+        dk = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, maxmem=64 * 2 ** 20)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(dk)}"
+    dk = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(dk)}"
+
+def legacy_hash(password: str, salt: str) -> str:
+    """Formato antigo: SHA-256 de AUTH_SALT + senha, em hex."""
     return hashlib.sha256(f"{salt}{password}".encode()).hexdigest()
 
+def _check(password: str, hashed: str, legacy_salt: str) -> bool:
+    """Compara ``password`` com ``hashed`` em qualquer formato (roda no pool)."""
+    parts = hashed.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = map(int, parts[1:4])
+            expected = base64.b64decode(parts[5])
+            dk = hashlib.scrypt(password.encode(), salt=base64.b64decode(parts[4]), n=n, r=r, p=p,
+                                maxmem=64 * 2 ** 20, dklen=len(expected))
+            return hmac.compare_digest(dk, expected)
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = base64.b64decode(parts[3])
+            dk = hashlib.pbkdf2_hmac("sha256", password.encode(), base64.b64decode(parts[2]), int(parts[1]),
+                                     dklen=len(expected))
+            return hmac.compare_digest(dk, expected)
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(legacy_hash(password, legacy_salt), hashed)
+
+def needs_rehash(hashed: str) -> bool:
+    """True para hashes no formato antigo (SHA-256), que devem ser regerados."""
+    return not hashed.startswith(("scrypt$", "pbkdf2_sha256$"))
+
+@st.cache_resource
+def _kdf_pool() -> ThreadPoolExecutor:
+    try:
+        workers = int(st.secrets.get("AUTH_KDF_WORKERS", KDF_WORKERS))
+    except Exception:
+        workers = KDF_WORKERS
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth-kdf")
+
 def verify_password(password: str, hashed: str) -> bool:
-    return hmac.compare_digest(hash_password(password), hashed)
+    future = _kdf_pool().submit(_check, password, hashed or "", _auth_salt())
+    try:
+        return future.result(timeout=VERIFY_TIMEOUT_S)
+    except TimeoutError:
+        future.cancel()
+        return False
+
+def measure_login_latency(concurrency: int = 8, attempts: int = 32, password: str = "Demo@2025") -> dict:
+    """Latência de login sob tentativas simultâneas.
+
+    Dispara ``attempts`` verificações a partir de ``concurrency`` threads e,
+    em paralelo, uma thread "de rerun" que acorda a cada 5 ms: seu maior
+    atraso mostra se as verificações estão travando o resto do processo.
+    Tempos em ms.
+    """
+    hashed = hash_password(password)
+    lat, lag, stop = [], [0.0], threading.Event()
+
+    def ticker():
+        while not stop.is_set():
+            t = time.perf_counter()
+            time.sleep(0.005)
+            lag[0] = max(lag[0], (time.perf_counter() - t - 0.005) * 1000)
+
+    def attempt(_):
+        t = time.perf_counter()
+        ok = verify_password(password, hashed)
+        lat.append((time.perf_counter() - t) * 1000)
+        return ok
+
+    tick = threading.Thread(target=ticker, daemon=True)
+    tick.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        ok = all(clients.map(attempt, range(attempts)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    tick.join()
+    lat.sort()
+    return {
+        "ok": ok, "concurrency": concurrency, "attempts": attempts,
+        "workers": _kdf_pool()._max_workers,
+        "p50_ms": statistics.median(lat), "p95_ms": lat[int(len(lat) * 0.95) - 1], "max_ms": lat[-1],
+        "logins_per_s": attempts / wall, "rerun_lag_max_ms": lag[0],
+    }
 
 # ─────────────────────────────────────────────────────────────────
 # BASE DE USUÁRIOS — lida do secrets.toml
@@ -27,46 +142,108 @@ def verify_password(password: str, hashed: str) -> bool:
 # [users]
 # [users.admin]
 # name = "Administrador"
-# password_hash = "abc123..."   # gerado por hash_password()
+# password_hash = "scrypt$16384$8$1$..."   # gerado por hash_password()
 # role = "admin"
 # email = "admin@empresa.com"
 #
 # [users.viewer]
 # name = "Analista"
-# password_hash = "xyz456..."
+# password_hash = "scrypt$16384$8$1$..."
 # role = "viewer"
 # email = "analista@empresa.com"
+#
+# O diretório é montado uma vez por processo e refeito só quando a seção
+# [users] (ou o AUTH_SALT) muda — a chave do cache é um hash do conteúdo.
 # ─────────────────────────────────────────────────────────────────
 
+# ── USUÁRIOS DE DEMO (apenas para POC local) ──────────────
+# Senhas: admin=Admin@2025  |  demo=Demo@2025  |  viewer=View@2025
+DEMO_USERS = {
+    "admin":  ("Administrador",        "Admin@2025", "admin",  "admin@empresa.com"),
+    "demo":   ("Usuário Demo",         "Demo@2025",  "editor", "demo@empresa.com"),
+    "viewer": ("Analista (Read-Only)", "View@2025",  "viewer", "viewer@empresa.com"),
+}
+
+def _plain(v):
+    return {k: _plain(x) for k, x in v.items()} if hasattr(v, "items") else v
+
+@st.cache_resource(max_entries=2)
+def _user_directory(fingerprint: str, _users) -> dict:
+    if _users is None:
+        return {
+            login: {"name": name, "password_hash": hash_password(pwd), "role": role, "email": email}
+            for login, (name, pwd, role, email) in DEMO_USERS.items()
+        }
+    return {login.strip().lower(): dict(data) for login, data in _users.items()}
+
 def get_users() -> dict:
-    """Carrega usuários do secrets.toml. Fallback para demo."""
+    """Carrega usuários do secrets.toml (cache por conteúdo). Fallback para demo."""
     try:
-        return dict(st.secrets["users"])
+        users = _plain(st.secrets["users"])
     except Exception:
-        # ── USUÁRIOS DE DEMO (apenas para POC local) ──────────────
-        # Senhas: admin=Admin@2025  |  demo=Demo@2025  |  viewer=View@2025
-        salt = "bms_poc_salt_2025"
-        def h(p): return hashlib.sha256(f"{salt}{p}".encode()).hexdigest()
-        return {
-            "admin": {
-                "name": "Administrador",
-                "password_hash": h("Admin@2025"),
-                "role": "admin",
-                "email": "admin@empresa.com",
-            },
-            "demo": {
-                "name": "Usuário Demo",
-                "password_hash": h("Demo@2025"),
-                "role": "editor",
-                "email": "demo@empresa.com",
-            },
-            "viewer": {
-                "name": "Analista (Read-Only)",
-                "password_hash": h("View@2025"),
-                "role": "viewer",
-                "email": "viewer@empresa.com",
-            },
-        }
+        users = None
+    fingerprint = hashlib.sha256(json.dumps([users, _auth_salt()], sort_keys=True, default=str).encode()).hexdigest()
+    return _user_directory(fingerprint, users)
+
+# Hash usado quando o usuário não existe: o tempo de resposta não revela logins válidos
+_DUMMY_HASH = f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(bytes(16))}${_b64(bytes(64))}"
+
+# ─────────────────────────────────────────────────────────────────
+# LIMITE DE TENTATIVAS
+# Token buckets compartilhados pelo processo, por login e por endereço do
+# cliente: abrir outra aba não zera o limite. Cada falha consome uma ficha;
+# as fichas voltam aos poucos (5 por login e 20 por endereço a cada 5 min).
+# Com AUTH_RATELIMIT_DB no secrets.toml os baldes vão para SQLite e
+# sobrevivem a um restart.
+# O endereço vem do socket; atrás de proxy, AUTH_TRUSTED_PROXY_HOPS diz
+# quantos proxies confiáveis acrescentam ao X-Forwarded-For, e vale a
+# entrada que o mais externo deles gravou (as anteriores vêm do cliente).
+# Sem endereço confiável, só o limite por login se aplica.
+# ─────────────────────────────────────────────────────────────────
+
+LOGIN_LIMIT   = (5, 300)        # (tentativas, segundos) por login
+ADDRESS_LIMIT = (20, 300)       # por endereço — credential stuffing troca de login
+LIMIT_ENTRIES = 50_000          # baldes em memória, por tipo
+
+@st.cache_resource
+def _login_limiters() -> tuple:
+    try:
+        db_path = st.secrets.get("AUTH_RATELIMIT_DB")
+    except Exception:
+        db_path = None
+    return (
+        TokenBuckets("login", *LOGIN_LIMIT, max_entries=LIMIT_ENTRIES, db_path=db_path),
+        TokenBuckets("address", *ADDRESS_LIMIT, max_entries=LIMIT_ENTRIES, db_path=db_path),
+    )
+
+def _trusted_proxy_hops() -> int:
+    try:
+        return max(0, int(st.secrets.get("AUTH_TRUSTED_PROXY_HOPS", 0)))
+    except Exception:
+        return 0
+
+def _client_address():
+    """IP do cliente para o limite por endereço, ou None se não houver um confiável.
+
+    Sem proxy configurado, o do socket. Com N proxies confiáveis, a N-ésima
+    entrada do X-Forwarded-For a partir da direita: o ``proxy_add_x_forwarded_for``
+    do NGinx acrescenta ao cabeçalho, e o que vem antes o cliente escolhe.
+    """
+    try:
+        hops = _trusted_proxy_hops()
+        if not hops:
+            return st.context.ip_address or None
+        chain = [h.strip() for h in st.context.headers.get("X-Forwarded-For", "").split(",") if h.strip()]
+        return chain[-hops] if len(chain) >= hops else None
+    except Exception:
+        return None
+
+def _limit_keys(login: str) -> list:
+    """Baldes a consultar: sempre o do login; o do endereço só com um IP confiável
+    (um balde comum para "sem endereço" deixaria um atacante bloquear todo mundo)."""
+    by_login, by_address = _login_limiters()
+    address = _client_address()
+    return [(by_login, login)] + ([(by_address, address)] if address else [])
 
 # ─────────────────────────────────────────────────────────────────
 # PAPÉIS E PERMISSÕES
@@ -88,10 +265,110 @@ def get_permission(permission: str) -> bool:
     role = st.session_state.get("user_role", "viewer")
     return ROLE_PERMISSIONS.get(role, {}).get(permission, False)
 
+# ─────────────────────────────────────────────────────────────────
+# TOKEN DE SESSÃO
+# Depois do login a URL ganha ?s=<token>: HMAC-SHA256 sobre login, papel,
+# hora do login, expiração e um id aleatório. Recarregar a página ou
+# reconectar valida o token (sem KDF nem tela de login) e restaura a sessão.
+# O token deixa de valer quando expira (AUTH_TOKEN_TTL_H, padrão 12 h), no
+# logout (id revogado), se o papel do usuário mudar no secrets.toml ou se
+# AUTH_TOKEN_KEY for trocada. Sem AUTH_TOKEN_KEY a chave é gerada no início
+# do processo, e um restart encerra todas as sessões. As revogações vão
+# para o SQLite de AUTH_RATELIMIT_DB (se configurado): valem depois de um
+# restart e para as outras réplicas que usam o mesmo arquivo.
+# O token fica na URL: entra no histórico do navegador e em logs de proxy.
+# ─────────────────────────────────────────────────────────────────
+
+SESSION_PARAM = "s"
+TOKEN_TTL_H   = 12
+
+def _b64url(b: bytes) -> str:
+    return base64.urlsafe_b64encode(b).rstrip(b"=").decode()
+
+def _unb64url(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+@st.cache_resource
+def _token_key() -> bytes:
+    try:
+        key = st.secrets.get("AUTH_TOKEN_KEY")
+    except Exception:
+        key = None
+    return key.encode() if key else os.urandom(32)
+
+@st.cache_resource
+def _revoked() -> RevokedTokens:
+    """Ids dos tokens revogados que ainda não expiraram (SQLite com AUTH_RATELIMIT_DB)."""
+    try:
+        db_path = st.secrets.get("AUTH_RATELIMIT_DB")
+    except Exception:
+        db_path = None
+    return RevokedTokens(db_path)
+
+def _token_ttl() -> float:
+    try:
+        return float(st.secrets.get("AUTH_TOKEN_TTL_H", TOKEN_TTL_H)) * 3600
+    except Exception:
+        return TOKEN_TTL_H * 3600
+
+def _sign(body: str) -> str:
+    return _b64url(hmac.new(_token_key(), body.encode(), hashlib.sha256).digest())
+
+def issue_token(username: str, role: str, login_time: datetime) -> str:
+    claims = {
+        "u": username, "r": role, "t": int(login_time.timestamp()),
+        "e": int(time.time() + _token_ttl()), "j": _b64url(os.urandom(9)),
+    }
+    body = _b64url(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{body}.{_sign(body)}"
+
+def read_token(token: str):
+    """Claims do token se a assinatura confere e ele não expirou nem foi revogado; senão None."""
+    body, _, sig = (token or "").partition(".")
+    try:
+        # Em bytes: o token vem da URL e pode trazer qualquer caractere
+        if not sig or not hmac.compare_digest(sig.encode(), _sign(body).encode()):
+            return None
+        claims = json.loads(_unb64url(body))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(claims, dict) or claims.get("e", 0) < time.time() or claims.get("j") in _revoked():
+        return None
+    return claims
+
+def revoke_token(token: str):
+    claims = read_token(token)
+    if claims is None:
+        return
+    _revoked().add(claims["j"], claims["e"])
+
 # ─────────────────────────────────────────────────────────────────
 # ESTADO DE SESSÃO
 # ─────────────────────────────────────────────────────────────────
 
+def _start_session(login: str, user_data: dict, login_time: datetime, token: str):
+    st.session_state.authenticated = True
+    st.session_state.username = login
+    st.session_state.user_name = user_data["name"]
+    st.session_state.user_role = user_data["role"]
+    st.session_state.user_email = user_data.get("email", "")
+    st.session_state.login_time = login_time
+    st.session_state.session_token = token
+    st.query_params[SESSION_PARAM] = token
+
+def _restore_session() -> bool:
+    """Restaura a sessão a partir do token da URL, se ele for válido."""
+    token = st.query_params.get(SESSION_PARAM)
+    if not token:
+        return False
+    claims = read_token(token)
+    user_data = get_users().get(claims["u"]) if claims else None
+    if not user_data or user_data["role"] != claims["r"]:
+        del st.query_params[SESSION_PARAM]
+        return False
+    _start_session(claims["u"], user_data, datetime.fromtimestamp(claims["t"]), token)
+    return True
+
 def init_auth_state():
     defaults = {
         "authenticated": False,
@@ -100,17 +377,21 @@ def init_auth_state():
         "user_role": "",
         "user_email": "",
         "login_time": None,
-        "login_attempts": 0,
-        "lockout_until": None,
+        "session_token": "",
     }
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
+    if not st.session_state.authenticated:
+        _restore_session()
 
 def logout():
+    revoke_token(st.session_state.get("session_token", ""))
+    if SESSION_PARAM in st.query_params:
+        del st.query_params[SESSION_PARAM]
     keys_to_clear = [
         "authenticated","username","user_name","user_role",
-        "user_email","login_time","login_attempts","lockout_until"
+        "user_email","login_time","session_token"
     ]
     for k in keys_to_clear:
         if k in st.session_state:
@@ -121,217 +402,18 @@ def logout():
 # TELA DE LOGIN
 # ─────────────────────────────────────────────────────────────────
 
+def _asset_link() -> bool:
+    """True se o CSS deve ir por <link> (ASSET_MODE = "link" no secrets.toml)."""
+    try:
+        return st.secrets.get("ASSET_MODE", "inline") == "link"
+    except Exception:
+        return False
+
 def render_login_page():
     """Renderiza a tela de login. Retorna True se autenticado."""
 
-    # Bloqueia por tentativas excessivas
-    if st.session_state.lockout_until:
-        remaining = (st.session_state.lockout_until - datetime.now()).seconds
-        if datetime.now() < st.session_state.lockout_until:
-            st.error(f"🔒 Muitas tentativas. Aguarde {remaining}s para tentar novamente.")
-            st.stop()
-        else:
-            st.session_state.lockout_until = None
-            st.session_state.login_attempts = 0
-
     # ── Layout da tela de login ──────────────────────────────────
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Cormorant+Garamond:ital,wght@0,300;0,400;0,600;1,300;1,400&family=Outfit:wght@300;400;500;600&display=swap');
-
-    /* ── Full-page dark background ── */
-    [data-testid="stAppViewContainer"] {
-        background:
-            radial-gradient(ellipse 80% 50% at 50% -5%, rgba(201,168,76,0.10) 0%, transparent 55%),
-            radial-gradient(ellipse 40% 40% at 90% 90%, rgba(77,217,192,0.06) 0%, transparent 50%),
-            linear-gradient(160deg, #07101f 0%, #0b1a30 45%, #0a1825 100%);
-        min-height: 100vh;
-    }
-    /* Grid overlay */
-    [data-testid="stAppViewContainer"]::before {
-        content: '';
-        position: fixed;
-        inset: 0;
-        background-image:
-            linear-gradient(rgba(201,168,76,0.03) 1px, transparent 1px),
-            linear-gradient(90deg, rgba(201,168,76,0.03) 1px, transparent 1px);
-        background-size: 56px 56px;
-        pointer-events: none;
-        z-index: 0;
-    }
-    [data-testid="stHeader"]  { background: transparent !important; }
-    [data-testid="stSidebar"] { display: none !important; }
-    [data-testid="stToolbar"] { display: none !important; }
-    .block-container { padding-top: 4vh !important; position: relative; z-index: 1; }
-
-    /* ── Wordmark ── */
-    .bv-wordmark {
-        font-family: 'Cormorant Garamond', serif;
-        font-size: 3rem;
-        font-weight: 300;
-        color: #f5f0e8;
-        text-align: center;
-        line-height: 1;
-        letter-spacing: -0.5px;
-        margin-bottom: 0.3rem;
-    }
-    .bv-wordmark .b   { color: #c9a84c; font-weight: 600; font-style: italic; }
-    .bv-wordmark .ai  { font-family: 'Outfit', sans-serif; font-size: 0.38em;
-                        color: #4dd9c0; vertical-align: super; font-weight: 500; letter-spacing: 1px; }
-    .bv-tagline {
-        text-align: center;
-        font-family: 'Outfit', sans-serif;
-        font-size: 0.72rem;
-        letter-spacing: 3.5px;
-        text-transform: uppercase;
-        color: rgba(184,200,216,0.5);
-        margin-bottom: 0.5rem;
-    }
-    .bv-sub {
-        text-align: center;
-        font-family: 'Cormorant Garamond', serif;
-        font-style: italic;
-        font-size: 1rem;
-        color: rgba(201,168,76,0.6);
-        margin-bottom: 2.5rem;
-    }
-
-    /* ── Login card ── */
-    .bv-card {
-        background: rgba(11,26,48,0.7);
-        border: 1px solid rgba(201,168,76,0.18);
-        border-radius: 18px;
-        padding: 2rem 2rem 1.5rem;
-        backdrop-filter: blur(20px);
-        box-shadow: 0 32px 80px rgba(0,0,0,0.5),
-                    inset 0 1px 0 rgba(255,255,255,0.05);
-        position: relative;
-        overflow: hidden;
-    }
-    .bv-card::before {
-        content: '';
-        position: absolute;
-        top: 0; left: 0; right: 0;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, #c9a84c, #4dd9c0, transparent);
-        opacity: 0.7;
-    }
-    .bv-card-title {
-        font-family: 'Cormorant Garamond', serif;
-        font-size: 1.5rem;
-        font-weight: 300;
-        color: #f5f0e8;
-        margin-bottom: 0.2rem;
-    }
-    .bv-card-sub {
-        font-size: 0.78rem;
-        color: rgba(184,200,216,0.5);
-        margin-bottom: 1.6rem;
-        font-family: 'Outfit', sans-serif;
-    }
-
-    /* ── Streamlit input overrides ── */
-    .stTextInput input {
-        background: rgba(255,255,255,0.04) !important;
-        border: 1px solid rgba(201,168,76,0.18) !important;
-        border-radius: 10px !important;
-        color: #f5f0e8 !important;
-        font-family: 'Outfit', sans-serif !important;
-        font-size: 0.9rem !important;
-        transition: all 0.2s !important;
-    }
-    .stTextInput input:focus {
-        border-color: rgba(201,168,76,0.5) !important;
-        background: rgba(201,168,76,0.04) !important;
-        box-shadow: 0 0 0 3px rgba(201,168,76,0.08) !important;
-    }
-    .stTextInput input::placeholder { color: rgba(184,200,216,0.25) !important; }
-    .stTextInput label {
-        color: rgba(184,200,216,0.5) !important;
-        font-size: 0.7rem !important;
-        letter-spacing: 1.5px !important;
-        text-transform: uppercase !important;
-        font-family: 'Outfit', sans-serif !important;
-    }
-
-    /* ── Submit button ── */
-    div[data-testid="stForm"] { background: transparent !important; border: none !important; }
-    .stButton > button {
-        background: linear-gradient(135deg, #a07828, #c9a84c, #e2c97e) !important;
-        background-size: 200% !important;
-        color: #07101f !important;
-        border: none !important;
-        border-radius: 10px !important;
-        font-family: 'Outfit', sans-serif !important;
-        font-weight: 600 !important;
-        font-size: 0.88rem !important;
-        letter-spacing: 1px !important;
-        padding: 0.7rem !important;
-        width: 100% !important;
-        box-shadow: 0 4px 20px rgba(201,168,76,0.3) !important;
-        transition: transform 0.2s, box-shadow 0.2s !important;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 28px rgba(201,168,76,0.45) !important;
-    }
-
-    /* ── AI hint ── */
-    .bv-ai-hint {
-        display: flex;
-        align-items: center;
-        gap: 0.6rem;
-        padding: 0.7rem 0.9rem;
-        border-radius: 9px;
-        background: rgba(77,217,192,0.05);
-        border: 1px solid rgba(77,217,192,0.15);
-        margin-top: 1.2rem;
-    }
-    .bv-ai-dot {
-        width: 7px; height: 7px;
-        border-radius: 50%;
-        background: #4dd9c0;
-        box-shadow: 0 0 8px #4dd9c0;
-        flex-shrink: 0;
-        animation: bvPulse 2s ease-in-out infinite;
-    }
-    @keyframes bvPulse {
-        0%,100% { opacity:1; transform:scale(1); }
-        50%      { opacity:0.4; transform:scale(1.4); }
-    }
-    .bv-ai-text {
-        font-size: 0.73rem;
-        color: rgba(77,217,192,0.7);
-        font-family: 'Outfit', sans-serif;
-        line-height: 1.4;
-    }
-
-    /* ── Demo box ── */
-    .bv-demo {
-        background: rgba(201,168,76,0.05);
-        border: 1px solid rgba(201,168,76,0.15);
-        border-radius: 10px;
-        padding: 0.85rem 1rem;
-        margin-top: 1.2rem;
-        font-family: 'Outfit', sans-serif;
-        font-size: 0.78rem;
-        color: rgba(184,200,216,0.6);
-        line-height: 1.8;
-    }
-    .bv-demo strong { color: rgba(201,168,76,0.8); }
-
-    /* ── Footer ── */
-    .bv-footer {
-        text-align: center;
-        margin-top: 1.5rem;
-        font-family: 'Outfit', sans-serif;
-        font-size: 0.65rem;
-        color: rgba(184,200,216,0.22);
-        letter-spacing: 0.5px;
-        line-height: 1.8;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    md(assets.style_block("login", link=_asset_link()))
 
     # Container centralizado
     _, center, _ = st.columns([1, 2, 1])
@@ -357,30 +439,29 @@ def render_login_page():
             submitted = st.form_submit_button("Acessar plataforma →", use_container_width=True)
 
         if submitted:
-            users = get_users()
-            user_data = users.get(username.strip().lower())
-
-            if user_data and verify_password(password, user_data["password_hash"]):
-                # ✅ Autenticação bem-sucedida
-                st.session_state.authenticated = True
-                st.session_state.username = username.strip().lower()
-                st.session_state.user_name = user_data["name"]
-                st.session_state.user_role = user_data["role"]
-                st.session_state.user_email = user_data.get("email", "")
-                st.session_state.login_time = datetime.now()
-                st.session_state.login_attempts = 0
-                st.rerun()
+            login = username.strip().lower()
+            limits = _limit_keys(login)
+            wait = max(bucket.retry_after(key) for bucket, key in limits)
+            if wait:
+                # Bloqueado: nem chega a gastar uma verificação de KDF
+                st.error(f"🔒 Muitas tentativas. Aguarde {wait:.0f}s para tentar novamente.")
             else:
-                # ❌ Falha
-                st.session_state.login_attempts += 1
-                attempts = st.session_state.login_attempts
-                remaining = max(0, 5 - attempts)
-
-                if attempts >= 5:
-                    st.session_state.lockout_until = datetime.now() + timedelta(minutes=5)
-                    st.error("🔒 Conta bloqueada por 5 minutos após 5 tentativas.")
+                user_data = get_users().get(login)
+                valid = verify_password(password, user_data["password_hash"] if user_data else _DUMMY_HASH)
+                if user_data and valid:
+                    # ✅ Autenticação bem-sucedida
+                    limits[0][0].reset(login)
+                    now = datetime.now()
+                    _start_session(login, user_data, now, issue_token(login, user_data["role"], now))
+                    st.rerun()
                 else:
-                    st.error(f"❌ Usuário ou senha incorretos. {remaining} tentativa(s) restante(s).")
+                    # ❌ Falha
+                    remaining = int(min(bucket.consume(key) for bucket, key in limits))
+                    if remaining == 0:
+                        wait = max(bucket.retry_after(key) for bucket, key in limits)
+                        st.error(f"🔒 Muitas tentativas. Aguarde {wait:.0f}s para tentar novamente.")
+                    else:
+                        st.error(f"❌ Usuário ou senha incorretos. {remaining} tentativa(s) restante(s).")
 
         # AI hint
         st.markdown("""
@@ -420,30 +501,8 @@ def render_user_bar():
     role_label = ROLE_LABELS.get(role, role)
 
     with st.sidebar:
-        st.markdown(f"""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Cormorant+Garamond:ital,wght@0,300;0,600;1,400&family=Outfit:wght@300;400;500;600&display=swap');
-        [data-testid="stSidebar"] {{
-            background: #0b1a30 !important;
-            border-right: 1px solid rgba(201,168,76,0.1) !important;
-        }}
-        [data-testid="stSidebar"] * {{ font-family: 'Outfit', sans-serif; }}
-        [data-testid="stSidebar"] .stButton > button {{
-            background: rgba(255,255,255,0.04) !important;
-            color: rgba(184,200,216,0.7) !important;
-            border: 1px solid rgba(255,255,255,0.07) !important;
-            border-radius: 8px !important;
-            font-size: 0.82rem !important;
-            font-weight: 400 !important;
-            box-shadow: none !important;
-        }}
-        [data-testid="stSidebar"] .stButton > button:hover {{
-            background: rgba(201,168,76,0.08) !important;
-            color: #e2c97e !important;
-            border-color: rgba(201,168,76,0.2) !important;
-            transform: none !important;
-        }}
-        </style>
+        md(assets.style_block("sidebar", link=_asset_link()))
+        md(f"""
         <div style="
             background: linear-gradient(135deg, #07101f, #112240);
             border-radius: 10px;
@@ -459,11 +518,11 @@ def render_user_bar():
                 opacity:0.6;
             "></div>
             <div style="color:rgba(184,200,216,0.4); font-size:0.65rem; letter-spacing:1.5px; text-transform:uppercase; margin-bottom:0.3rem;">Conectado como</div>
-            <div style="color:#f5f0e8; font-weight:600; font-size:0.92rem;">{name}</div>
-            <div style="color:#c9a84c; font-size:0.75rem; margin-top:0.1rem;">{role_label}</div>
+            <div style="color:#f5f0e8; font-weight:600; font-size:0.92rem;">{escape(name)}</div>
+            <div style="color:#c9a84c; font-size:0.75rem; margin-top:0.1rem;">{escape(role_label)}</div>
             {f'<div style="color:rgba(184,200,216,0.3); font-size:0.68rem; margin-top:0.3rem;">desde {login_time.strftime("%H:%M")}</div>' if login_time else ""}
         </div>
-        """, unsafe_allow_html=True)
+        """)
 
         if st.button("🚪 Sair", use_container_width=True, type="secondary"):
             logout()
@@ -481,4 +540,26 @@ def require_auth() -> bool:
     if not st.session_state.authenticated:
         render_login_page()
         st.stop()
+    # Mantém o token na URL (a navegação pode ter limpado os parâmetros)
+    if st.query_params.get(SESSION_PARAM) != st.session_state.session_token:
+        st.query_params[SESSION_PARAM] = st.session_state.session_token
     return True
+
+# ─────────────────────────────────────────────────────────────────
+# LINHA DE COMANDO
+#   python auth.py hash         → gera o password_hash de uma senha
+#   python auth.py bench [N]    → latência de login com N tentativas simultâneas
+# ─────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import getpass
+    import sys
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "hash"
+    if cmd == "hash":
+        print(hash_password(getpass.getpass("Senha: ")))
+    elif cmd == "bench":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+        print(json.dumps(measure_login_latency(concurrency=n, attempts=4 * n), indent=2))
+    else:
+        sys.exit(f"comando desconhecido: {cmd} (use hash | bench)")
@@ -0,0 +1,168 @@
+"""
+run.py — Benchmark das páginas do app com planos sintéticos
+Para cada tamanho de plano, gera o plano (synthetic.py), abre o app com
+``streamlit.testing.v1.AppTest`` já autenticado e mede, por página:
+
+  first_ms    primeira execução da página (caches frios para aquela página)
+  median_ms   mediana das execuções seguintes (caches quentes)
+  html_bytes  HTML emitido (markdown com unsafe_allow_html)
+  msg_bytes   tamanho total das mensagens enviadas ao navegador
+
+Os planos são conexos por padrão (pior caso das consultas transitivas);
+``--lane N`` mede planos em frentes independentes de N tarefas.
+
+Resultados em JSON. Com ``--baseline``, compara com os valores guardados e
+sai com código 1 se alguma página passar da tolerância. Só compara com um
+baseline medido com o mesmo ``--lane``.
+
+    python benchmarks/run.py                           # 100, 1k, 10k e 50k tarefas
+    python benchmarks/run.py --sizes 100 1000 --baseline benchmarks/baseline.json
+    python benchmarks/run.py --sizes 100 1000 --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from synthetic import make_plan, write_plan
+
+ROOT  = Path(__file__).resolve().parents[1]
+SIZES = (100, 1_000, 10_000, 50_000)
+PAGES = ("📊 Dashboard", "📋 Tarefas", "📅 Timeline", "⚖️ Nivelamento", "📈 Burndown", "🔴 Bloqueios", "✏️ Atualizar")
+
+# Regressão: pior que baseline × tolerância + folga absoluta (ruído de máquina em páginas rápidas)
+TIME_TOLERANCE = 1.5
+TIME_SLACK_MS  = 25
+SIZE_TOLERANCE = 1.10
+
+
+def _elements(node):
+    children = getattr(node, "children", None)
+    if children:
+        for child in children.values():
+            yield from _elements(child)
+    elif getattr(node, "proto", None) is not None:
+        yield node
+
+
+def _sizes(at):
+    html = msg = 0
+    for el in [*_elements(at.sidebar), *_elements(at.main)]:
+        msg += el.proto.ByteSize()
+        if el.type == "markdown" and el.proto.allow_html:
+            html += len(el.proto.body.encode())
+    return html, msg
+
+
+def _run(at):
+    t = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - t) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return ms
+
+
+def bench_size(n_tasks, repeat, workdir, timeout, lane=0):
+    tasks, deps = make_plan(n_tasks, lane=lane)
+    plan_id = f"synthetic-{n_tasks}"
+    write_plan(workdir / "projects" / f"{plan_id}.json", tasks, deps)
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+    at.secrets["PLAN_DB_PATH"] = str(workdir / f"{plan_id}.db")
+    at.secrets["PROJECTS_DIR"] = str(workdir / "projects")
+    for k, v in {
+        "authenticated": True, "username": "bench", "user_name": "Benchmark",
+        "user_role": "admin", "login_time": datetime.now(), "project": plan_id,
+    }.items():
+        at.session_state[k] = v
+
+    t = time.perf_counter()
+    _run(at)                                   # carga do plano + seed no PlanDB
+    if at.session_state["project"] != plan_id:
+        raise RuntimeError(f"o app não abriu o projeto {plan_id}")
+    results = {"load_ms": (time.perf_counter() - t) * 1000, "pages": {}}
+    for page in PAGES:
+        at.sidebar.radio[0].set_value(page)
+        first = _run(at)
+        warm = [_run(at) for _ in range(repeat)]
+        html, msg = _sizes(at)
+        results["pages"][page] = {
+            "first_ms": round(first, 1), "median_ms": round(statistics.median(warm), 1),
+            "html_bytes": html, "msg_bytes": msg,
+        }
+        print(f"  {n_tasks:>6} {page:<14} first {first:8.1f} ms · median {statistics.median(warm):8.1f} ms · "
+              f"html {html / 1024:8.1f} KiB · msg {msg / 1024:8.1f} KiB", flush=True)
+    return results
+
+
+def compare(results, baseline):
+    """Lista de regressões ``(tamanho, página, métrica, atual, baseline)``."""
+    out = []
+    for size, res in results["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if not base:
+            continue
+        for page, m in res["pages"].items():
+            b = base["pages"].get(page)
+            if not b:
+                continue
+            if m["median_ms"] > b["median_ms"] * TIME_TOLERANCE + TIME_SLACK_MS:
+                out.append((size, page, "median_ms", m["median_ms"], b["median_ms"]))
+            for key in ("html_bytes", "msg_bytes"):
+                if m[key] > b[key] * SIZE_TOLERANCE:
+                    out.append((size, page, key, m[key], b[key]))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark das páginas com planos sintéticos")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--repeat", type=int, default=3, help="execuções com cache quente por página")
+    ap.add_argument("--timeout", type=float, default=600, help="limite por execução do script (s)")
+    ap.add_argument("--lane", type=int, default=0, help="tarefas por frente independente (0 = plano conexo)")
+    ap.add_argument("--out", default="benchmark-results.json")
+    ap.add_argument("--baseline", help="JSON de referência; regressões fazem o comando falhar")
+    ap.add_argument("--save-baseline", help="grava os resultados também como baseline")
+    a = ap.parse_args(argv)
+
+    results = {
+        "when": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "machine": platform.machine(),
+        "lane": a.lane, "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "projects").mkdir()
+        for n in a.sizes:
+            results["sizes"][str(n)] = bench_size(n, a.repeat, workdir, a.timeout, a.lane)
+
+    Path(a.out).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"resultados → {a.out}")
+    if a.save_baseline:
+        Path(a.save_baseline).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        print(f"baseline → {a.save_baseline}")
+
+    if a.baseline:
+        baseline = json.loads(Path(a.baseline).read_text())
+        if baseline.get("lane", 0) != a.lane:
+            print(f"baseline medido com --lane {baseline.get('lane', 0)}; rode com o mesmo valor para comparar")
+            return 2
+        regressions = compare(results, baseline)
+        for size, page, key, cur, base in regressions:
+            print(f"REGRESSÃO {size} tarefas · {page} · {key}: {cur} (baseline {base})")
+        if regressions:
+            return 1
+        print("sem regressões")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
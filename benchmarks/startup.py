@@ -0,0 +1,109 @@
+"""
+startup.py — Orçamento de tempo de import do app e da linha de comando
+Mede com ``python -X importtime``, num interpretador novo a cada repetição:
+
+  app   imports de topo do app.py (lidos do próprio arquivo), depois do
+        ``import streamlit`` — o custo de partida que é do app, não do Streamlit
+  cli   ``python -m core`` (sem Streamlit), depois do ``site`` — a partida do
+        interpretador (e os .pth do ambiente) não conta
+  page  custo do primeiro acesso a cada página de views/ (só informativo)
+
+Sai com código 1 se ``app`` ou ``cli`` passarem do orçamento (mediana) ou
+se algum módulo pesado (pandas, numpy, pyarrow, openpyxl) entrar na partida.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 9 --app-budget-ms 60
+
+Verificado em tests/test_startup.py (``python -m pytest``).
+"""
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from views import PAGES  # noqa: E402  (só o __init__: não importa as páginas)
+
+APP_BUDGET_MS = 40
+CLI_BUDGET_MS = 25
+HEAVY = ("pandas", "numpy", "pyarrow", "openpyxl")
+
+
+def app_imports(path=ROOT / "app.py"):
+    """Código com os imports de topo do script (os de dentro de funções ficam de fora)."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(n) for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+
+def importtime(code):
+    """``[(módulo, µs acumulados, é de topo)]`` na ordem em que os imports terminaram."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    out = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name[1:]
+        out.append((name.strip(), int(cumulative), name == name.lstrip()))
+    return out
+
+
+def import_cost(code, after=None):
+    """``(ms, módulos)`` dos imports de ``code`` que terminam depois do módulo de topo ``after``."""
+    started, total, modules = after is None, 0, set()
+    for name, cumulative, top in importtime(code):
+        if not started:
+            started = top and name == after
+            continue
+        modules.add(name)
+        if top:
+            total += cumulative
+    return total / 1000, modules
+
+
+def measure(code, repeat, after=None):
+    runs = [import_cost(code, after) for _ in range(repeat)]
+    return statistics.median(ms for ms, _ in runs), runs[0][1]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Orçamento de tempo de import (python -X importtime)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--app-budget-ms", type=float, default=APP_BUDGET_MS)
+    ap.add_argument("--cli-budget-ms", type=float, default=CLI_BUDGET_MS)
+    a = ap.parse_args(argv)
+
+    base = "import streamlit\n" + app_imports()
+    failures = []
+    for name, code, after, budget in (
+        ("app", base, "streamlit", a.app_budget_ms),
+        ("cli", "import core.__main__", "site", a.cli_budget_ms),
+    ):
+        ms, modules = measure(code, a.repeat, after)
+        heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY)
+        print(f"  {name:<5} {ms:7.1f} ms  (orçamento {budget:.0f} ms){'  pesados: ' + ', '.join(heavy) if heavy else ''}")
+        if ms > budget:
+            failures.append(f"{name}: {ms:.1f} ms > {budget:.0f} ms")
+        if heavy or (name == "cli" and "streamlit" in modules):
+            failures.append(f"{name}: importa {', '.join(heavy or ['streamlit'])} na partida")
+
+    # Primeiro acesso a cada página, já com o app carregado
+    last = [name for name, _, top in importtime(base) if top][-1]
+    for page, module in PAGES.items():
+        ms, _ = measure(f"{base}\nimport views.{module}", a.repeat, last)
+        print(f"  page  {ms:7.1f} ms  {page}")
+
+    for f in failures:
+        print(f"ACIMA DO ORÇAMENTO {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
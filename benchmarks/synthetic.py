@@ -0,0 +1,81 @@
+"""
+synthetic.py — Planos sintéticos para benchmark
+Gera tarefas no formato de TASKS_RAW e dependências no formato de DEPS, com
+número de tarefas, de fases e densidade de dependências configuráveis.
+O grafo é sempre acíclico (cada tarefa só depende de tarefas anteriores) e
+as datas respeitam as dependências. Determinístico para a mesma ``seed``.
+
+Por padrão o plano é conexo: cada tarefa pode depender das WINDOW anteriores,
+então as cadeias atravessam o plano inteiro (o pior caso para consultas
+transitivas). ``lane`` divide o plano em frentes independentes de ``lane``
+tarefas, sem dependências entre si.
+
+    python benchmarks/synthetic.py 10000 plano.json [--fases 12 --densidade 1.5 --lane 200]
+Sem dependência de Streamlit.
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+
+RESPS    = ("Gestor TI", "DBA", "Infra", "SysAdmin", "Seguranca", "TI", "Consultor")
+STATUSES = ("pendente", "pendente", "pendente", "em andamento", "concluido", "concluido", "bloqueado")
+VERBOS   = ("Instalar", "Configurar", "Validar", "Provisionar", "Documentar", "Testar", "Migrar")
+OBJETOS  = ("servidor", "banco de dados", "certificado", "integração LDAP", "backup", "NGinx", "Tomcat")
+START    = date(2025, 2, 3)
+WINDOW   = 50     # dependências vêm das últimas WINDOW tarefas (grafo "local", como um plano real)
+
+
+def make_plan(n_tasks, n_fases=8, density=1.5, seed=0, avisos=0.02, lane=0):
+    """``(tasks, deps)``: ``n_tasks`` tarefas em ``n_fases`` fases, ~``density`` deps por tarefa.
+
+    ``lane`` > 0 separa o plano em blocos de ``lane`` tarefas sem dependências
+    entre si (frentes paralelas); 0 gera um plano conexo.
+    """
+    rnd = random.Random(seed)
+    lane = lane or max(n_tasks, 1)
+    per_fase = -(-n_tasks // n_fases)
+    tasks, deps, fim_of = [], {}, []
+    for i in range(n_tasks):
+        tid = f"T{i + 1:0{len(str(n_tasks))}d}"
+        lo = max(i - i % lane, i - WINDOW)
+        if i % lane == 0:
+            lane_start = rnd.randrange(60)
+        k = int(density) + (rnd.random() < density % 1)
+        preds = rnd.sample(range(lo, i), min(k, i - lo))
+        ini = max((fim_of[p] + 1 for p in preds), default=lane_start + rnd.randrange(5))
+        fim = ini + rnd.randrange(3)
+        fim_of.append(fim)
+        tasks.append((
+            f"Fase {i // per_fase + 1:02d}", tid,
+            f"{rnd.choice(VERBOS)} {rnd.choice(OBJETOS)} #{i + 1}", rnd.choice(RESPS),
+            (START + timedelta(days=ini)).isoformat(), (START + timedelta(days=fim)).isoformat(),
+            rnd.choice(STATUSES), "Atenção: janela de manutenção" if rnd.random() < avisos else "",
+        ))
+        if preds:
+            deps[tid] = [tasks[p][1] for p in sorted(preds)]
+    return tasks, deps
+
+
+def write_plan(path, tasks, deps):
+    """Grava em JSON no formato aceito por plan_import (campo ``deps`` como lista)."""
+    fields = ("fase", "id", "nome", "resp", "ini", "fim", "status", "aviso")
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(
+            [dict(zip(fields, t), deps=deps.get(t[1], [])) for t in tasks],
+            fp, ensure_ascii=False, separators=(",", ":"),
+        )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Gera um plano sintético em JSON")
+    ap.add_argument("tarefas", type=int)
+    ap.add_argument("saida")
+    ap.add_argument("--fases", type=int, default=8)
+    ap.add_argument("--densidade", type=float, default=1.5, help="dependências por tarefa (média)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--lane", type=int, default=0, help="tarefas por frente independente (0 = plano conexo)")
+    a = ap.parse_args()
+    tasks, deps = make_plan(a.tarefas, a.fases, a.densidade, a.seed, lane=a.lane)
+    write_plan(a.saida, tasks, deps)
+    print(f"{len(tasks)} tarefas · {a.fases} fases · {sum(map(len, deps.values()))} dependências → {a.saida}")
@@ -0,0 +1,14 @@
+"""
+core — Modelo do plano, sem dependência de Streamlit
+Armazenamento das tarefas, grafo de dependências, agregados de status,
+caminho crítico, persistência e relatórios. Usado pelo app e pela linha de
+comando (``python -m core``). Os módulos que puxam bibliotecas pesadas
+(``burndown`` → pandas, importação XLSX → openpyxl) só são carregados quando
+importados explicitamente.
+"""
+from .cpm import CPMSchedule
+from .plan_graph import DepGraph, PlanGraphError
+from .rollups import StatusRollup
+from .task_store import TaskStore
+
+__all__ = ["CPMSchedule", "DepGraph", "PlanGraphError", "StatusRollup", "TaskStore"]
@@ -0,0 +1,118 @@
+"""
+__main__.py — Relatórios do plano pela linha de comando (cron, CI)
+Não importa Streamlit nem pandas: sobe em dezenas de milissegundos.
+
+    python -m core kpis                               # plano padrão, JSON
+    python -m core blockers --format text
+    python -m core all --plan projects/obra.csv --db /var/lib/sesuite/plan_state.db
+    python -m core blockers --strict                  # código 1 se houver bloqueios
+
+O estado (status/aviso) vem do PlanDB em ``--db`` quando o arquivo existe;
+tarefas ainda não gravadas lá usam o status do próprio plano. O banco é
+aberto só para leitura: o relatório não altera o arquivo nem disputa a
+trava de escrita com o app.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from . import report
+from .persistence import ReadOnlyPlanDB
+from .plan_data import DEFAULT_PLAN_ID, DEPS, TASKS_RAW
+from .plan_import import PlanImportError, load_plan
+from .task_store import TaskStore
+
+DEFAULT_DB = "plan_state.db"
+
+
+def open_plan(path):
+    """``(plan_id, store)``: o arquivo indicado (ID = nome sem extensão) ou o plano padrão."""
+    if path is None:
+        return DEFAULT_PLAN_ID, TaskStore(TASKS_RAW, DEPS)
+    path = Path(path)
+    with path.open("rb") as fp:
+        return path.stem, load_plan(fp, path.name)
+
+
+def open_state(store, plan_id, db_path):
+    if not db_path or not Path(db_path).exists():
+        return report.plan_state(store)
+    db = ReadOnlyPlanDB(db_path)                    # relatório não grava nem trava o banco
+    try:
+        return report.plan_state(store, db, plan_id)
+    finally:
+        db.close()
+
+
+# ── Saída em texto ──────────────────────────────────────────
+def _text_kpis(k):
+    out = [f"Tarefas: {k['total']} · concluídas {k['concluidas']} ({k['pct']}%) · "
+           f"em andamento {k['em_andamento']} · bloqueadas {k['bloqueadas']} · pendentes {k['pendentes']}"]
+    width = max((len(f) for f in k["fases"]), default=0)
+    for fase, c in k["fases"].items():
+        out.append(f"  {fase:<{width}}  {c['concluidas']:>5}/{c['total']:<5} {c['pct']:>3}%"
+                   f"  bloqueadas {c['bloqueadas']}")
+    return out
+
+
+def _text_blockers(rows):
+    out = [f"Bloqueios: {len(rows)}"]
+    for b in rows:
+        out.append(f"  {b['id']} [{b['status']}] {b['nome']} — {b['resp']} · trava {b['trava']}")
+        if b["aviso"]:
+            out.append(f"      aviso: {b['aviso']}")
+        if b["pendentes"]:
+            more = f" (+{b['indiretas']} indiretas)" if b["indiretas"] else ""
+            out.append("      aguarda: " + ", ".join(b["pendentes"]) + more)
+    return out
+
+
+def _text_deps(rows):
+    out = [f"Dependências pendentes em tarefas iniciadas: {len(rows)}"]
+    for r in rows:
+        out.append(f"  {r['id']} [{r['status']}] ← {', '.join(r['deps_pendentes'])}")
+    return out
+
+
+TEXT = {"kpis": _text_kpis, "blockers": _text_blockers, "deps": _text_deps}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m core", description="KPIs e bloqueios do plano")
+    ap.add_argument("report", choices=("kpis", "blockers", "deps", "all"))
+    ap.add_argument("--plan", help="arquivo do plano (CSV, XLSX, JSON/JSONL); padrão: plano embutido")
+    ap.add_argument("--db", default=DEFAULT_DB, help=f"PlanDB com o estado das tarefas (padrão: {DEFAULT_DB})")
+    ap.add_argument("--format", choices=("json", "text"), default="json")
+    ap.add_argument("--strict", action="store_true", help="sai com código 1 se houver bloqueios")
+    a = ap.parse_args(argv)
+
+    try:
+        plan_id, store = open_plan(a.plan)
+    except (OSError, PlanImportError) as e:
+        print(f"erro ao abrir o plano: {e}", file=sys.stderr)
+        return 2
+    state = open_state(store, plan_id, a.db)
+
+    wanted = ("kpis", "blockers", "deps") if a.report == "all" else (a.report,)
+    build = {
+        "kpis": lambda: report.kpis(store, state),
+        "blockers": lambda: report.blockers(store, state),
+        "deps": lambda: report.dependency_issues(store, state),
+    }
+    result = {name: build[name]() for name in wanted}
+
+    if a.format == "json":
+        print(json.dumps({"plan": plan_id, **result}, ensure_ascii=False, indent=2))
+    else:
+        lines = [f"Plano {plan_id}"]
+        for name in wanted:
+            lines += TEXT[name](result[name])
+        print("\n".join(lines))
+
+    blocked = result["blockers"] if "blockers" in result else report.blockers(store, state)
+    return 1 if a.strict and blocked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+burndown.py — Burndown/burnup e vazão semanal do plano
+Planejado: tarefas cujo ``fim`` já chegou, acumulado por dia.
+Realizado: tarefas em "concluido" a cada dia, a partir do histórico de status
+(``PlanDB.history``): +1 quando a tarefa entra em concluído, −1 se é reaberta.
+Tudo vetorizado com pandas (groupby + resample), para o plano inteiro, por
+fase e por responsável de uma vez. Sem dependência de Streamlit.
+"""
+from datetime import datetime
+
+import pandas as pd
+
+DONE = "concluido"
+TOTAL = ("total", "Plano")
+
+
+def _local(ts):
+    """Epoch (s) → datetime local sem fuso."""
+    tz = datetime.now().astimezone().tzinfo
+    return pd.to_datetime(ts, unit="s", utc=True).dt.tz_convert(tz).dt.tz_localize(None)
+
+
+def _daily(df, when, value, index):
+    """Soma diária de ``value``: coluna total + uma por fase e por responsável."""
+    parts = {"total": df.groupby(pd.Grouper(key=when, freq="D"))[value].sum().rename(TOTAL[1]).to_frame()}
+    for dim in ("fase", "resp"):
+        parts[dim] = df.groupby([pd.Grouper(key=when, freq="D"), dim])[value].sum().unstack(fill_value=0)
+    return pd.concat(parts, axis=1).reindex(index).fillna(0)
+
+
+def build(store, history, today=None):
+    """Séries do plano.
+
+    ``history``: ``[(ts, tid, status), ...]`` em ordem. Retorna um dict com
+    ``planned`` e ``actual`` (acumulados diários), ``weekly`` (conclusões por
+    semana) e ``scope`` (tarefas por coluna). Colunas: MultiIndex
+    ``("total", "Plano")``, ``("fase", <fase>)``, ``("resp", <resp>)``.
+    """
+    today = pd.Timestamp(today or datetime.now()).normalize()
+    tasks = pd.DataFrame({
+        "tid": store.tid, "fase": store.fase, "resp": store.resp,
+        "ini": pd.to_datetime(store.ini), "fim": pd.to_datetime(store.fim), "n": 1,
+    })
+
+    h = pd.DataFrame(history, columns=["ts", "tid", "status"])
+    h = h[h["tid"].isin(tasks["tid"])]
+    done = h["status"].eq(DONE).astype("int8")
+    h = h.assign(delta=done - done.groupby(h["tid"]).shift(fill_value=0))
+    h = h[h["delta"] != 0]
+    h = h.assign(ts=_local(h["ts"])).merge(tasks[["tid", "fase", "resp"]], on="tid")
+    h["gain"] = h["delta"].clip(lower=0)
+
+    first = min(tasks["ini"].min(), h["ts"].min() if len(h) else today).normalize()
+    last  = max(tasks["fim"].max(), today)
+    index = pd.date_range(first, last, freq="D")
+
+    planned = _daily(tasks, "fim", "n", index).cumsum()
+    actual  = _daily(h, "ts", "delta", index).reindex(columns=planned.columns, fill_value=0).cumsum()
+    actual.loc[actual.index > today] = float("nan")   # sem "realizado" no futuro
+    gains   = _daily(h, "ts", "gain", index).reindex(columns=planned.columns, fill_value=0)
+    weekly  = gains.loc[:today].resample("W-MON", label="left", closed="left").sum()
+
+    return {"planned": planned, "actual": actual, "weekly": weekly, "scope": planned.iloc[-1]}
+
+
+def view(frames, col=TOTAL):
+    """Tabelas prontas para gráfico de uma coluna (plano, fase ou responsável)."""
+    planned, actual = frames["planned"][col], frames["actual"][col]
+    scope = frames["scope"][col]
+    burnup = pd.DataFrame({"Planejado": planned, "Realizado": actual})
+    burndown = scope - burnup
+    weekly = frames["weekly"][col].rename("Concluídas")
+    return burnup, burndown, weekly
+
+
+def velocity(weekly, weeks=4):
+    """Média de conclusões por semana nas últimas ``weeks`` semanas."""
+    tail = weekly.tail(weeks)
+    return float(tail.mean()) if len(tail) else 0.0
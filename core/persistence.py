@@ -0,0 +1,484 @@
+"""
+persistence.py — Persistência do estado das tarefas em SQLite (WAL)
+Uma conexão de escrita (serializada por lock) + um pool de conexões de
+leitura. As leituras são servidas de um cache do processo, invalidado por um
+contador de versão por plano: um rerun só toca o disco se o dado mudou.
+
+O estado é compartilhado entre sessões: cada tarefa guarda ``rev`` (versão do
+plano na última escrita), gravações individuais usam compare-and-swap sobre
+``rev`` e cada sessão puxa apenas as tarefas alteradas desde a última versão
+que viu (``changes_since``).
+
+Toda alteração também entra num diário só de acréscimo (``task_event``: quem,
+quando, status e aviso resultantes). A cada ``SNAPSHOT_EVERY`` eventos o
+estado inteiro vira um snapshot; ``state_at`` reconstrói o plano em qualquer
+instante a partir do snapshot mais próximo + os eventos seguintes. Eventos
+com mais de ``JOURNAL_RETAIN_DAYS`` dias são compactados em um snapshot por
+dia (a posição histórica passa a ter granularidade diária).
+
+``ReadOnlyPlanDB`` lê o mesmo arquivo só para consulta (relatórios da linha
+de comando): nada de schema, pragmas ou trava de escrita.
+
+Datas recalculadas pelo nivelamento (leveling.py) ficam em ``task_dates``,
+por cima das do arquivo do plano; gravá-las avança a versão do plano para
+que as outras sessões percebam a mudança.
+Sem dependência de Streamlit (o app guarda a instância via st.cache_resource).
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_state (
+    plan_id TEXT    NOT NULL,
+    tid     TEXT    NOT NULL,
+    status  TEXT    NOT NULL,
+    aviso   TEXT    NOT NULL DEFAULT '',
+    rev     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (plan_id, tid)
+);
+CREATE TABLE IF NOT EXISTS plan_meta (
+    plan_id TEXT    PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS task_event (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    plan_id TEXT    NOT NULL,
+    tid     TEXT    NOT NULL,
+    version INTEGER NOT NULL,
+    ts      REAL    NOT NULL,
+    author  TEXT    NOT NULL DEFAULT '',
+    status  TEXT    NOT NULL,
+    aviso   TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS task_event_plan ON task_event (plan_id, seq);
+CREATE TABLE IF NOT EXISTS plan_snapshot (
+    plan_id TEXT    NOT NULL,
+    seq     INTEGER NOT NULL,   -- último evento incluído no snapshot
+    version INTEGER NOT NULL,
+    ts      REAL    NOT NULL,
+    state   TEXT    NOT NULL,   -- JSON {tid: [status, aviso]}
+    PRIMARY KEY (plan_id, seq)
+);
+CREATE TABLE IF NOT EXISTS task_dates (
+    plan_id TEXT    NOT NULL,
+    tid     TEXT    NOT NULL,
+    ini     TEXT    NOT NULL,
+    fim     TEXT    NOT NULL,
+    rev     INTEGER NOT NULL,   -- versão do plano em que as datas foram gravadas
+    ts      REAL    NOT NULL,
+    author  TEXT    NOT NULL DEFAULT '',
+    PRIMARY KEY (plan_id, tid)
+);
+"""
+
+# Quantas versões recentes ficam no log de alterações em memória
+CHANGE_LOG_SIZE = 2048
+# Diário: eventos entre snapshots e idade a partir da qual são compactados
+SNAPSHOT_EVERY      = 500
+JOURNAL_RETAIN_DAYS = 90
+# Autor dos eventos gerados pela carga do plano (seed)
+SEED_AUTHOR = "(carga)"
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class PlanDB:
+    """Estado persistido das tarefas (status, aviso, rev) de um ou mais planos."""
+
+    def __init__(self, path, readers=4):
+        self.path = path
+        self._wlock = threading.RLock()
+        self._writer = _connect(path)
+        self._writer.executescript(SCHEMA)
+        self._readers = queue.Queue()
+        for _ in range(readers):
+            self._readers.put(_connect(path))
+        self._cache = {}          # plan_id → (version, {tid: {"status", "aviso", "rev"}})
+        self._log   = {}          # plan_id → deque[(version, (tid, ...))]
+        self._dates = {}          # plan_id → (rev, {tid: (ini, fim)})
+        self._data_version = None
+
+    def close(self):
+        with self._wlock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    # ── Conexões ────────────────────────────────────────────
+    @contextmanager
+    def _reader(self):
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _tx(self):
+        with self._wlock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._invalidate()
+                raise
+
+    def _invalidate(self, plan_id=None):
+        if plan_id is None:
+            self._cache.clear()
+            self._log.clear()
+            self._dates.clear()
+        else:
+            self._cache.pop(plan_id, None)
+            self._log.pop(plan_id, None)
+            self._dates.pop(plan_id, None)
+
+    def _bump(self, conn, plan_id):
+        conn.execute(
+            "INSERT INTO plan_meta (plan_id, version) VALUES (?, 1) "
+            "ON CONFLICT(plan_id) DO UPDATE SET version = version + 1",
+            (plan_id,),
+        )
+        return conn.execute("SELECT version FROM plan_meta WHERE plan_id = ?", (plan_id,)).fetchone()[0]
+
+    def _check_external(self):
+        """Descarta o cache se outra conexão (outro processo) gravou no banco."""
+        with self._wlock:
+            dv = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            if dv != self._data_version:
+                self._data_version = dv
+                self._invalidate()
+
+    # ── Carga inicial ───────────────────────────────────────
+    def seed(self, plan_id, tasks):
+        """Insere o status inicial das tarefas que ainda não existem no banco."""
+        with self._tx() as conn:
+            conn.execute("INSERT OR IGNORE INTO plan_meta (plan_id, version) VALUES (?, 0)", (plan_id,))
+            if not conn.execute(
+                "SELECT 1 FROM task_event WHERE plan_id = ? UNION ALL "
+                "SELECT 1 FROM plan_snapshot WHERE plan_id = ? LIMIT 1", (plan_id, plan_id),
+            ).fetchone():
+                # Banco anterior ao diário: o estado atual vira a linha de base
+                self._snapshot(conn, plan_id, 0)
+            new = [
+                t for t in tasks
+                if conn.execute(
+                    "INSERT OR IGNORE INTO task_state (plan_id, tid, status, aviso) VALUES (?, ?, ?, ?)",
+                    (plan_id, t[1], t[6], t[7]),
+                ).rowcount
+            ]
+            if new:
+                # Tarefas novas: as sessões abertas precisam recarregar tudo
+                version = self._bump(conn, plan_id)
+                conn.executemany(
+                    "INSERT INTO task_event (plan_id, tid, version, ts, author, status, aviso) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(plan_id, t[1], version, time.time(), SEED_AUTHOR, t[6], t[7]) for t in new],
+                )
+            self._invalidate(plan_id)
+
+    # ── Leitura ─────────────────────────────────────────────
+    def version(self, plan_id):
+        return self.load(plan_id)[0]
+
+    def load(self, plan_id):
+        """``(version, state)`` do plano. ``state`` é compartilhado: não altere."""
+        self._check_external()
+        cached = self._cache.get(plan_id)
+        if cached:
+            return cached
+        with self._reader() as conn:
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT version FROM plan_meta WHERE plan_id = ?", (plan_id,)).fetchone()
+            rows = conn.execute(
+                "SELECT tid, status, aviso, rev FROM task_state WHERE plan_id = ?", (plan_id,)
+            ).fetchall()
+            conn.execute("COMMIT")
+        state = {tid: {"status": s, "aviso": a, "rev": r} for tid, s, a, r in rows}
+        loaded = (row[0] if row else 0, state)
+        with self._wlock:
+            # Um escritor pode ter publicado versão mais nova enquanto líamos
+            cached = self._cache.get(plan_id)
+            if cached is None or cached[0] < loaded[0]:
+                self._cache[plan_id] = cached = loaded
+        return cached
+
+    def dates(self, plan_id):
+        """``(rev, {tid: (ini, fim)})``: datas gravadas por cima do plano; ``rev`` 0 se não há nenhuma."""
+        self._check_external()
+        cached = self._dates.get(plan_id)
+        if cached:
+            return cached
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT tid, ini, fim, rev FROM task_dates WHERE plan_id = ?", (plan_id,)
+            ).fetchall()
+        loaded = (max((r[3] for r in rows), default=0), {tid: (i, f) for tid, i, f, _ in rows})
+        with self._wlock:
+            cached = self._dates.get(plan_id)
+            if cached is None or cached[0] < loaded[0]:
+                self._dates[plan_id] = cached = loaded
+        return cached
+
+    def changes_since(self, plan_id, since):
+        """Tarefas alteradas depois da versão ``since``.
+
+        Retorna ``(version, {tid: row})``, ou ``None`` quando o log em memória
+        já não cobre ``since`` — nesse caso o chamador recarrega com ``load``.
+        """
+        self.load(plan_id)
+        with self._wlock:
+            version, state = self._cache[plan_id]
+            if since == version:
+                return version, {}
+            log = self._log.get(plan_id)
+            if since > version or not log or log[0][0] > since + 1:
+                return None
+            tids = set()
+            for v, ids in reversed(log):
+                if v <= since:
+                    break
+                tids.update(ids)
+            return version, {tid: state[tid] for tid in tids}
+
+    # ── Diário / posição histórica ──────────────────────────
+    def state_at(self, plan_id, ts):
+        """``{tid: {"status", "aviso", "rev"}}`` como estava no instante ``ts`` (epoch).
+
+        Parte do snapshot mais recente até ``ts`` e reaplica só os eventos
+        posteriores a ele. Tarefas que ainda não existiam ficam de fora.
+        """
+        with self._reader() as conn:
+            conn.execute("BEGIN")
+            snap = conn.execute(
+                "SELECT seq, version, state FROM plan_snapshot WHERE plan_id = ? AND ts <= ? "
+                "ORDER BY seq DESC LIMIT 1", (plan_id, ts),
+            ).fetchone()
+            seq, version = (snap[0], snap[1]) if snap else (0, 0)
+            state = {
+                tid: {"status": s, "aviso": a, "rev": version}
+                for tid, (s, a) in (json.loads(snap[2]) if snap else {}).items()
+            }
+            for tid, v, s, a in conn.execute(
+                "SELECT tid, version, status, aviso FROM task_event "
+                "WHERE plan_id = ? AND seq > ? AND ts <= ? ORDER BY seq", (plan_id, seq, ts),
+            ):
+                state[tid] = {"status": s, "aviso": a, "rev": v}
+            conn.execute("COMMIT")
+        return state
+
+    def history(self, plan_id):
+        """Todas as mudanças de status conhecidas, em ordem: ``[(ts, tid, status), ...]``.
+
+        O trecho já compactado vem da diferença entre snapshots consecutivos
+        (resolução diária); o restante vem dos eventos do diário.
+        """
+        with self._reader() as conn:
+            conn.execute("BEGIN")
+            first = conn.execute(
+                "SELECT COALESCE(MIN(seq), 1 << 62) FROM task_event WHERE plan_id = ?", (plan_id,)
+            ).fetchone()[0]
+            out, prev = [], {}
+            for ts, state in conn.execute(
+                "SELECT ts, state FROM plan_snapshot WHERE plan_id = ? AND seq < ? ORDER BY seq",
+                (plan_id, first),
+            ):
+                for tid, (st_, _) in json.loads(state).items():
+                    if prev.get(tid) != st_:
+                        out.append((ts, tid, st_))
+                        prev[tid] = st_
+            out.extend(conn.execute(
+                "SELECT ts, tid, status FROM task_event WHERE plan_id = ? ORDER BY seq", (plan_id,)
+            ))
+            conn.execute("COMMIT")
+        return out
+
+    def _snapshot(self, conn, plan_id, seq, ts=None, state=None):
+        """Grava o estado (por padrão, o atual de ``task_state``) como snapshot até o evento ``seq``."""
+        if state is None:
+            state = {tid: (s, a) for tid, s, a in conn.execute(
+                "SELECT tid, status, aviso FROM task_state WHERE plan_id = ?", (plan_id,)
+            )}
+        version = conn.execute("SELECT version FROM plan_meta WHERE plan_id = ?", (plan_id,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO plan_snapshot (plan_id, seq, version, ts, state) VALUES (?, ?, ?, ?, ?)",
+            (plan_id, seq, version[0] if version else 0, time.time() if ts is None else ts,
+             json.dumps(state, ensure_ascii=False, separators=(",", ":"))),
+        )
+
+    def _journal(self, conn, plan_id, version, tids, author):
+        """Anexa um evento por tarefa alterada; snapshot + compactação a cada ``SNAPSHOT_EVERY``."""
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO task_event (plan_id, tid, version, ts, author, status, aviso) "
+            "SELECT plan_id, tid, rev, ?, ?, status, aviso FROM task_state WHERE plan_id = ? AND tid = ?",
+            [(now, author or "", plan_id, tid) for tid in tids],
+        )
+        last = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM plan_snapshot WHERE plan_id = ?", (plan_id,)
+        ).fetchone()[0]
+        pending = conn.execute(
+            "SELECT COUNT(*), MAX(seq) FROM task_event WHERE plan_id = ? AND seq > ?", (plan_id, last)
+        ).fetchone()
+        if pending[0] >= SNAPSHOT_EVERY:
+            self._snapshot(conn, plan_id, pending[1], now)
+            self._compact(conn, plan_id, now - JOURNAL_RETAIN_DAYS * 86400)
+
+    def _compact(self, conn, plan_id, cutoff):
+        """Troca os eventos anteriores a ``cutoff`` por um snapshot no último evento de cada dia."""
+        rows = conn.execute(
+            "SELECT seq, ts, tid, status, aviso FROM task_event WHERE plan_id = ? AND ts <= ? ORDER BY seq",
+            (plan_id, cutoff),
+        ).fetchall()
+        if not rows:
+            return 0
+        snap = conn.execute(
+            "SELECT state FROM plan_snapshot WHERE plan_id = ? AND seq < ? ORDER BY seq DESC LIMIT 1",
+            (plan_id, rows[0][0]),
+        ).fetchone()
+        state = {tid: tuple(v) for tid, v in (json.loads(snap[0]) if snap else {}).items()}
+        for k, (seq, ts, tid, s, a) in enumerate(rows):
+            state[tid] = (s, a)
+            if k + 1 == len(rows) or time.localtime(rows[k + 1][1])[:3] != time.localtime(ts)[:3]:
+                self._snapshot(conn, plan_id, seq, ts, state)
+        conn.execute("DELETE FROM task_event WHERE plan_id = ? AND seq <= ?", (plan_id, rows[-1][0]))
+        return len(rows)
+
+    def compact(self, plan_id, older_than_days=JOURNAL_RETAIN_DAYS):
+        """Compacta já (normalmente roda sozinha junto dos snapshots). Retorna eventos removidos."""
+        with self._tx() as conn:
+            return self._compact(conn, plan_id, time.time() - older_than_days * 86400)
+
+    # ── Escrita ─────────────────────────────────────────────
+    def _write(self, conn, plan_id, changes, author=""):
+        version = self._bump(conn, plan_id)
+        conn.executemany(
+            "UPDATE task_state SET status = ?, aviso = COALESCE(?, aviso), rev = ? "
+            "WHERE plan_id = ? AND tid = ?",
+            [(s, a, version, plan_id, tid) for tid, s, a in changes],
+        )
+        self._journal(conn, plan_id, version, [tid for tid, _, _ in changes], author)
+        self._publish(plan_id, version, changes)
+        return version
+
+    def _publish(self, plan_id, version, changes):
+        """Atualiza cache e log do processo (chamado com o lock de escrita)."""
+        cached = self._cache.get(plan_id)
+        if cached is None or cached[0] != version - 1:
+            self._invalidate(plan_id)
+            return
+        # Copy-on-write: quem já leu o estado antigo continua com ele intacto
+        state = dict(cached[1])
+        for tid, s, a in changes:
+            if tid in state:
+                state[tid] = {"status": s, "aviso": state[tid]["aviso"] if a is None else a, "rev": version}
+        self._cache[plan_id] = (version, state)
+        log = self._log.setdefault(plan_id, deque(maxlen=CHANGE_LOG_SIZE))
+        if log and log[-1][0] != version - 1:
+            log.clear()
+        log.append((version, tuple(tid for tid, _, _ in changes)))
+
+    def write_task(self, plan_id, tid, status, aviso, author=""):
+        return self.write_many(plan_id, [(tid, status, aviso)], author)
+
+    def write_many(self, plan_id, changes, author=""):
+        """Grava ``[(tid, status, aviso), ...]`` numa única transação.
+
+        ``aviso=None`` mantém o aviso atual; ``author`` vai para o diário.
+        Retorna a nova versão do plano.
+        """
+        self.load(plan_id)
+        with self._tx() as conn:
+            return self._write(conn, plan_id, changes, author)
+
+    def write_dates(self, plan_id, dates, author=""):
+        """Grava ``{tid: (ini, fim)}`` por cima das datas do plano numa única transação.
+
+        Avança a versão do plano (sem alterar status) e retorna a nova versão,
+        que passa a ser também a revisão das datas (``dates``).
+        """
+        self.load(plan_id)
+        with self._tx() as conn:
+            version = self._bump(conn, plan_id)
+            now = time.time()
+            conn.executemany(
+                "INSERT OR REPLACE INTO task_dates (plan_id, tid, ini, fim, rev, ts, author) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(plan_id, tid, ini, fim, version, now, author or "") for tid, (ini, fim) in dates.items()],
+            )
+            self._publish(plan_id, version, [])
+            self._dates.pop(plan_id, None)
+            return version
+
+    def compare_and_set(self, plan_id, tid, expected_rev, status, aviso, author=""):
+        """Grava só se a tarefa ainda estiver na revisão ``expected_rev``.
+
+        Retorna ``(True, nova_versão)`` ou, em conflito, ``(False, linha_atual)``.
+        """
+        self.load(plan_id)
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT status, aviso, rev FROM task_state WHERE plan_id = ? AND tid = ?",
+                (plan_id, tid),
+            ).fetchone()
+            if row is None:
+                raise KeyError(tid)
+            if row[2] != expected_rev:
+                return False, {"status": row[0], "aviso": row[1], "rev": row[2]}
+            return True, self._write(conn, plan_id, [(tid, status, aviso)], author)
+
+
+class ReadOnlyPlanDB:
+    """Leitura do estado de um PlanDB existente, sem gravar nada no arquivo.
+
+    Abre com ``mode=ro``; num disco somente leitura, sem os arquivos -wal/-shm,
+    cai para ``immutable=1`` (o arquivo é lido como está).
+    """
+
+    def __init__(self, path):
+        uri = Path(path).resolve().as_uri()
+        for flags in ("mode=ro", "mode=ro&immutable=1"):
+            conn = sqlite3.connect(f"{uri}?{flags}", uri=True, check_same_thread=False)
+            try:
+                conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            except sqlite3.OperationalError:
+                conn.close()
+                if "immutable" in flags:
+                    raise
+                continue
+            self._conn = conn
+            break
+
+    def close(self):
+        self._conn.close()
+
+    def load(self, plan_id):
+        """``(version, state)`` do plano, no mesmo formato de ``PlanDB.load``."""
+        conn = self._conn
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_state'").fetchone():
+            return 0, {}
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute("SELECT version FROM plan_meta WHERE plan_id = ?", (plan_id,)).fetchone()
+            rows = conn.execute(
+                "SELECT tid, status, aviso, rev FROM task_state WHERE plan_id = ?", (plan_id,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return (row[0] if row else 0), {tid: {"status": s, "aviso": a, "rev": r} for tid, s, a, r in rows}
@@ -0,0 +1,62 @@
+"""
+plan_data.py — Plano padrão: DT21.PT0002 Rev 19 (SE Suite 2.1)
+Tarefas no formato ``(fase, id, nome, responsável, início, fim, status, aviso)``
+e dependências diretas por ID. Sem dependência de Streamlit.
+"""
+
+DEFAULT_PLAN_ID    = "DT21.PT0002"
+DEFAULT_PLAN_LABEL = "DT21.PT0002 Rev 19"
+
+TASKS_RAW = [
+    ("Pre-Instalacao", "T01", "Definir modalidade de hospedagem",              "Gestor TI", "2025-02-03", "2025-02-05", "pendente",      ""),
+    ("Pre-Instalacao", "T02", "Estimar usuarios simultaneos",                  "Gestor TI", "2025-02-03", "2025-02-05", "pendente",      ""),
+    ("Pre-Instalacao", "T03", "Escolher SGBD (SQL Server recomendado)",        "DBA",       "2025-02-04", "2025-02-05", "pendente",      ""),
+    ("Pre-Instalacao", "T04", "Provisionar servidor de aplicacao (dedicado)",  "Infra",     "2025-02-05", "2025-02-07", "pendente",      ""),
+    ("Pre-Instalacao", "T05", "Provisionar servidor de BD (dedicado)",         "DBA",       "2025-02-05", "2025-02-07", "pendente",      ""),
+    ("Pre-Instalacao", "T06", "Obter certificado HTTPS",                       "Seguranca", "2025-02-06", "2025-02-08", "pendente",      ""),
+    ("SO e Stack",     "T07", "Instalar SO Linux 64-bit no srv. de aplicacao", "SysAdmin",  "2025-02-10", "2025-02-11", "pendente",      ""),
+    ("SO e Stack",     "T08", "Instalar dependencias Linux",                   "SysAdmin",  "2025-02-11", "2025-02-12", "pendente",      ""),
+    ("SO e Stack",     "T09", "Compilar e instalar NGinx 1.20 da fonte",       "SysAdmin",  "2025-02-12", "2025-02-13", "pendente",      "NGinx deve ser compilado da fonte — pacotes RPM/DEB NAO sao compativeis"),
+    ("SO e Stack",     "T10", "Instalar Java 8 AdoptOpenJDK HotSpot JDK",     "SysAdmin",  "2025-02-12", "2025-02-12", "pendente",      ""),
+    ("SO e Stack",     "T11", "Instalar Apache Tomcat 9.x",                    "SysAdmin",  "2025-02-13", "2025-02-13", "pendente",      ""),
+    ("SO e Stack",     "T12", "Instalar PHP 7.4",                              "SysAdmin",  "2025-02-13", "2025-02-13", "pendente",      ""),
+    ("SO e Stack",     "T13", "Copiar fontes TTF Arial e Verdana",             "SysAdmin",  "2025-02-13", "2025-02-13", "pendente",      ""),
+    ("Banco de Dados", "T14", "Instalar SO no servidor de BD",                 "DBA",       "2025-02-10", "2025-02-11", "pendente",      ""),
+    ("Banco de Dados", "T15", "Instalar e configurar SQL Server",              "DBA",       "2025-02-11", "2025-02-12", "pendente",      ""),
+    ("Banco de Dados", "T16", "Configurar collation CI_AI no SQL Server",      "DBA",       "2025-02-12", "2025-02-12", "pendente",      ""),
+    ("Banco de Dados", "T17", "Executar comandos Snapshot Isolation",          "DBA",       "2025-02-12", "2025-02-12", "pendente",      "Executar SEM conexoes ativas no banco de dados"),
+    ("Banco de Dados", "T18", "Instalar client do BD no srv. de aplicacao",   "DBA",       "2025-02-13", "2025-02-13", "pendente",      ""),
+    ("SE Suite",       "T19", "Executar instalador SE Suite 2.1",              "SysAdmin",  "2025-02-14", "2025-02-14", "pendente",      ""),
+    ("SE Suite",       "T20", "Verificar scripts SQL na instalacao",           "DBA",       "2025-02-14", "2025-02-14", "pendente",      "Instalacao so e concluida se TODOS os scripts SQL forem bem-sucedidos"),
+    ("SE Suite",       "T21", "Verificar Elasticsearch 6.8.3 ativo e plugin", "SysAdmin",  "2025-02-14", "2025-02-14", "pendente",      ""),
+    ("SE Suite",       "T22", "Instalar SE FileManager em servidor dedicado",  "Infra",     "2025-02-14", "2025-02-15", "pendente",      "FileManager exige servidor DEDICADO — nao instalar outros servicos junto"),
+    ("Seguranca",      "T23", "Configurar certificado SSL/HTTPS no NGinx",     "Seguranca", "2025-02-17", "2025-02-17", "pendente",      ""),
+    ("Seguranca",      "T24", "Configurar firewall e excecoes de antivirus",   "Seguranca", "2025-02-17", "2025-02-17", "pendente",      ""),
+    ("Seguranca",      "T25", "Integrar Active Directory / LDAP",              "TI",        "2025-02-18", "2025-02-19", "pendente",      ""),
+    ("Seguranca",      "T26", "Configurar SMTP/SSL para e-mail",               "TI",        "2025-02-18", "2025-02-18", "pendente",      ""),
+    ("Validacao",      "T27", "Acessar SE Suite via HTTPS no Chrome",          "TI",        "2025-02-20", "2025-02-20", "pendente",      ""),
+    ("Validacao",      "T28", "Testar login e funcionalidades basicas",        "TI",        "2025-02-20", "2025-02-20", "pendente",      ""),
+    ("Validacao",      "T29", "Testar conversao de documentos para PDF",       "TI",        "2025-02-20", "2025-02-20", "pendente",      ""),
+    ("Validacao",      "T30", "Testar acesso via dispositivo movel",           "TI",        "2025-02-20", "2025-02-20", "pendente",      ""),
+    ("Validacao",      "T31", "Testar envio de e-mail de notificacao",         "TI",        "2025-02-20", "2025-02-20", "pendente",      ""),
+    ("Validacao",      "T32", "Configurar backup do banco de dados",           "DBA",       "2025-02-21", "2025-02-21", "pendente",      ""),
+    ("Validacao",      "T33", "Configurar monitoramento de performance",       "TI",        "2025-02-21", "2025-02-21", "pendente",      ""),
+    ("Entrega",        "T34", "Documentar credenciais e acesso",               "Consultor", "2025-02-24", "2025-02-24", "pendente",      ""),
+    ("Entrega",        "T35", "Treinar equipe de usuarios-chave",              "Consultor", "2025-02-24", "2025-02-25", "pendente",      ""),
+]
+
+DEPS = {
+    "T03": ["T01"], "T04": ["T01", "T02"], "T05": ["T03"],
+    "T06": ["T04"], "T07": ["T04"], "T08": ["T07"],
+    "T09": ["T08"], "T10": ["T07"], "T11": ["T10"],
+    "T12": ["T11"], "T13": ["T07"], "T14": ["T05"],
+    "T15": ["T14"], "T16": ["T15"], "T17": ["T16"],
+    "T18": ["T15", "T11"], "T19": ["T12", "T13", "T18"],
+    "T20": ["T19"], "T21": ["T19"], "T22": ["T19"],
+    "T23": ["T06", "T21"], "T24": ["T23"],
+    "T25": ["T23"], "T26": ["T23"],
+    "T27": ["T23", "T24"], "T28": ["T27"],
+    "T29": ["T28"], "T30": ["T28"], "T31": ["T26", "T28"],
+    "T32": ["T27"], "T33": ["T27"],
+    "T34": ["T28"], "T35": ["T34"],
+}
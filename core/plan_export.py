@@ -0,0 +1,126 @@
+"""
+plan_export.py — Exportação do plano + status (CSV, JSON, Parquet)
+Percorre o TaskStore linha a linha e gera o arquivo em blocos de
+``CHUNK_ROWS`` linhas: nenhum formato monta uma string única com o plano
+inteiro. Além das colunas do plano, exporta campos derivados: dependências
+diretas, dependências ainda pendentes e, com o CPM, folga e caminho crítico.
+
+Parquet usa pyarrow, importado só quando pedido.
+Sem dependência de Streamlit.
+"""
+import csv
+import importlib.util
+import io
+import json
+
+CHUNK_ROWS = 2000
+
+FIELDS = (
+    "fase", "id", "nome", "resp", "ini", "fim", "status", "aviso",
+    "deps", "deps_pendentes", "folga_dias", "critica",
+)
+
+MIME = {
+    "csv":     "text/csv",
+    "json":    "application/json",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def formats():
+    """Formatos disponíveis neste ambiente (Parquet só com pyarrow instalado)."""
+    return [f for f in MIME if f != "parquet" or importlib.util.find_spec("pyarrow")]
+
+
+def iter_rows(store, state, cpm=None):
+    """Uma tupla por tarefa, na ordem do plano, com as colunas de ``FIELDS``."""
+    preds = store.graph.preds
+    for i, tid in enumerate(store.tid):
+        st_ = state[tid]
+        deps = preds[tid]
+        yield (
+            store.fase[i], tid, store.nome[i], store.resp[i], store.ini[i], store.fim[i],
+            st_["status"], st_["aviso"] or "",
+            ";".join(deps),
+            ";".join(d for d in deps if state[d]["status"] != "concluido"),
+            cpm.slack(i) if cpm is not None else None,
+            cpm.is_critical(i) if cpm is not None else None,
+        )
+
+
+def _chunks(rows, size=CHUNK_ROWS):
+    chunk = []
+    for r in rows:
+        chunk.append(r)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ── Geradores por formato (blocos de bytes) ─────────────────
+def iter_csv(store, state, cpm=None):
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(FIELDS)
+    yield "﻿".encode() + buf.getvalue().encode()   # BOM: acentos corretos no Excel
+    for chunk in _chunks(iter_rows(store, state, cpm)):
+        buf.seek(0)
+        buf.truncate()
+        w.writerows(chunk)
+        yield buf.getvalue().encode()
+
+
+def iter_json(store, state, cpm=None):
+    sep = "[\n"
+    for chunk in _chunks(iter_rows(store, state, cpm)):
+        yield (sep + ",\n".join(
+            json.dumps(dict(zip(FIELDS, r)), ensure_ascii=False) for r in chunk
+        )).encode()
+        sep = ",\n"
+    yield ("]\n" if sep == ",\n" else "[]\n").encode()
+
+
+def write_parquet(fp, store, state, cpm=None):
+    """Um row group por bloco de linhas, escritos direto em ``fp``."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        *((f, pa.string()) for f in FIELDS[:10]),
+        ("folga_dias", pa.int32()), ("critica", pa.bool_()),
+    ])
+    with pq.ParquetWriter(fp, schema, compression="zstd") as writer:
+        for chunk in _chunks(iter_rows(store, state, cpm)):
+            cols = zip(*chunk)
+            writer.write_batch(pa.record_batch(
+                [pa.array(c, field.type) for c, field in zip(cols, schema)], schema=schema,
+            ))
+
+
+def _streamed(blocks):
+    def write(fp, store, state, cpm=None):
+        for block in blocks(store, state, cpm):
+            fp.write(block)
+    return write
+
+
+WRITERS = {"csv": _streamed(iter_csv), "json": _streamed(iter_json), "parquet": write_parquet}
+
+
+def export_bytes(fmt, store, state, cpm=None):
+    """Arquivo completo em ``fmt``, montado bloco a bloco num único buffer.
+
+    Para o download do app, que precisa dos bytes inteiros; em disco, use
+    ``write_file``, que não mantém o arquivo em memória.
+    """
+    out = io.BytesIO()
+    WRITERS[fmt](out, store, state, cpm)
+    return out.getvalue()
+
+
+def write_file(path, fmt, store, state, cpm=None):
+    """Grava direto em disco, sem manter o arquivo inteiro em memória."""
+    with open(path, "wb") as fp:
+        WRITERS[fmt](fp, store, state, cpm)
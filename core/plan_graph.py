@@ -0,0 +1,122 @@
+"""
+plan_graph.py — Grafo de dependências do plano (DAG)
+Montado uma vez a partir de DEPS: adjacência direta (tarefa → dependentes) e
+reversa (tarefa → dependências), validação de ciclos e IDs inexistentes na
+carga, ordem topológica em cache e consultas transitivas em O(V+E).
+Contagens transitivas do plano inteiro (quantas tarefas cada uma trava,
+quantas dependências pendentes ela aguarda) saem de uma única passada
+topológica com conjuntos em bitset, não de uma busca por tarefa.
+Sem dependência de Streamlit.
+"""
+from collections import deque
+
+
+class PlanGraphError(ValueError):
+    """DEPS inválido: ID inexistente ou ciclo de dependências."""
+
+
+class DepGraph:
+    def __init__(self, ids, deps):
+        ids = list(ids)
+        known = set(ids)
+
+        dangling = sorted(
+            f"{t} → {d}" for t, ds in deps.items() for d in ds
+            if t not in known or d not in known
+        )
+        if dangling:
+            raise PlanGraphError("Dependências com ID inexistente: " + ", ".join(dangling))
+
+        self.preds = {t: tuple(deps.get(t, ())) for t in ids}   # t → dependências
+        self.succs = {t: [] for t in ids}                        # t → dependentes
+        for t in ids:
+            for d in self.preds[t]:
+                self.succs[d].append(t)
+
+        self.order = self._toposort(ids)
+        self.pos   = {t: i for i, t in enumerate(self.order)}
+        self._down_counts = None
+
+    def _toposort(self, ids):
+        """Kahn; mantém a ordem do plano entre tarefas independentes."""
+        indeg = {t: len(self.preds[t]) for t in ids}
+        ready = deque(t for t in ids if not indeg[t])
+        order = []
+        while ready:
+            t = ready.popleft()
+            order.append(t)
+            for s in self.succs[t]:
+                indeg[s] -= 1
+                if not indeg[s]:
+                    ready.append(s)
+        if len(order) != len(ids):
+            stuck = [t for t in ids if indeg[t]]
+            raise PlanGraphError("Ciclo de dependências envolvendo: " + ", ".join(stuck))
+        return order
+
+    # ── Consultas transitivas ────────────────────────────────
+    def _walk(self, tid, adj):
+        dist = {}
+        queue = deque([(tid, 0)])
+        seen = {tid}
+        while queue:
+            t, d = queue.popleft()
+            for n in adj[t]:
+                if n not in seen:
+                    seen.add(n)
+                    dist[n] = d + 1
+                    queue.append((n, d + 1))
+        return dist
+
+    def upstream(self, tid):
+        """Todas as dependências transitivas de ``tid`` → distância (1 = direta)."""
+        return self._walk(tid, self.preds)
+
+    def downstream(self, tid):
+        """Todas as tarefas que dependem, direta ou indiretamente, de ``tid``."""
+        return self._walk(tid, self.succs)
+
+    def blockers(self, tid, state):
+        """Dependências transitivas ainda não concluídas, em ordem topológica.
+
+        Lista de ``(tid, distância)``; ``state`` é o dict de status por tarefa.
+        """
+        pend = [(d, n) for d, n in self.upstream(tid).items() if state[d]["status"] != "concluido"]
+        pend.sort(key=lambda x: self.pos[x[0]])
+        return pend
+
+    # ── Contagens transitivas (uma passada) ──────────────────
+    def _reach_counts(self, order, adj, back, mask=-1):
+        """``{tid: nº de tarefas alcançáveis por adj}``, contando só os bits de ``mask``.
+
+        Cada tarefa une os conjuntos (``int`` com um bit por posição
+        topológica) dos vizinhos já processados; um conjunto sai da memória
+        assim que o último vizinho em ``back`` o consome.
+        """
+        pos, reach, left, counts = self.pos, {}, {}, {}
+        for t in order:
+            r = 0
+            for n in adj[t]:
+                r |= reach[n] | (1 << pos[n])
+                left[n] -= 1
+                if not left[n]:
+                    del reach[n], left[n]
+            counts[t] = (r & mask).bit_count()
+            if back[t]:
+                reach[t], left[t] = r, len(back[t])
+        return counts
+
+    def downstream_counts(self):
+        """Quantas tarefas dependem, direta ou indiretamente, de cada tarefa (em cache)."""
+        if self._down_counts is None:
+            self._down_counts = self._reach_counts(reversed(self.order), self.succs, self.preds)
+        return self._down_counts
+
+    def upstream_counts(self, pending):
+        """Quantas dependências transitivas de cada tarefa estão em ``pending``."""
+        bits = bytearray(len(self.order) // 8 + 1)
+        for t in pending:
+            p = self.pos[t]
+            bits[p >> 3] |= 1 << (p & 7)
+        mask = int.from_bytes(bits, "little")
+        return self._reach_counts(self.order, self.preds, self.succs, mask)
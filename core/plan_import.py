@@ -0,0 +1,281 @@
+"""
+plan_import.py — Importação de planos (CSV, XLSX, JSON/JSONL)
+Lê o arquivo em fluxo (pandas ``chunksize``, openpyxl ``read_only`` ou
+decodificação incremental de JSON), valida cada registro e monta o
+TaskStore na mesma passada. Dependências, ciclos e IDs inexistentes são
+conferidos no fim, sem reler o arquivo.
+
+Colunas: fase, id, nome, resp, ini, fim[, status, aviso, deps]. ``deps`` é
+uma lista JSON ou, em CSV/XLSX, IDs separados por ``;`` / ``,``. Datas em
+AAAA-MM-DD ou DD/MM/AAAA.
+
+O resultado é guardado por hash do arquivo (``PlanCache``): reimportar um
+plano que não mudou só custa o hash.
+Sem dependência de Streamlit.
+"""
+import hashlib
+import io
+import json
+import re
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+
+from .plan_graph import PlanGraphError
+from .task_store import TaskStore
+
+STATUSES   = ("pendente", "em andamento", "concluido", "bloqueado")
+FORMATS    = ("csv", "xlsx", "json", "jsonl")
+CHUNK_ROWS = 5000
+MAX_ERRORS = 50
+
+# Cabeçalho normalizado → campo
+ALIASES = {
+    "fase": "fase", "id": "tid", "tid": "tid", "tarefa": "nome", "nome": "nome",
+    "resp": "resp", "responsavel": "resp", "responsável": "resp",
+    "ini": "ini", "inicio": "ini", "início": "ini", "fim": "fim", "termino": "fim", "término": "fim",
+    "status": "status", "aviso": "aviso", "deps": "deps", "dependencias": "deps", "dependências": "deps",
+}
+REQUIRED = ("fase", "tid", "nome", "resp", "ini", "fim")
+
+
+class PlanImportError(ValueError):
+    """Arquivo de plano inválido; ``errors`` traz as mensagens por linha/registro."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        extra = f" (+{len(self.errors) - 5})" if len(self.errors) > 5 else ""
+        super().__init__("; ".join(self.errors[:5]) + extra)
+
+
+# ── Hash / formato ──────────────────────────────────────────
+def file_digest(fp, block=1 << 20):
+    """SHA-256 do conteúdo de ``fp`` (binário, seekable), lido em blocos."""
+    h = hashlib.sha256()
+    fp.seek(0)
+    for chunk in iter(lambda: fp.read(block), b""):
+        h.update(chunk)
+    fp.seek(0)
+    return h.hexdigest()
+
+
+def detect_format(name):
+    ext = Path(name).suffix.lower().lstrip(".")
+    if ext not in FORMATS:
+        raise PlanImportError([f"Formato não suportado: .{ext} (use {', '.join(FORMATS)})"])
+    return ext
+
+
+# ── Leitores (geram ``(onde, {campo: valor})``) ─────────────
+def _fields(header):
+    cols = [ALIASES.get(str(h or "").strip().lower()) for h in header]
+    missing = [c for c in REQUIRED if c not in cols]
+    if missing:
+        raise PlanImportError([f"Colunas obrigatórias ausentes: {', '.join(missing)}"])
+    return cols
+
+
+def _iter_csv(fp, chunksize=CHUNK_ROWS):
+    import pandas as pd
+
+    first = fp.readline().decode("utf-8-sig", "replace")
+    fp.seek(0)
+    sep = ";" if first.count(";") > first.count(",") else ","
+    reader = pd.read_csv(
+        fp, sep=sep, dtype=str, keep_default_na=False, encoding="utf-8-sig", chunksize=chunksize,
+    )
+    cols = None
+    for chunk in reader:
+        if cols is None:
+            cols = _fields(chunk.columns)
+        for n, values in zip(chunk.index, chunk.itertuples(index=False, name=None)):
+            yield f"linha {n + 2}", {c: v for c, v in zip(cols, values) if c}
+
+
+def _iter_xlsx(fp):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise PlanImportError(["Leitura de .xlsx requer o pacote openpyxl"]) from None
+
+    wb = load_workbook(fp, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        cols = _fields(next(rows, ()))
+        for n, values in enumerate(rows, start=2):
+            if not any(v not in (None, "") for v in values):
+                continue
+            yield f"linha {n}", {c: v for c, v in zip(cols, values) if c}
+    finally:
+        wb.close()
+
+
+def _iter_json(fp, block=1 << 16):
+    """Objetos de um array JSON ou de JSONL, decodificados à medida que chegam."""
+    text = io.TextIOWrapper(fp, encoding="utf-8-sig")
+    dec = json.JSONDecoder()
+    buf, pos, eof, n = "", 0, False, 0
+    try:
+        while True:
+            # separadores entre registros: espaços, vírgulas e os colchetes do array
+            while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+                pos += 1
+            if pos < len(buf):
+                if buf[pos] != "{":
+                    raise PlanImportError([f"registro {n + 1}: esperado um objeto JSON"])
+                try:
+                    obj, pos_end = dec.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise PlanImportError([f"registro {n + 1}: JSON inválido ({e.msg})"]) from None
+                else:
+                    n += 1
+                    pos = pos_end
+                    yield f"registro {n}", {ALIASES.get(k.lower(), k): v for k, v in obj.items()}
+                    continue
+            elif eof:
+                return
+            chunk = text.read(block)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+    finally:
+        text.detach()
+
+
+def iter_records(fp, fmt, chunksize=CHUNK_ROWS):
+    if fmt == "csv":
+        return _iter_csv(fp, chunksize)
+    if fmt == "xlsx":
+        return _iter_xlsx(fp)
+    return _iter_json(fp)
+
+
+# ── Validação ───────────────────────────────────────────────
+def _date(v, campo):
+    if isinstance(v, datetime):
+        return v.date().isoformat()
+    if isinstance(v, date):
+        return v.isoformat()
+    s = str(v or "").strip()
+    try:
+        if re.fullmatch(r"\d{2}/\d{2}/\d{4}", s):
+            return datetime.strptime(s, "%d/%m/%Y").date().isoformat()
+        return date.fromisoformat(s[:10]).isoformat()
+    except ValueError:
+        raise ValueError(f"{campo} inválida: {s!r}") from None
+
+
+def _deps(v):
+    if v is None or v == "":
+        return []
+    if isinstance(v, (list, tuple)):
+        return [str(d).strip() for d in v if str(d).strip()]
+    return [d for d in re.split(r"[;,\s]+", str(v).strip()) if d]
+
+
+def parse_record(rec, statuses=STATUSES):
+    """``(tupla no formato de TASKS_RAW, deps)``; ``ValueError`` se inválido."""
+    text = {k: str(rec.get(k) or "").strip() for k in ("fase", "tid", "nome", "resp", "status", "aviso")}
+    for campo in ("tid", "fase", "nome", "resp"):
+        if not text[campo]:
+            raise ValueError(f"campo '{campo}' vazio")
+    if not re.fullmatch(r"[\w.\-]+", text["tid"]):
+        raise ValueError(f"ID inválido: {text['tid']!r}")
+    ini, fim = _date(rec.get("ini"), "data de início"), _date(rec.get("fim"), "data de término")
+    if fim < ini:
+        raise ValueError(f"término {fim} antes do início {ini}")
+    status = text["status"].lower() or "pendente"
+    if status not in statuses:
+        raise ValueError(f"status desconhecido: {text['status']!r}")
+    deps = _deps(rec.get("deps"))
+    if text["tid"] in deps:
+        raise ValueError(f"{text['tid']} depende de si mesma")
+    task = (text["fase"], text["tid"], text["nome"], text["resp"], ini, fim, status, text["aviso"])
+    return task, deps
+
+
+def build_store(records, statuses=STATUSES, max_errors=MAX_ERRORS):
+    """Monta o ``TaskStore`` (índices, grafo e ordinais de data) enquanto lê ``records``."""
+    store = TaskStore()
+    errors, where_of = [], {}
+    for where, rec in records:
+        try:
+            task, deps = parse_record(rec, statuses)
+            if task[1] in store:
+                raise ValueError(f"ID duplicado: {task[1]} (primeira ocorrência em {where_of[task[1]]})")
+            store.append(task)
+        except ValueError as e:
+            errors.append(f"{where}: {e}")
+            if len(errors) >= max_errors:
+                break
+            continue
+        where_of[task[1]] = where
+        if deps:
+            store.deps[task[1]] = deps
+
+    if len(errors) < max_errors:
+        for tid, deps in store.deps.items():
+            missing = [d for d in deps if d not in store]
+            if missing:
+                errors.append(f"{where_of[tid]}: {tid} depende de ID inexistente: {', '.join(missing)}")
+    if not errors and not len(store):
+        errors.append("o arquivo não tem tarefas")
+    if errors:
+        raise PlanImportError(errors)
+    try:
+        store.graph
+    except PlanGraphError as e:
+        raise PlanImportError([str(e)]) from None
+    store.day_span()
+    return store
+
+
+def load_plan(fp, name, chunksize=CHUNK_ROWS, statuses=STATUSES):
+    """Lê ``fp`` (arquivo binário) no formato indicado pela extensão de ``name``."""
+    return build_store(iter_records(fp, detect_format(name), chunksize), statuses)
+
+
+# ── Cache por hash ──────────────────────────────────────────
+class PlanCache:
+    """Planos importados por hash do arquivo (LRU limitado, compartilhado pelo processo)."""
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._data.get(digest)
+            if entry is not None:
+                self._data.move_to_end(digest)
+            return entry
+
+    def load(self, fp, name):
+        """``(digest, store)``; só faz o parse se o conteúdo ainda não estiver em cache."""
+        digest = file_digest(fp)
+        store = self.get(digest)
+        if store is None:
+            store = load_plan(fp, name)
+            with self._lock:
+                self._data[digest] = store
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+        return digest, store
+
+    def __len__(self):
+        return len(self._data)
+
+
+if __name__ == "__main__":
+    # python -m core.plan_import plano.csv — valida o arquivo e mostra um resumo
+    path = Path(sys.argv[1])
+    with path.open("rb") as fp:
+        try:
+            s = load_plan(fp, path.name)
+        except PlanImportError as e:
+            sys.exit("\n".join(e.errors))
+    print(f"{len(s)} tarefas · {len(s.fases)} fases · {len(s.resps)} responsáveis · "
+          f"{sum(map(len, s.deps.values()))} dependências")
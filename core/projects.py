@@ -0,0 +1,170 @@
+"""
+projects.py — Registro de planos (projetos) com carga preguiçosa
+Cada projeto é registrado com um rótulo e um *loader*; o TaskStore (tarefas,
+dependências e índices) só é montado no primeiro acesso. Os planos
+carregados ficam num LRU limitado por memória, compartilhado pelo processo:
+trocar de projeto não recarrega um plano que ainda está em memória, e os
+menos usados saem quando o total passa de ``max_bytes``.
+
+Arquivos de plano (CSV, XLSX, JSON/JSONL — ver plan_import.py) num diretório
+viram projetos com ``scan``; o ID do projeto é o nome do arquivo sem extensão.
+Arquivos apagados do diretório saem do registro na varredura seguinte.
+Sem dependência de Streamlit.
+"""
+import itertools
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .plan_import import FORMATS, load_plan
+
+MAX_BYTES = 256 * 2 ** 20
+
+
+def footprint(store):
+    """Tamanho aproximado de um TaskStore em bytes (colunas, textos e índices)."""
+    seen, total = set(), 0
+    for col in store._cols:
+        total += sys.getsizeof(col)
+        for v in col:
+            if id(v) not in seen:          # textos repetidos (fase, resp) contam uma vez
+                seen.add(id(v))
+                total += sys.getsizeof(v)
+    for index in (store.index, store.by_fase, store.by_resp, store.deps):
+        total += sys.getsizeof(index)
+    total += sum(sys.getsizeof(rows) for rows in store.by_fase.values())
+    total += sum(sys.getsizeof(rows) for rows in store.by_resp.values())
+    total += sum(sys.getsizeof(d) for d in store.deps.values())
+    return total
+
+
+class ProjectRegistry:
+    """Projetos conhecidos + planos carregados (LRU por bytes)."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._sources = {}                 # plan_id → (rótulo, loader)
+        self._stores = OrderedDict()       # plan_id → (store, bytes), em ordem de uso
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}                 # plan_id → lock da primeira carga
+        self._scanned = {}                 # diretório → mtime da última varredura
+        self._files = {}                   # plan_id → arquivo do plano (register_file)
+        self._generation = itertools.count(1)
+
+    # ── Registro ────────────────────────────────────────────
+    def register(self, plan_id, label, loader, store=None):
+        """``loader()`` devolve o TaskStore; ``store`` já pronto evita a primeira carga."""
+        with self._lock:
+            self._sources[plan_id] = (label, loader)
+        if store is not None:
+            self._put(plan_id, store)
+
+    def register_file(self, path, plan_id=None, label=None, store=None):
+        path = Path(path)
+        plan_id = plan_id or path.stem
+
+        def loader():
+            with path.open("rb") as fp:
+                return load_plan(fp, path.name)
+
+        self.register(plan_id, label or plan_id, loader, store)
+        with self._lock:
+            self._files[plan_id] = path
+        return plan_id
+
+    def unregister(self, plan_id):
+        """Tira o projeto do registro e o plano da memória (se estiver carregado)."""
+        with self._lock:
+            self._sources.pop(plan_id, None)
+            self._files.pop(plan_id, None)
+            old = self._stores.pop(plan_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def scan(self, directory):
+        """Registra os arquivos de plano de ``directory`` (sem ler o conteúdo).
+
+        Projetos cujo arquivo sumiu do diretório saem do registro. Barato o
+        bastante para chamar a cada rerun: se o diretório não mudou desde a
+        última varredura, custa um ``stat``.
+        """
+        directory = Path(directory)
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            return []
+        if self._scanned.get(directory) == mtime:
+            return []
+        self._scanned[directory] = mtime
+        with self._lock:
+            gone = [pid for pid, path in self._files.items() if path.parent == directory and not path.exists()]
+        for pid in gone:
+            self.unregister(pid)
+        return [
+            self.register_file(p) for p in sorted(directory.iterdir())
+            if p.suffix.lower().lstrip(".") in FORMATS and p.stem not in self._sources
+        ]
+
+    def ids(self):
+        return list(self._sources)
+
+    def label(self, plan_id):
+        return self._sources[plan_id][0]
+
+    def __contains__(self, plan_id):
+        return plan_id in self._sources
+
+    def __len__(self):
+        return len(self._sources)
+
+    # ── Carga ───────────────────────────────────────────────
+    def store(self, plan_id):
+        """TaskStore do projeto; carrega (uma vez, mesmo com sessões concorrentes) se preciso."""
+        entry = self._warm(plan_id)
+        if entry is not None:
+            return entry
+        with self._lock:
+            loading = self._loading.setdefault(plan_id, threading.Lock())
+        with loading:
+            entry = self._warm(plan_id)    # outra sessão pode ter carregado enquanto esperávamos
+            if entry is None:
+                store = self._sources[plan_id][1]()
+                store.graph                # valida ciclos e IDs já na carga
+                store.day_span()
+                self._put(plan_id, store)
+                entry = store
+        with self._lock:
+            self._loading.pop(plan_id, None)
+        return entry
+
+    def _warm(self, plan_id):
+        with self._lock:
+            entry = self._stores.get(plan_id)
+            if entry is None:
+                return None
+            self._stores.move_to_end(plan_id)
+            return entry[0]
+
+    def _put(self, plan_id, store):
+        size = footprint(store)
+        with self._lock:
+            store.generation = next(self._generation)
+            old = self._stores.pop(plan_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._stores[plan_id] = (store, size)
+            self._bytes += size
+            # O plano recém-carregado fica, mesmo que sozinho passe do limite
+            while self._bytes > self.max_bytes and len(self._stores) > 1:
+                _, (_, freed) = self._stores.popitem(last=False)
+                self._bytes -= freed
+
+    def is_loaded(self, plan_id):
+        return plan_id in self._stores
+
+    def stats(self):
+        with self._lock:
+            return {"projects": len(self._sources), "loaded": len(self._stores),
+                    "bytes": self._bytes, "max_bytes": self.max_bytes}
@@ -0,0 +1,75 @@
+"""
+report.py — Relatórios do plano: KPIs, bloqueios e dependências inconsistentes
+Funções puras sobre ``TaskStore`` + estado (``{tid: {"status", "aviso"}}``),
+usadas pela página de Bloqueios e pela linha de comando (``python -m core``).
+Sem dependência de Streamlit.
+"""
+from .rollups import StatusRollup
+
+DONE = "concluido"
+
+
+def plan_state(store, db=None, plan_id=None):
+    """Estado das tarefas: o do PlanDB (se houver) completado com o status do próprio plano."""
+    state = dict(db.load(plan_id)[1]) if db is not None else {}
+    for i, tid in enumerate(store.tid):
+        if tid not in state:
+            state[tid] = {"status": store.status[i], "aviso": store.aviso[i], "rev": 0}
+    return state
+
+
+def kpis(store, state, rollup=None):
+    """Totais do plano e por fase, como dict pronto para JSON."""
+    rollup = rollup or StatusRollup(store, state)
+    total, done, wip, blk, pend, pct = rollup.kpis()
+    fases = {}
+    for fase in store.fases:
+        c, n = rollup.fase_counts(fase), len(store.rows_fase(fase))
+        fases[fase] = {
+            "total": n, "concluidas": c[DONE], "em_andamento": c["em andamento"],
+            "bloqueadas": c["bloqueado"], "pct": int(c[DONE] / n * 100) if n else 0,
+        }
+    return {
+        "total": total, "concluidas": done, "em_andamento": wip, "bloqueadas": blk,
+        "pendentes": pend, "pct": pct, "fases": fases,
+    }
+
+
+def blockers(store, state):
+    """Tarefas bloqueadas ou com aviso, com as dependências diretas pendentes.
+
+    Uma entrada por tarefa, em ordem do plano: ``pendentes`` traz as
+    dependências diretas não concluídas, ``indiretas`` quantas dependências
+    transitivas além delas ainda não foram concluídas e ``trava`` quantas
+    tarefas dependem dela (direta ou indiretamente). A cadeia completa de uma
+    tarefa sai de ``store.graph.blockers(tid, state)``, sob demanda.
+    """
+    graph, out = store.graph, []
+    rows = [i for i, tid in enumerate(store.tid) if state[tid]["aviso"] or state[tid]["status"] == "bloqueado"]
+    if not rows:
+        return out
+    pending = [t for t in store.tid if state[t]["status"] != DONE]
+    upstream, downstream = graph.upstream_counts(pending), graph.downstream_counts()
+    for i in rows:
+        tid, s = store.tid[i], state[store.tid[i]]
+        direct = [d for d in graph.preds[tid] if state[d]["status"] != DONE]
+        out.append({
+            "id": tid, "nome": store.nome[i], "fase": store.fase[i], "resp": store.resp[i],
+            "status": s["status"], "aviso": s["aviso"] or "",
+            "pendentes": direct, "indiretas": upstream[tid] - len(direct),
+            "trava": downstream[tid],
+        })
+    return out
+
+
+def dependency_issues(store, state):
+    """Tarefas iniciadas ou concluídas com dependência direta ainda não concluída."""
+    preds, out = store.graph.preds, []
+    for tid in store.tid:
+        status = state[tid]["status"]
+        if status not in ("em andamento", DONE):
+            continue
+        pend = [d for d in preds[tid] if state[d]["status"] != DONE]
+        if pend:
+            out.append({"id": tid, "status": status, "deps_pendentes": pend})
+    return out
@@ -0,0 +1,73 @@
+"""
+rollups.py — Contadores de status mantidos na escrita
+Agrega status global, por fase e por responsável. Cada alteração de status
+custa O(1); a leitura dos KPIs e das tabelas do Dashboard vira leitura de dict.
+Sem dependência de Streamlit.
+"""
+from collections import Counter
+
+
+class StatusRollup:
+    """Contadores incrementais de status sobre um ``TaskStore``."""
+
+    def __init__(self, store, state):
+        self.store = store
+        self.rebuild(state)
+
+    # ── Montagem / consistência ──────────────────────────────
+    def rebuild(self, state):
+        """Recalcula todos os contadores do zero a partir de ``state``."""
+        store = self.store
+        self.total = Counter()
+        self.fase  = {f: Counter() for f in store.fases}
+        self.resp  = {r: Counter() for r in store.resps}
+        for i, tid in enumerate(store.tid):
+            self._add(i, state[tid]["status"], 1)
+
+    def check(self, state, repair=False):
+        """Compara os contadores com uma recontagem completa.
+
+        Retorna a lista de divergências ``(escopo, chave, atual, esperado)``;
+        com ``repair=True`` os contadores são substituídos pela recontagem.
+        """
+        fresh = StatusRollup(self.store, state)
+        diffs = []
+        scopes = [("total", None, self.total, fresh.total)]
+        scopes += [("fase", k, self.fase.get(k, Counter()), v) for k, v in fresh.fase.items()]
+        scopes += [("resp", k, self.resp.get(k, Counter()), v) for k, v in fresh.resp.items()]
+        for scope, key, cur, exp in scopes:
+            if +cur != +exp:
+                diffs.append((scope, key, dict(+cur), dict(+exp)))
+        if repair and diffs:
+            self.total, self.fase, self.resp = fresh.total, fresh.fase, fresh.resp
+        return diffs
+
+    # ── Escrita ──────────────────────────────────────────────
+    def _add(self, i, status, n):
+        store = self.store
+        self.total[status] += n
+        self.fase[store.fase[i]][status] += n
+        self.resp[store.resp[i]][status] += n
+
+    def apply(self, tid, old, new):
+        """Registra a troca de status ``old`` → ``new`` da tarefa ``tid``."""
+        if old == new:
+            return
+        i = self.store.index[tid]
+        self._add(i, old, -1)
+        self._add(i, new, 1)
+
+    # ── Leitura ──────────────────────────────────────────────
+    def kpis(self):
+        """``(total, done, wip, blk, pend, pct)`` — mesmo formato de ``get_kpis``."""
+        c = self.total
+        total = len(self.store)
+        done, wip, blk, pend = c["concluido"], c["em andamento"], c["bloqueado"], c["pendente"]
+        pct = int(done / total * 100) if total else 0
+        return total, done, wip, blk, pend, pct
+
+    def fase_counts(self, fase):
+        return self.fase.get(fase, Counter())
+
+    def resp_counts(self, resp):
+        return self.resp.get(resp, Counter())
@@ -0,0 +1,143 @@
+"""
+task_store.py — Armazenamento indexado das tarefas do plano
+Colunas paralelas (uma lista por campo) + índices id→linha, fase→linhas e
+responsável→linhas, montados uma única vez na carga do plano.
+Sem dependência de Streamlit: pode ser usado fora do app.
+"""
+from array import array
+from datetime import date
+
+from .plan_graph import DepGraph
+
+# Ordem dos campos nas tuplas de tarefa (mesma de TASKS_RAW)
+COLUMNS = ("fase", "tid", "nome", "resp", "ini", "fim", "status", "aviso")
+
+
+class TaskStore:
+    """Plano em formato colunar com índices pré-montados.
+
+    Cada consulta custa O(tamanho do resultado): nada aqui percorre o plano
+    inteiro para achar uma tarefa, uma fase ou um responsável.
+    """
+
+    def __init__(self, tasks=(), deps=None):
+        self.fase   = []
+        self.tid    = []
+        self.nome   = []
+        self.resp   = []
+        self.ini    = []
+        self.fim    = []
+        self.status = []
+        self.aviso  = []
+        self._cols  = (self.fase, self.tid, self.nome, self.resp,
+                       self.ini, self.fim, self.status, self.aviso)
+
+        self.index   = {}   # tid  → linha
+        self.by_fase = {}   # fase → [linhas], em ordem de inserção
+        self.by_resp = {}   # resp → [linhas], em ordem de inserção
+        self.deps    = {k: list(v) for k, v in (deps or {}).items()}
+        self._graph  = None
+        self._days   = None
+        self.dates_rev = 0  # revisão das datas sobrepostas (PlanDB.dates) já aplicadas
+        self.generation = 0  # carga do plano no ProjectRegistry (nova a cada recarga do arquivo)
+
+        for t in tasks:
+            self.append(t)
+
+    # ── Carga ───────────────────────────────────────────────
+    def append(self, task):
+        """Adiciona uma tarefa (tupla no formato de TASKS_RAW) em O(1)."""
+        tid = task[1]
+        if tid in self.index:
+            raise ValueError(f"ID de tarefa duplicado: {tid}")
+        i = len(self.tid)
+        for col, val in zip(self._cols, task):
+            col.append(val)
+        self.index[tid] = i
+        self.by_fase.setdefault(task[0], []).append(i)
+        self.by_resp.setdefault(task[3], []).append(i)
+        return i
+
+    def set_dates(self, dates, rev):
+        """Sobrepõe ``{tid: (ini, fim)}`` (ISO) às datas do plano; IDs desconhecidos são ignorados."""
+        for tid, (ini, fim) in dates.items():
+            i = self.index.get(tid)
+            if i is not None:
+                self.ini[i], self.fim[i] = ini, fim
+        self._days = None
+        self.dates_rev = rev
+
+    # ── Acesso ──────────────────────────────────────────────
+    def __len__(self):
+        return len(self.tid)
+
+    def __contains__(self, tid):
+        return tid in self.index
+
+    def __iter__(self):
+        for i in range(len(self.tid)):
+            yield self.row(i)
+
+    @property
+    def ids(self):
+        return self.tid
+
+    @property
+    def fases(self):
+        return list(self.by_fase)
+
+    @property
+    def resps(self):
+        return list(self.by_resp)
+
+    @property
+    def graph(self):
+        """``DepGraph`` do plano, montado (e validado) no primeiro acesso."""
+        if self._graph is None:
+            self._graph = DepGraph(self.tid, self.deps)
+        return self._graph
+
+    def day_span(self):
+        """``(ini_ord, fim_ord)``: datas como ordinais de ``date``, convertidas uma vez."""
+        if self._days is None or len(self._days[0]) != len(self.tid):
+            self._days = (
+                array("l", (date.fromisoformat(d).toordinal() for d in self.ini)),
+                array("l", (date.fromisoformat(d).toordinal() for d in self.fim)),
+            )
+        return self._days
+
+    def row(self, i):
+        """Tupla da linha ``i`` no formato de TASKS_RAW."""
+        return tuple(col[i] for col in self._cols)
+
+    def get(self, tid, default=None):
+        i = self.index.get(tid)
+        return default if i is None else self.row(i)
+
+    def rows_fase(self, fase):
+        return self.by_fase.get(fase, [])
+
+    def rows_resp(self, resp):
+        return self.by_resp.get(resp, [])
+
+    def tasks_fase(self, fase):
+        return [self.row(i) for i in self.rows_fase(fase)]
+
+    def tasks_resp(self, resp):
+        return [self.row(i) for i in self.rows_resp(resp)]
+
+    def select(self, fase=None, resp=None):
+        """Linhas que atendem aos filtros de fase/responsável, em ordem do plano.
+
+        Parte do menor índice disponível e filtra só esse subconjunto.
+        """
+        if fase is None and resp is None:
+            return range(len(self.tid))
+        if fase is None:
+            return self.rows_resp(resp)
+        if resp is None:
+            return self.rows_fase(fase)
+        a, b = self.rows_fase(fase), self.rows_resp(resp)
+        if len(a) <= len(b):
+            return [i for i in a if self.resp[i] == resp]
+        return [i for i in b if self.fase[i] == fase]
@@ -0,0 +1,128 @@
+"""
+gantt.py — Renderizador de Gantt em SVG
+Intervalo de datas derivado do plano, zoom por dia/semana/mês, fases
+recolhíveis numa barra agregada e um único elemento <svg> por gráfico.
+Offsets e larguras das barras saem dos ordinais de data do TaskStore,
+calculados uma vez por zoom. Sem dependência de Streamlit.
+"""
+from datetime import date, timedelta
+from html import escape
+
+# Pixels por dia em cada nível de zoom
+ZOOM_PX = {"dia": 26.0, "semana": 7.0, "mês": 1.8}
+
+ROW_H   = 20
+HEAD_H  = 24
+LABEL_W = 280
+MESES   = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+
+BAR_COLORS = {
+    "concluido":    "#00e676",
+    "em andamento": "#f5a623",
+    "bloqueado":    "#ff5252",
+    "pendente":     "#2E75B6",
+}
+
+
+def date_range(store):
+    """``(primeiro_dia, dia_seguinte_ao_último)`` como ordinais."""
+    ini, fim = store.day_span()
+    if not len(ini):
+        today = date.today().toordinal()
+        return today, today + 1
+    return min(ini), max(fim) + 1
+
+
+def bar_geometry(store, zoom):
+    """Listas ``(x, w)`` em pixels para todas as linhas do plano."""
+    ppd = ZOOM_PX[zoom]
+    ini, fim = store.day_span()
+    origin, _ = date_range(store)
+    xs = [(a - origin) * ppd for a in ini]
+    ws = [max(1, b - a + 1) * ppd for a, b in zip(ini, fim)]
+    return xs, ws
+
+
+def _ticks(origin, end, zoom):
+    """``(offset_em_dias, rótulo)`` das marcações do cabeçalho."""
+    d0 = date.fromordinal(origin)
+    if zoom == "dia":
+        return [(i, (d0 + timedelta(days=i)).strftime("%d/%m")) for i in range(end - origin)]
+    if zoom == "semana":
+        first = origin + (-d0.weekday()) % 7
+        return [(o - origin, date.fromordinal(o).strftime("%d/%m")) for o in range(first, end, 7)]
+    ticks, d = [], date(d0.year, d0.month, 1)
+    while d.toordinal() < end:
+        ticks.append((max(0, d.toordinal() - origin), f"{MESES[d.month - 1]}/{d.strftime('%y')}"))
+        d = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+    return ticks
+
+
+def render_svg(store, state, zoom="dia", collapsed=(), cpm=None, fases=None, geometry=None):
+    """SVG do Gantt.
+
+    ``collapsed``: fases exibidas como uma única barra agregada (min ini → max fim,
+    preenchida pelo % concluído). ``cpm``: destaca as tarefas do caminho crítico.
+    ``geometry``: resultado de ``bar_geometry`` já calculado para o mesmo zoom.
+    """
+    ppd = ZOOM_PX[zoom]
+    origin, end = date_range(store)
+    xs, ws = geometry or bar_geometry(store, zoom)
+    ini, fim = store.day_span()
+    chart_w = (end - origin) * ppd
+    collapsed = set(collapsed)
+
+    out = []
+    y = HEAD_H
+    for fase in fases or store.fases:
+        rows = store.rows_fase(fase)
+        if not rows:
+            continue
+        out.append(
+            f'<text x="6" y="{y + 14}" class="g-fase">{escape(fase)}</text>'
+        )
+        if fase in collapsed:
+            a, b = min(ini[i] for i in rows), max(fim[i] for i in rows)
+            done = sum(1 for i in rows if state[store.tid[i]]["status"] == "concluido")
+            x, w = LABEL_W + (a - origin) * ppd, (b - a + 1) * ppd
+            out.append(
+                f'<g><title>{escape(fase)} · {len(rows)} tarefa(s) · {done} concluída(s)</title>'
+                f'<rect x="{x:.1f}" y="{y + 4}" width="{w:.1f}" height="12" rx="2" fill="#1F4E79"/>'
+                f'<rect x="{x:.1f}" y="{y + 4}" width="{w * done / len(rows):.1f}" height="12" rx="2" fill="#00e676"/></g>'
+            )
+            y += ROW_H
+            continue
+        y += ROW_H
+        for i in rows:
+            tid, nome = store.tid[i], store.nome[i]
+            st_ = state[tid]["status"]
+            x, w = LABEL_W + xs[i], ws[i]
+            crit = ' stroke="#ff5252" stroke-width="1.5"' if cpm is not None and cpm.is_critical(i) else ""
+            label = f'<text x="{x + 3:.1f}" y="{y + 13}" class="g-id">{escape(tid)}</text>' if w >= 30 else ""
+            short = nome[:38] + "..." if len(nome) > 38 else nome
+            out.append(
+                f'<text x="14" y="{y + 13}" class="g-nome">{escape(short)}</text>'
+                f'<g><title>{escape(tid)} — {escape(nome)} · {store.ini[i]} → {store.fim[i]} · {st_}</title>'
+                f'<rect x="{x:.1f}" y="{y + 3}" width="{w:.1f}" height="14" rx="2" '
+                f'fill="{BAR_COLORS.get(st_, BAR_COLORS["pendente"])}" fill-opacity=".85"{crit}/>{label}</g>'
+            )
+            y += ROW_H
+
+    grid = "".join(
+        f'<line x1="{LABEL_W + off * ppd:.1f}" y1="{HEAD_H - 4}" x2="{LABEL_W + off * ppd:.1f}" y2="{y}" class="g-grid"/>'
+        f'<text x="{LABEL_W + off * ppd + 2:.1f}" y="{HEAD_H - 8}" class="g-tick">{lbl}</text>'
+        for off, lbl in _ticks(origin, end, zoom)
+    )
+    width = LABEL_W + chart_w + 10
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{y + 6}" '
+        f'viewBox="0 0 {width:.0f} {y + 6}">'
+        '<style>'
+        '.g-fase{font:600 9px "IBM Plex Mono",monospace;fill:#f5a623;letter-spacing:.1em;text-transform:uppercase}'
+        '.g-nome{font:11px "IBM Plex Sans",sans-serif;fill:#c8d8e8}'
+        '.g-id{font:8px "IBM Plex Mono",monospace;fill:rgba(255,255,255,.85)}'
+        '.g-tick{font:8px "IBM Plex Mono",monospace;fill:#8899aa}'
+        '.g-grid{stroke:#1a2235;stroke-width:1}'
+        '</style>'
+        f'{grid}{"".join(out)}</svg>'
+    )
@@ -0,0 +1,195 @@
+"""
+metrics.py — Métricas de execução do app (histogramas no formato Prometheus)
+Cada rerun mede suas seções (CSS, KPIs, sidebar, hero, corpo da página...):
+tempo de parede e HTML emitido, com os rótulos de página e papel do usuário.
+As medições ficam na própria execução (``Rerun``) e entram nos histogramas
+do processo de uma vez, no fim, com um único lock — também quando a execução
+termina num ``st.rerun()``. ``emitted(html)`` soma os bytes (UTF-8) do HTML ao
+rerun corrente da thread (cada sessão roda o script na sua thread).
+
+Exportação opcional, sem custo enquanto ninguém lê:
+  - ``serve(porta)``: thread com http.server; o texto só é montado a cada scrape;
+  - ``write(caminho)``: arquivo texto (node_exporter textfile collector),
+    regravado no máximo a cada ``interval`` segundos.
+Sem dependência de Streamlit.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "sesuite_"
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS   = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20)
+
+HELP = {
+    "section_seconds":    ("histogram", "Tempo de parede por seção do rerun"),
+    "section_html_bytes": ("histogram", "HTML emitido por seção do rerun (bytes UTF-8)"),
+    "rerun_seconds":      ("histogram", "Tempo total do rerun"),
+    "reruns_total":       ("counter",   "Reruns por página, papel e tipo (full/fragment)"),
+}
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)    # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+
+
+class Metrics:
+    """Histogramas e contadores do processo, por nome + rótulos."""
+
+    def __init__(self):
+        self._hist = {}      # (nome, rótulos) → Histogram
+        self._count = {}     # (nome, rótulos) → int
+        self._lock = threading.Lock()
+        self._written = 0.0
+        self._server = None
+
+    def record(self, rerun, page, role):
+        """Soma as medições de um rerun aos histogramas."""
+        base = (("page", page), ("role", role))
+        with self._lock:
+            for name, seconds, size in rerun.sections:
+                labels = (("section", name), *base)
+                self._observe("section_seconds", labels, seconds, SECONDS_BUCKETS)
+                self._observe("section_html_bytes", labels, size, BYTES_BUCKETS)
+            self._observe("rerun_seconds", (*base, ("kind", rerun.kind)), rerun.elapsed(), SECONDS_BUCKETS)
+            key = ("reruns_total", (*base, ("kind", rerun.kind)))
+            self._count[key] = self._count.get(key, 0) + 1
+
+    def _observe(self, name, labels, value, bounds):
+        h = self._hist.get((name, labels))
+        if h is None:
+            h = self._hist[(name, labels)] = Histogram(bounds)
+        h.observe(value)
+
+    # ── Exportação ──────────────────────────────────────────
+    def render(self):
+        """Texto no formato de exposição do Prometheus."""
+        with self._lock:
+            hist = sorted((k, (h.bounds, list(h.counts), h.sum, h.count)) for k, h in self._hist.items())
+            counters = sorted(self._count.items())
+        out, typed = [], set()
+
+        def header(name):
+            if name not in typed:
+                typed.add(name)
+                kind, text = HELP[name]
+                out.append(f"# HELP {PREFIX}{name} {text}")
+                out.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), (bounds, counts, total, count) in hist:
+            header(name)
+            lbl, acc = _labels(labels), 0
+            for bound, n in zip((*bounds, "+Inf"), counts):
+                acc += n
+                out.append(f'{PREFIX}{name}_bucket{{{lbl},le="{bound}"}} {acc}')
+            out.append(f"{PREFIX}{name}_sum{{{lbl}}} {total:.6f}")
+            out.append(f"{PREFIX}{name}_count{{{lbl}}} {count}")
+        for (name, labels), n in counters:
+            header(name)
+            out.append(f"{PREFIX}{name}{{{_labels(labels)}}} {n}")
+        return "\n".join(out) + "\n"
+
+    def write(self, path, interval=15.0):
+        """Regrava ``path`` (atômico) se a última gravação tiver mais de ``interval`` s."""
+        now = time.monotonic()
+        if now - self._written < interval:
+            return False
+        self._written = now
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(self.render())
+        os.replace(tmp, path)
+        return True
+
+    def serve(self, port, host="127.0.0.1"):
+        """Endpoint ``/metrics`` numa thread daemon (uma vez por processo)."""
+        if self._server is not None:
+            return self._server
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+
+_current = threading.local()
+
+
+def emitted(body):
+    """Conta os bytes de ``body`` como HTML emitido pela seção em andamento."""
+    rerun = getattr(_current, "rerun", None)
+    if rerun is not None:
+        rerun.html += len(body.encode())
+
+
+class Rerun:
+    """Medições de uma execução do script (ou de um fragmento); passa a ser o rerun corrente da thread."""
+
+    def __init__(self, kind="full"):
+        self.kind = kind
+        self.sections = []   # (nome, segundos, bytes de HTML)
+        self.html = 0
+        self.finished = False
+        self._t0 = time.perf_counter()
+        _current.rerun = self
+
+    def begin(self, name):
+        """Abre uma seção que não cabe num ``with`` (ex.: o resto do script)."""
+        return name, time.perf_counter(), self.html
+
+    def end(self, mark):
+        name, t, html = mark
+        self.sections.append((name, time.perf_counter() - t, self.html - html))
+
+    @contextmanager
+    def section(self, name):
+        mark = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(mark)
+
+    def elapsed(self):
+        return time.perf_counter() - self._t0
+
+    def finish(self, metrics, page, role):
+        """Entra nos histogramas (uma vez só, mesmo que chamado de novo)."""
+        if self.finished:
+            return
+        metrics.record(self, page, role)
+        self.finished = True
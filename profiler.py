@@ -0,0 +1,162 @@
+"""
+profiler.py — Perfil de execução sob demanda (cProfile + amostragem)
+``Profile`` acumula várias execuções do script: o cProfile dá os hotspots
+(tempo próprio e acumulado por função) e o arquivo ``.prof`` (abre com
+snakeviz, pstats...); uma thread de amostragem lê a pilha da thread do script
+via ``sys._current_frames()`` a cada ``interval`` segundos e conta pilhas
+"dobradas" (``a;b;c``), que viram o flame graph (``flame_html``).
+
+Só custa algo enquanto está ligado. Sem dependência de Streamlit.
+"""
+import cProfile
+import html
+import marshal
+import pstats
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+SAMPLE_INTERVAL = 0.005
+MAX_DEPTH       = 60
+
+
+def _label(code):
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id, folded, interval, root_file):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id, self.folded, self.interval, self.root_file = thread_id, folded, interval, root_file
+        self.stopped = threading.Event()
+        self.samples = 0
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            stack.reverse()
+            if self.root_file:
+                # Descarta o que vem antes do script (runtime do Streamlit)
+                start = next((i for i, c in enumerate(stack) if c.co_filename == self.root_file), None)
+                if start is None:
+                    continue
+                stack = stack[start:]
+            self.folded[";".join(_label(c) for c in stack[:MAX_DEPTH])] += 1
+            self.samples += 1
+
+
+class Profile:
+    """cProfile + amostragem acumulados ao longo de várias execuções."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, root_file=None):
+        self.interval = interval
+        self.root_file = root_file
+        self.prof = cProfile.Profile()
+        self.folded = Counter()
+        self.runs = 0
+        self.samples = 0
+        self.wall = 0.0
+        self._sampler = None
+        self._t0 = None
+
+    def start(self):
+        if self._t0 is not None:       # execução anterior interrompida (st.rerun/st.stop)
+            self.stop(count=False)
+        self._t0 = time.perf_counter()
+        self._sampler = _Sampler(threading.get_ident(), self.folded, self.interval, self.root_file)
+        self._sampler.start()
+        self.prof.enable()
+
+    def stop(self, count=True):
+        if self._t0 is None:
+            return
+        self.prof.disable()
+        self._sampler.stopped.set()
+        self._sampler.join()
+        self.samples += self._sampler.samples
+        if count:
+            self.runs += 1
+            self.wall += time.perf_counter() - self._t0
+        self._t0 = None
+
+    # ── Resultados ──────────────────────────────────────────
+    def hotspots(self, top=30, sort="tottime"):
+        """``[(função, chamadas, tempo próprio s, tempo acumulado s)]`` ordenado por ``sort``."""
+        stats = pstats.Stats(self.prof)
+        key = {"tottime": 2, "cumtime": 3}[sort]
+        rows = [
+            (f"{func} ({Path(file).name}:{line})" if line else func, nc, tt, ct)
+            for (file, line, func), (cc, nc, tt, ct, _) in stats.stats.items()
+        ]
+        rows.sort(key=lambda r: r[key], reverse=True)
+        return rows[:top]
+
+    def dump(self):
+        """Conteúdo de um arquivo ``.prof`` (formato do ``pstats``)."""
+        self.prof.create_stats()
+        return marshal.dumps(self.prof.stats)
+
+    def folded_text(self):
+        """Pilhas no formato "dobrado" (flamegraph.pl, speedscope)."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.folded.most_common())
+
+
+# ── Flame graph (SVG) ───────────────────────────────────────
+def _tree(folded):
+    root = {"name": "total", "value": 0, "children": {}}
+    for stack, n in folded.items():
+        root["value"] += n
+        node = root
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"name": name, "value": 0, "children": {}})
+            node["value"] += n
+    return root
+
+
+def _color(name):
+    h = zlib.crc32(name.encode()) % 60
+    return f"hsl({10 + h},75%,{52 + h % 12}%)"
+
+
+def flame_html(folded, width=1100, row=17, min_px=0.5):
+    """Flame graph em SVG (raiz no topo); a largura é proporcional às amostras."""
+    root = _tree(folded)
+    if not root["value"]:
+        return ""
+    scale = width / root["value"]
+    rects, depth_max = [], 0
+
+    def walk(node, x, depth):
+        nonlocal depth_max
+        w = node["value"] * scale
+        if w < min_px:
+            return
+        depth_max = max(depth_max, depth)
+        pct = node["value"] / root["value"] * 100
+        name = html.escape(node["name"])
+        y = depth * row
+        text = html.escape(node["name"][: int(w / 6.2)]) if w > 60 else ""
+        rects.append(
+            f'<g><title>{name} — {node["value"]} amostras ({pct:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="{_color(node["name"])}" rx="2"/>'
+            + (f'<text x="{x + 3:.1f}" y="{y + row - 5}" font-size="10" font-family="IBM Plex Mono,monospace" '
+               f'fill="#111">{text}</text>' if text else "")
+            + "</g>"
+        )
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            walk(child, x, depth + 1)
+            x += child["value"] * scale
+
+    walk(root, 0.0, 0)
+    h = (depth_max + 1) * row
+    return (
+        f'<div style="overflow-x:auto"><svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{h}" '
+        f'viewBox="0 0 {width} {h}">{"".join(rects)}</svg></div>'
+    )
@@ -0,0 +1,122 @@
+"""
+ratelimit.py — Limite de tentativas por token bucket (compartilhado pelo processo)
+Um balde por chave (usuário, endereço do cliente...): ``capacity`` fichas,
+repostas continuamente à razão de ``capacity / per_seconds``. Cada operação
+é O(1): o balde é recalculado só quando a chave é consultada.
+
+Memória limitada: as chaves ficam num OrderedDict em ordem de último uso;
+baldes ociosos há mais de ``idle_ttl`` (já cheios de novo) saem pela frente
+da fila e, acima de ``max_entries``, a chave menos recente é descartada.
+
+Opcionalmente grava os baldes em SQLite para o limite sobreviver a um
+restart. Sem dependência de Streamlit.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_bucket (
+    name   TEXT NOT NULL,
+    key    TEXT NOT NULL,
+    tokens REAL NOT NULL,
+    ts     REAL NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+# A cada quantas operações os baldes ociosos são apagados do SQLite
+DB_SWEEP_EVERY = 1000
+
+
+class TokenBuckets:
+    """Conjunto de token buckets com os mesmos parâmetros (ex.: um por usuário)."""
+
+    def __init__(self, name, capacity, per_seconds, max_entries=10_000, idle_ttl=None, db_path=None):
+        self.name = name
+        self.capacity = float(capacity)
+        self.rate = capacity / per_seconds                 # fichas por segundo
+        self.max_entries = max_entries
+        # Depois disso o balde já está cheio: guardar ou não dá no mesmo
+        self.idle_ttl = idle_ttl or per_seconds
+        self._data = OrderedDict()                         # key → [tokens, ts]
+        self._lock = threading.Lock()
+        self._db = None
+        self._ops = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    # ── Interno (chamado com o lock) ────────────────────────
+    def _bucket(self, key, now):
+        b = self._data.get(key)
+        if b is None:
+            b = self._load(key) or [self.capacity, now]
+            self._data[key] = b
+        else:
+            self._data.move_to_end(key)
+        b[0] = min(self.capacity, b[0] + (now - b[1]) * self.rate)
+        b[1] = now
+        self._expire(now)
+        return b
+
+    def _expire(self, now):
+        data = self._data
+        while data:
+            key, (_, ts) = next(iter(data.items()))
+            if len(data) <= self.max_entries and now - ts < self.idle_ttl:
+                break
+            data.popitem(last=False)
+
+    def _load(self, key):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT tokens, ts FROM rate_bucket WHERE name = ? AND key = ?", (self.name, key)
+        ).fetchone()
+        return list(row) if row else None
+
+    def _save(self, key, b, now):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO rate_bucket (name, key, tokens, ts) VALUES (?, ?, ?, ?)",
+            (self.name, key, b[0], b[1]),
+        )
+        self._ops += 1
+        if self._ops % DB_SWEEP_EVERY == 0:
+            self._db.execute(
+                "DELETE FROM rate_bucket WHERE name = ? AND ts < ?", (self.name, now - self.idle_ttl)
+            )
+
+    # ── API ─────────────────────────────────────────────────
+    def retry_after(self, key, cost=1, now=None):
+        """Segundos até haver ``cost`` fichas (0 = liberado); não consome."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens = self._bucket(key, now)[0]
+        return 0.0 if tokens >= cost else (cost - tokens) / self.rate
+
+    def consume(self, key, cost=1, now=None):
+        """Tira ``cost`` fichas (sem ficar negativo). Retorna as fichas restantes."""
+        now = time.time() if now is None else now
+        with self._lock:
+            b = self._bucket(key, now)
+            b[0] = max(0.0, b[0] - cost)
+            self._save(key, b, now)
+            return b[0]
+
+    def reset(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM rate_bucket WHERE name = ? AND key = ?", (self.name, key))
+
+    def __len__(self):
+        return len(self._data)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
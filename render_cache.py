@@ -0,0 +1,80 @@
+"""
+render_cache.py — Cache de fragmentos HTML já renderizados
+LRU compartilhado pelo processo. A chave é um hash da versão do estado do
+plano + filtros ativos: enquanto nenhum dado muda (troca de página, reabrir
+o sidebar...), o rerun reaproveita o HTML pronto.
+
+Limitado pelo tamanho total do HTML guardado (``max_bytes``), além do número
+de entradas: um fragmento de plano grande passa de 1 MB. Quando um plano
+ganha uma versão nova, os fragmentos das versões anteriores dele saem na
+hora, sem esperar a vez no LRU.
+Sem dependência de Streamlit.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 512
+MAX_BYTES   = 64 * 2 ** 20
+
+
+def fragment_key(*parts):
+    """Hash estável de ``parts`` (versão do plano, nome da tabela, filtros...)."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class FragmentCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()      # key → (html, plano, versão)
+        self._latest = {}               # plano → versão mais nova já guardada
+        self._lock = threading.Lock()
+        self.bytes = 0                  # soma de len(html) das entradas
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render, scope=None, version=None):
+        """HTML em cache para ``key``; se ausente, chama ``render()`` e guarda.
+
+        ``scope``/``version`` (plano e versão do estado): guardar uma versão
+        mais nova descarta as anteriores do mesmo plano; HTML de uma versão
+        já superada é devolvido mas não guardado.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        html = render()
+        size = len(html)
+        with self._lock:
+            if scope is not None:
+                latest = self._latest.get(scope)
+                if latest is not None and version < latest:
+                    return html
+                if latest is not None and version > latest:
+                    for k in [k for k, e in self._data.items() if e[1] == scope and e[2] < version]:
+                        self._pop(k)
+                self._latest[scope] = version
+            if size > self.max_bytes or key in self._data:
+                return html
+            self._data[key] = (html, scope, version)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+        return html
+
+    def _pop(self, key):
+        self.bytes -= len(self._data.pop(key)[0])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._latest.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,66 @@
+"""
+revocations.py — Tokens de sessão revogados (logout) até a expiração de cada um
+Guarda o id (``j``) de cada token revogado com a expiração dele: depois
+disso a assinatura já não vale e a entrada é apagada.
+
+Com ``db_path`` as revogações vão para SQLite (o mesmo arquivo do limite de
+tentativas serve): um token encerrado no logout continua recusado depois de
+um restart e pelos outros processos que usam o mesmo arquivo. Sem
+``db_path`` ficam só na memória do processo. Sem dependência de Streamlit.
+"""
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revoked_token (
+    jti     TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+);
+"""
+
+
+class RevokedTokens:
+    """Conjunto de ids revogados; ``jti in revoked`` vale até a expiração do token."""
+
+    def __init__(self, db_path=None):
+        self._mem = {}                                     # jti → expiração
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    def _prune(self, now):
+        for jti in [j for j, exp in self._mem.items() if exp < now]:
+            del self._mem[jti]
+        if self._db is not None:
+            self._db.execute("DELETE FROM revoked_token WHERE expires < ?", (now,))
+
+    def add(self, jti, expires, now=None):
+        """Revoga ``jti`` até ``expires`` (epoch) e apaga as revogações já vencidas."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune(now)
+            self._mem[jti] = expires
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO revoked_token (jti, expires) VALUES (?, ?)", (jti, expires)
+                )
+
+    def __contains__(self, jti):
+        now = time.time()
+        with self._lock:
+            expires = self._mem.get(jti)
+            if expires is None and self._db is not None:
+                row = self._db.execute("SELECT expires FROM revoked_token WHERE jti = ?", (jti,)).fetchone()
+                expires = row[0] if row else None
+        return expires is not None and expires >= now
+
+    def __len__(self):
+        return len(self._mem)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
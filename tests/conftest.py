@@ -0,0 +1,34 @@
+"""
+conftest.py — Testes rodam a partir da raiz do projeto (``python -m pytest``)
+Planos de teste vêm do gerador dos benchmarks (benchmarks/synthetic.py);
+``app_test`` roda o app.py inteiro com ``streamlit.testing``.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+@pytest.fixture
+def app_test(tmp_path, monkeypatch):
+    """``AppTest`` do app.py com sessão de administrador, banco e pasta de projetos temporários."""
+    st = pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(ROOT)
+    st.cache_resource.clear()                     # PlanDB, projetos etc. são por processo
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60)
+    at.secrets["PLAN_DB_PATH"] = str(tmp_path / "plan_state.db")
+    at.secrets["PROJECTS_DIR"] = str(tmp_path / "projects")
+    at.session_state["authenticated"] = True
+    at.session_state["username"] = "admin"
+    at.session_state["user_name"] = "Admin"
+    at.session_state["user_role"] = "admin"
+    at.session_state["login_time"] = datetime.now()
+    yield at
+    st.cache_resource.clear()
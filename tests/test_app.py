@@ -0,0 +1,119 @@
+"""
+test_app.py — O app.py inteiro sob ``streamlit.testing``: páginas, reruns e HTML emitido
+"""
+import json
+
+import pytest
+
+from views import NAV_PAGES
+
+EVIL = '<img src=x onerror=alert(1)>'
+
+
+def _markup(at):
+    return "\n".join(m.value for m in at.markdown)
+
+
+def _plan_file(tmp_path, name, tasks):
+    d = tmp_path / "projects"
+    d.mkdir(exist_ok=True)
+    (d / f"{name}.json").write_text(json.dumps(tasks), encoding="utf-8")
+
+
+def test_texto_do_plano_e_escapado(app_test, tmp_path):
+    fields = {"fase": f"<b>Fase</b>{EVIL}", "nome": f"Tarefa {EVIL}", "resp": f"<i>Infra</i>{EVIL}",
+              "aviso": f'x" onmouseover="alert(1)" {EVIL}'}
+    _plan_file(tmp_path, "evil", [
+        dict(fields, id=f"T{i}", ini="2025-02-03", fim="2025-02-05",
+             status="bloqueado" if i == 3 else "pendente", deps=["T1"] if i > 1 else [])
+        for i in range(1, 4)
+    ])
+    app_test.session_state["project"] = "evil"
+    app_test.run()
+    assert not app_test.exception
+    for page in NAV_PAGES:
+        app_test.sidebar.radio[0].set_value(page).run()
+        assert not app_test.exception, page
+        html = _markup(app_test)
+        assert "&lt;img src=x onerror=alert(1)&gt;" in html, page
+        assert EVIL not in html and 'onmouseover="' not in html and "<b>Fase</b>" not in html, page
+
+
+def test_exportacao_so_no_clique(app_test, monkeypatch):
+    from core import plan_export
+    from core.plan_data import DEPS, TASKS_RAW
+    from core.task_store import TaskStore
+    from views.tarefas import export_artifact
+
+    calls = []
+    real = plan_export.export_bytes
+    monkeypatch.setattr(plan_export, "export_bytes", lambda *a, **k: calls.append(a[0]) or real(*a, **k))
+    app_test.run()
+    app_test.sidebar.radio[0].set_value("📋 Tarefas").run()
+    assert not app_test.exception
+    assert len(app_test.get("download_button")) == 1
+    assert calls == []                                  # o render não monta o arquivo
+
+    # O que o clique chama: montado uma vez por plano, versão e formato
+    store, ts = TaskStore(TASKS_RAW, DEPS), app_test.session_state["task_state"]
+    data = export_artifact(store, dict(ts), "p", 0, 1, "json")
+    assert calls == ["json"] and len(json.loads(data)) == len(store)
+    export_artifact(store, dict(ts), "p", 0, 1, "json")
+    assert calls == ["json"]
+
+
+def _task(tid, nome, deps=()):
+    return {"fase": "F1", "id": tid, "nome": nome, "resp": "DBA",
+            "ini": "2025-02-03", "fim": "2025-02-04", "deps": list(deps)}
+
+
+def test_plano_recarregado_do_arquivo(app_test, tmp_path):
+    # Limite de memória mínimo: abrir outro projeto descarrega o anterior
+    app_test.secrets["PROJECTS_MAX_MB"] = 0
+    _plan_file(tmp_path, "obra", [_task("T1", "Fundação"), _task("T2", "Estrutura", ["T1"])])
+    app_test.session_state["project"] = "obra"
+    app_test.run()
+    assert not app_test.exception
+    default = next(p for p in app_test.sidebar.selectbox[0].options if p != "obra")
+
+    app_test.sidebar.selectbox[0].set_value(default).run()
+    _plan_file(tmp_path, "obra", [_task("T1", "Fundação revista"), _task("T2", "Estrutura", ["T1"]),
+                                  _task("T3", "Cobertura", ["T2"])])
+    app_test.sidebar.selectbox[0].set_value("obra").run()
+    assert not app_test.exception
+    assert set(app_test.session_state["task_state"]) == {"T1", "T2", "T3"}
+    app_test.sidebar.radio[0].set_value("📋 Tarefas").run()
+    assert not app_test.exception
+    assert "Fundação revista" in _markup(app_test) and "Cobertura" in _markup(app_test)
+
+
+def test_timeline_um_svg_por_zoom(app_test):
+    import gantt
+
+    app_test.run()
+    app_test.sidebar.radio[0].set_value("📅 Timeline").run()
+    assert not app_test.exception
+    seen = set()
+    for zoom in gantt.ZOOM_PX:
+        next(r for r in app_test.main.radio if r.label == "Zoom").set_value(zoom).run()
+        assert not app_test.exception, zoom
+        svg = [m.value for m in app_test.markdown if "<svg" in m.value]
+        assert len(svg) == 1 and svg[0].count("<svg") == 1, zoom
+        seen.add(svg[0])
+    assert len(seen) == len(gantt.ZOOM_PX)              # cada zoom tem o seu fragmento em cache
+
+
+def test_burndown_montado_uma_vez_por_versao(app_test, monkeypatch):
+    from core import burndown
+
+    calls = []
+    real = burndown.build
+    monkeypatch.setattr(burndown, "build", lambda *a, **k: calls.append(1) or real(*a, **k))
+    app_test.run()
+    page = next(p for p in NAV_PAGES if "Burndown" in p)
+    app_test.sidebar.radio[0].set_value(page).run()
+    assert not app_test.exception
+    for recorte in ("Fase", "Responsável", "Plano"):
+        next(r for r in app_test.main.radio if r.label == "Recorte").set_value(recorte).run()
+        assert not app_test.exception, recorte
+    assert len(calls) == 1                              # trocar o recorte não refaz as séries
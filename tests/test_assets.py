@@ -0,0 +1,53 @@
+"""
+test_assets.py — Bundles de CSS e a linha de comando do assets.py
+"""
+import pytest
+
+import assets
+
+
+@pytest.fixture
+def static(tmp_path, monkeypatch):
+    """static/ temporário; ``build`` refeito do zero."""
+    monkeypatch.setattr(assets, "OUT_DIR", tmp_path)
+    monkeypatch.setattr(assets, "FONT_DIR", tmp_path / "fonts")
+    assets.build.cache_clear()
+    yield tmp_path
+    assets.build.cache_clear()
+
+
+def _with_fonts(static):
+    (static / "fonts").mkdir()
+    for name in assets.missing_fonts():
+        (static / "fonts" / name).write_bytes(b"woff2")
+
+
+@pytest.mark.parametrize("cmd", ["build", "report"])
+def test_comando_com_fontes(static, capsys, cmd):
+    _with_fonts(static)
+    assert assets.main([cmd]) == 0
+    assert "ausente" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("cmd", ["build", "report"])
+def test_comando_sem_fontes_avisa(static, capsys, cmd):
+    assert assets.main([cmd]) == 0
+    assert "fonte(s) ausente(s)" in capsys.readouterr().out
+
+
+def test_comando_desconhecido(static):
+    assert "comando desconhecido" in assets.main(["deploy"])
+
+
+def test_font_face_so_das_fontes_presentes(static):
+    assert "@font-face" not in assets.build()["app"]["css"]
+    _with_fonts(static)
+    assets.build.cache_clear()
+    entry = assets.build()["app"]
+    assert "@font-face" in entry["css"] and "url(app/static/fonts/" in entry["inline_css"]
+    assert (static / entry["file"]).read_text(encoding="utf-8") == entry["css"]
+
+
+def test_link_e_inline(static):
+    assert assets.style_block("login").startswith("<style>")
+    assert assets.style_block("login", link=True) == f'<link rel="stylesheet" href="app/static/{assets.build()["login"]["file"]}">'
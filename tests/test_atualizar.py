@@ -0,0 +1,147 @@
+"""
+test_atualizar.py — Página Atualizar: escopo do rerun depois de um save e saves pelo app
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from streamlit.errors import StreamlitAPIException  # noqa: E402
+
+from core.rollups import StatusRollup  # noqa: E402
+from core.task_store import TaskStore  # noqa: E402
+from views import atualizar  # noqa: E402
+from views.common import sidebar_counts  # noqa: E402
+
+TASKS = [
+    ("F1", "T1", "a", "Ana",   "2025-02-03", "2025-02-04", "pendente", ""),
+    ("F1", "T2", "b", "Bruno", "2025-02-03", "2025-02-06", "concluido", ""),
+]
+
+
+class _Rerun(Exception):
+    pass
+
+
+class _Session(dict):
+    __getattr__ = dict.__getitem__
+
+
+def _fake_st(monkeypatch, shown, fragment_ok=True):
+    store = TaskStore(TASKS)
+    rollup = StatusRollup(store, {t[1]: {"status": t[6]} for t in TASKS})
+    calls = []
+
+    def rerun(scope="app"):
+        calls.append(scope)
+        if scope == "fragment" and not fragment_ok:
+            raise StreamlitAPIException("fora de um rerun do fragmento")
+        raise _Rerun
+
+    session = _Session(rollup=rollup, sidebar_shown=shown(store, rollup))
+    monkeypatch.setattr(atualizar, "st", SimpleNamespace(session_state=session, rerun=rerun))
+    return store, rollup, calls
+
+
+def test_save_sem_mudar_a_sidebar_reexecuta_so_o_fragmento(monkeypatch):
+    store, rollup, calls = _fake_st(monkeypatch, sidebar_counts)
+    rollup.apply("T1", "pendente", "bloqueado")         # não mexe em concluídas
+    with pytest.raises(_Rerun):
+        atualizar.rerun_panel(store)
+    assert calls == ["fragment"]
+
+
+def test_save_que_muda_a_sidebar_reexecuta_o_app(monkeypatch):
+    store, rollup, calls = _fake_st(monkeypatch, sidebar_counts)
+    rollup.apply("T1", "pendente", "concluido")
+    with pytest.raises(_Rerun):
+        atualizar.rerun_panel(store)
+    assert calls == ["app"]
+
+
+def test_execucao_completa_cai_no_rerun_do_app(monkeypatch):
+    store, _, calls = _fake_st(monkeypatch, sidebar_counts, fragment_ok=False)
+    with pytest.raises(_Rerun):
+        atualizar.rerun_panel(store)
+    assert calls == ["fragment", "app"]
+
+
+def test_sidebar_de_data_passada_pede_o_app(monkeypatch):
+    # Sidebar mostrando uma posição histórica (sidebar_shown = None): o save volta ao presente
+    store, _, calls = _fake_st(monkeypatch, lambda store, rollup: None)
+    with pytest.raises(_Rerun):
+        atualizar.rerun_panel(store)
+    assert calls == ["app"]
+
+
+# ── Pelo app inteiro ────────────────────────────────────────
+def _sidebar_progress(at):
+    return next(m.value for m in at.sidebar.markdown if "tarefas</div>" in m.value)
+
+
+def _save(at, tid, status, aviso=None):
+    opt = next(o for o in at.selectbox(key="sel_tarefa").options if o.startswith(f"{tid} — "))
+    at.selectbox(key="sel_tarefa").set_value(opt).run()
+    next(s for s in at.selectbox if s.label == "Novo Status").set_value(status)
+    if aviso is not None:
+        next(t for t in at.text_area if t.label.startswith("Aviso")).set_value(aviso)
+    next(b for b in at.button if "Salvar" in b.label).click().run()
+    assert not at.exception
+
+
+@pytest.fixture
+def atualizar_page(app_test):
+    app_test.run()
+    app_test.sidebar.radio[0].set_value("✏️ Atualizar").run()
+    assert not app_test.exception
+    return app_test
+
+
+def _pending(at):
+    ts = at.session_state["task_state"]
+    return next(tid for tid, row in ts.items() if row["status"] == "pendente")
+
+
+def test_save_atualiza_sidebar_e_contadores(atualizar_page):
+    at = atualizar_page
+    tid = _pending(at)
+    before = _sidebar_progress(at)
+    rollup = at.session_state["rollup"]
+    _save(at, tid, "concluido")
+    assert at.session_state["task_state"][tid]["status"] == "concluido"
+    assert any(tid in s.value for s in at.success)
+    # Delta da própria instância do PlanDB: o rollup da sessão é atualizado, não remontado
+    assert at.session_state["rollup"] is rollup
+    assert rollup.check(at.session_state["task_state"]) == []
+    assert _sidebar_progress(at) != before
+    assert at.session_state["sidebar_shown"][0] == rollup.kpis()[1]      # sidebar refeita no rerun completo
+
+
+def test_save_so_do_aviso_mantem_a_sidebar(atualizar_page):
+    at = atualizar_page
+    tid = _pending(at)
+    shown = at.session_state["sidebar_shown"]
+    _save(at, tid, "pendente", "aguarda janela")
+    assert at.session_state["task_state"][tid]["aviso"] == "aguarda janela"
+    assert at.session_state["sidebar_shown"] == shown
+
+
+def test_save_em_conflito_nao_grava(atualizar_page):
+    from core.persistence import PlanDB
+
+    at = atualizar_page
+    tid = _pending(at)
+    opt = next(o for o in at.selectbox(key="sel_tarefa").options if o.startswith(f"{tid} — "))
+    at.selectbox(key="sel_tarefa").set_value(opt).run()
+    # Outra sessão grava a mesma tarefa enquanto o formulário está aberto
+    db = PlanDB(at.secrets["PLAN_DB_PATH"], readers=1)
+    try:
+        db.write_task(at.session_state["project"], tid, "bloqueado", "outra sessão", "bruno")
+    finally:
+        db.close()
+    next(s for s in at.selectbox if s.label == "Novo Status").set_value("concluido")
+    next(b for b in at.button if "Salvar" in b.label).click().run()
+    assert not at.exception
+    assert any("alterada em outra sessão" in w.value for w in at.warning)
+    assert at.session_state["task_state"][tid]["status"] == "bloqueado"
@@ -0,0 +1,221 @@
+"""
+test_auth.py — Endereço do cliente para o limite de login, baldes por chave, token de sessão,
+verificação de senha no pool e diretório de usuários em cache
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import auth  # noqa: E402
+from ratelimit import TokenBuckets  # noqa: E402
+from revocations import RevokedTokens  # noqa: E402
+
+
+def _fake_st(monkeypatch, hops=0, ip="10.0.0.9", xff=None):
+    headers = {"X-Forwarded-For": xff} if xff is not None else {}
+    fake = SimpleNamespace(
+        secrets={"AUTH_TRUSTED_PROXY_HOPS": hops},
+        context=SimpleNamespace(ip_address=ip, headers=headers),
+    )
+    monkeypatch.setattr(auth, "st", fake)
+
+
+def test_sem_proxy_usa_o_socket_e_ignora_o_cabecalho(monkeypatch):
+    _fake_st(monkeypatch, ip="203.0.113.7", xff="1.2.3.4")
+    assert auth._client_address() == "203.0.113.7"
+
+
+def test_proxy_confiavel_le_da_direita(monkeypatch):
+    # O cliente forja "1.2.3.4"; o NGinx acrescenta o IP real no fim
+    _fake_st(monkeypatch, hops=1, xff="1.2.3.4, 198.51.100.20")
+    assert auth._client_address() == "198.51.100.20"
+    _fake_st(monkeypatch, hops=2, xff="1.2.3.4, 198.51.100.20, 10.0.0.2")
+    assert auth._client_address() == "198.51.100.20"
+
+
+def test_sem_endereco_confiavel_nao_ha_balde_comum(monkeypatch):
+    _fake_st(monkeypatch, hops=2, xff="198.51.100.20")
+    assert auth._client_address() is None
+    _fake_st(monkeypatch, ip=None)
+    assert auth._client_address() is None
+    by_login, by_address = TokenBuckets("login", 5, 60), TokenBuckets("ip", 5, 60)
+    monkeypatch.setattr(auth, "_login_limiters", lambda: (by_login, by_address))
+    assert auth._limit_keys("ana") == [(by_login, "ana")]
+
+
+def test_baldes_persistidos(tmp_path):
+    db = str(tmp_path / "ratelimit.db")
+    b = TokenBuckets("login", 3, 60, db_path=db)
+    for _ in range(3):
+        b.consume("ana", now=1000.0)
+    assert b.retry_after("ana", now=1000.0) == pytest.approx(20.0)
+    b.close()
+    # Outro processo (ou um restart) enxerga o mesmo balde
+    b = TokenBuckets("login", 3, 60, db_path=db)
+    assert b.retry_after("ana", now=1010.0) == pytest.approx(10.0)
+    assert b.retry_after("bruno", now=1010.0) == 0.0
+    b.close()
+
+
+# ── Token de sessão ─────────────────────────────────────────
+@pytest.fixture
+def tokens(monkeypatch):
+    _fake_st(monkeypatch)
+    monkeypatch.setattr(auth, "_token_key", lambda: b"k" * 32)
+    revoked = RevokedTokens()
+    monkeypatch.setattr(auth, "_revoked", lambda: revoked)
+    return revoked
+
+
+def test_token_ida_e_volta(tokens):
+    token = auth.issue_token("ana", "editor", datetime(2025, 2, 3, 9, 30))
+    claims = auth.read_token(token)
+    assert (claims["u"], claims["r"], claims["t"]) == ("ana", "editor", int(datetime(2025, 2, 3, 9, 30).timestamp()))
+    assert claims["e"] > time.time()
+
+
+def test_token_adulterado(tokens, monkeypatch):
+    token = auth.issue_token("ana", "viewer", datetime.now())
+    body, _, sig = token.partition(".")
+    claims = json.loads(auth._unb64url(body))
+    forged = auth._b64url(json.dumps(dict(claims, r="admin")).encode())
+    assert auth.read_token(f"{forged}.{sig}") is None
+    assert auth.read_token(f"{body}.{sig[:-1]}{'A' if sig[-1] != 'A' else 'B'}") is None
+    # Assinado com outra chave (AUTH_TOKEN_KEY trocada)
+    monkeypatch.setattr(auth, "_token_key", lambda: b"x" * 32)
+    assert auth.read_token(token) is None
+
+
+def test_token_expirado(tokens, monkeypatch):
+    token = auth.issue_token("ana", "editor", datetime.now())
+    real = time.time
+    monkeypatch.setattr(time, "time", lambda: real() + auth.TOKEN_TTL_H * 3600 + 1)
+    assert auth.read_token(token) is None
+
+
+def test_token_revogado(tokens):
+    token = auth.issue_token("ana", "editor", datetime.now())
+    auth.revoke_token(token)
+    assert auth.read_token(token) is None
+    assert len(tokens) == 1
+    auth.revoke_token("lixo")                         # inválido: não revoga nada
+    assert len(tokens) == 1
+
+
+@pytest.mark.parametrize("token", [
+    None, "", ".", "abc", "abc.", ".abc", "abc.é", "é.abc", "abc.\udcff", "\udcff.abc",
+    "a.b.c", "%%%.$$$", auth._b64url(b"[1, 2]"),
+])
+def test_token_malformado(tokens, token):
+    assert auth.read_token(token) is None
+
+
+def test_token_assinado_mas_nao_objeto(tokens):
+    body = auth._b64url(b"[1, 2]")
+    assert auth.read_token(f"{body}.{auth._sign(body)}") is None
+
+
+# ── Senhas ──────────────────────────────────────────────────
+def test_hash_scrypt_ida_e_volta():
+    hashed = auth.hash_password("Segredo@1")
+    assert hashed.startswith("scrypt$") and not auth.needs_rehash(hashed)
+    assert hashed != auth.hash_password("Segredo@1")     # salt aleatório
+    assert auth.verify_password("Segredo@1", hashed)
+    assert not auth.verify_password("Segredo@2", hashed)
+
+
+def test_hash_pbkdf2_sem_scrypt(monkeypatch):
+    monkeypatch.delattr(hashlib, "scrypt")
+    monkeypatch.setattr(auth, "PBKDF2_ITERATIONS", 1000)
+    hashed = auth.hash_password("Segredo@1")
+    assert hashed.startswith("pbkdf2_sha256$1000$") and not auth.needs_rehash(hashed)
+    assert auth.verify_password("Segredo@1", hashed)
+    assert not auth.verify_password("segredo@1", hashed)
+
+
+def test_hash_legado_aceito_e_marcado_para_rehash():
+    hashed = auth.legacy_hash("Admin@2025", auth._auth_salt())
+    assert auth.needs_rehash(hashed)
+    assert auth.verify_password("Admin@2025", hashed)
+    assert not auth.verify_password("Admin@2026", hashed)
+
+
+@pytest.mark.parametrize("hashed", [
+    None, "", "scrypt$", "scrypt$x$8$1$AAAA$AAAA", "scrypt$16384$8$1$%%%$AAAA",
+    "pbkdf2_sha256$abc$AAAA$AAAA", "pbkdf2_sha256$1000$AAAA",
+])
+def test_hash_malformado(hashed):
+    assert not auth.verify_password("Admin@2025", hashed)
+
+
+def test_hash_ficticio_passa_pelo_kdf(monkeypatch):
+    # Login inexistente custa um scrypt como o real: o tempo não revela quem existe
+    calls = []
+    real = hashlib.scrypt
+    monkeypatch.setattr(hashlib, "scrypt", lambda *a, **kw: calls.append(kw["n"]) or real(*a, **kw))
+    assert not auth.verify_password("Admin@2025", auth._DUMMY_HASH)
+    assert calls == [auth.SCRYPT_N]
+
+
+def test_verificacao_roda_no_pool(monkeypatch):
+    threads = []
+    check = auth._check
+    monkeypatch.setattr(auth, "_check", lambda *a: threads.append(threading.current_thread().name) or check(*a))
+    assert auth.verify_password("Admin@2025", auth.legacy_hash("Admin@2025", auth._auth_salt()))
+    assert threads and threads[0].startswith("auth-kdf") and threads[0] != threading.current_thread().name
+
+
+def test_verificacao_com_timeout(monkeypatch):
+    monkeypatch.setattr(auth, "VERIFY_TIMEOUT_S", 0.05)
+    monkeypatch.setattr(auth, "_check", lambda *a: time.sleep(0.5) or True)
+    assert auth.verify_password("Admin@2025", "qualquer") is False
+
+
+def test_latencia_de_login_concorrente():
+    stats = auth.measure_login_latency(concurrency=4, attempts=8)
+    assert stats["ok"] and stats["attempts"] == 8
+    assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+
+
+# ── Diretório de usuários ───────────────────────────────────
+@pytest.fixture
+def directory(monkeypatch):
+    import streamlit as st
+    st.cache_resource.clear()
+    fake = SimpleNamespace(secrets={})
+    monkeypatch.setattr(auth, "st", fake)
+    hashed = []
+    real = auth.hash_password
+    monkeypatch.setattr(auth, "hash_password", lambda pwd: hashed.append(pwd) or real(pwd))
+    yield fake, hashed
+    st.cache_resource.clear()
+
+
+def test_diretorio_demo_hasheado_uma_vez(directory):
+    fake, hashed = directory
+    users = auth.get_users()
+    assert set(users) == set(auth.DEMO_USERS)
+    assert len(hashed) == len(auth.DEMO_USERS)
+    assert auth.get_users() is users and len(hashed) == len(auth.DEMO_USERS)
+    assert auth.verify_password("Demo@2025", users["demo"]["password_hash"])
+
+
+def test_diretorio_refeito_quando_secrets_mudam(directory):
+    fake, hashed = directory
+    fake.secrets["users"] = {" Ana ": {"name": "Ana", "password_hash": "h1", "role": "editor"}}
+    users = auth.get_users()
+    assert users == {"ana": {"name": "Ana", "password_hash": "h1", "role": "editor"}}
+    assert auth.get_users() is users
+    assert hashed == []                                  # usuários do secrets não são re-hasheados
+    fake.secrets["users"] = {"ana": {"name": "Ana", "password_hash": "h2", "role": "editor"}}
+    users = auth.get_users()
+    assert users["ana"]["password_hash"] == "h2"
+    fake.secrets["AUTH_SALT"] = "outro"                   # salt novo também invalida
+    assert auth.get_users() is not users
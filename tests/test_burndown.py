@@ -0,0 +1,88 @@
+"""
+test_burndown.py — Burnup/burndown e vazão semanal a partir do histórico de status
+"""
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from core import burndown
+from core.task_store import TaskStore
+
+TASKS = [
+    ("F1", "T1", "a", "Ana",   "2025-02-03", "2025-02-04", "pendente", ""),
+    ("F1", "T2", "b", "Bruno", "2025-02-03", "2025-02-06", "pendente", ""),
+    ("F2", "T3", "c", "Ana",   "2025-02-05", "2025-02-12", "pendente", ""),
+    ("F2", "T4", "d", "Bruno", "2025-02-10", "2025-02-20", "pendente", ""),
+]
+TODAY = date(2025, 2, 14)
+
+
+def _at(y, m, d, h=12):
+    """Epoch de um horário local (o diário grava ``time.time()``)."""
+    return time.mktime((y, m, d, h, 0, 0, 0, 0, -1))
+
+
+HISTORY = [
+    (_at(2025, 2, 1), "T1", "pendente"), (_at(2025, 2, 1), "T2", "pendente"),
+    (_at(2025, 2, 1), "T3", "pendente"), (_at(2025, 2, 1), "T4", "pendente"),
+    (_at(2025, 2, 4), "T1", "em andamento"),
+    (_at(2025, 2, 4, 18), "T1", "concluido"),
+    (_at(2025, 2, 6), "T2", "concluido"),
+    (_at(2025, 2, 6, 15), "T2", "concluido"),          # regravação: não conta duas vezes
+    (_at(2025, 2, 11), "T2", "em andamento"),          # reaberta
+    (_at(2025, 2, 12), "T3", "concluido"),
+    (_at(2025, 2, 13), "T2", "concluido"),
+    (_at(2025, 2, 13), "T9", "concluido"),             # tarefa fora do plano
+]
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return burndown.build(TaskStore(TASKS), HISTORY, today=TODAY)
+
+
+def _day(s, d):
+    return s.loc[pd.Timestamp(d)]
+
+
+def test_planejado_acumula_pelo_termino(frames):
+    planned = frames["planned"][burndown.TOTAL]
+    assert planned.index[0] == pd.Timestamp(2025, 2, 3) and planned.index[-1] == pd.Timestamp(2025, 2, 20)
+    assert [_day(planned, date(2025, 2, d)) for d in (3, 4, 6, 12, 19, 20)] == [0, 1, 2, 3, 3, 4]
+    assert int(frames["scope"][burndown.TOTAL]) == 4
+    assert int(frames["scope"][("fase", "F2")]) == 2 and int(frames["scope"][("resp", "Ana")]) == 2
+
+
+def test_realizado_com_reabertura(frames):
+    actual = frames["actual"][burndown.TOTAL]
+    days = (3, 4, 6, 10, 11, 12, 13, 14)
+    assert [_day(actual, date(2025, 2, d)) for d in days] == [0, 1, 2, 2, 1, 2, 3, 3]
+    assert actual.loc[pd.Timestamp(TODAY) + pd.Timedelta(days=1):].isna().all()   # nada no futuro
+    bruno = frames["actual"][("resp", "Bruno")]
+    assert [_day(bruno, date(2025, 2, d)) for d in (6, 11, 13)] == [1, 0, 1]
+    assert _day(frames["actual"][("fase", "F2")], TODAY) == 1
+
+
+def test_vazao_semanal(frames):
+    weekly = frames["weekly"][burndown.TOTAL]
+    # Semanas começando na segunda; reabrir não desconta, reconcluir conta de novo
+    assert weekly.to_dict() == {pd.Timestamp(2025, 2, 3): 2, pd.Timestamp(2025, 2, 10): 2}
+    assert burndown.velocity(weekly, weeks=2) == pytest.approx(2.0)
+    assert burndown.velocity(weekly.iloc[:0]) == 0.0
+
+
+def test_view(frames):
+    burnup, restante, weekly = burndown.view(frames, ("resp", "Ana"))
+    assert list(burnup.columns) == ["Planejado", "Realizado"]
+    assert _day(restante["Planejado"], date(2025, 2, 12)) == 0
+    assert _day(restante["Realizado"], date(2025, 2, 12)) == 0
+    assert _day(restante["Realizado"], date(2025, 2, 10)) == 1
+    assert weekly.name == "Concluídas"
+
+
+def test_sem_historico():
+    frames = burndown.build(TaskStore(TASKS), [], today=TODAY)
+    assert (frames["actual"][burndown.TOTAL].dropna() == 0).all()
+    assert int(frames["planned"][burndown.TOTAL].iloc[-1]) == 4
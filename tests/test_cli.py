@@ -0,0 +1,81 @@
+"""
+test_cli.py — ``python -m core``: relatórios a partir do PlanDB sem alterar o banco
+"""
+import hashlib
+import json
+import sqlite3
+
+import pytest
+
+from core.__main__ import main
+from core.persistence import SCHEMA, PlanDB
+from core.plan_data import DEFAULT_PLAN_ID, DEPS, TASKS_RAW
+from core.task_store import TaskStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "plan_state.db"
+    db = PlanDB(str(path), readers=1)
+    db.seed(DEFAULT_PLAN_ID, TaskStore(TASKS_RAW, DEPS))
+    db.write_task(DEFAULT_PLAN_ID, TASKS_RAW[0][1], "bloqueado", "aguarda licença", "ana")
+    db.close()
+    return path
+
+
+def _digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest(), path.stat().st_mtime_ns
+
+
+def test_relatorio_nao_altera_o_banco(db_path, capsys):
+    # -wal/-shm vazios podem aparecer (leitura em WAL); o banco em si não muda
+    before = _digest(db_path)
+    assert main(["all", "--db", str(db_path)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    tid = TASKS_RAW[0][1]
+    assert any(b["id"] == tid and b["aviso"] == "aguarda licença" for b in out["blockers"])
+    assert _digest(db_path) == before
+    wal = db_path.with_name(db_path.name + "-wal")
+    assert not wal.exists() or wal.stat().st_size == 0
+
+
+def test_relatorio_com_o_app_gravando(db_path, capsys):
+    # O app segura a trava de escrita: o relatório lê mesmo assim
+    writer = sqlite3.connect(db_path, isolation_level=None)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert main(["kpis", "--db", str(db_path)]) == 0
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    assert json.loads(capsys.readouterr().out)["kpis"]["bloqueadas"] >= 1
+
+
+def test_banco_sem_tabelas(tmp_path, capsys):
+    empty = tmp_path / "vazio.db"
+    sqlite3.connect(empty).execute("CREATE TABLE outra (x)").connection.close()
+    before = _digest(empty)
+    assert main(["kpis", "--db", str(empty)]) == 0
+    assert json.loads(capsys.readouterr().out)["kpis"]["total"] == len(TASKS_RAW)
+    assert _digest(empty) == before                # nem schema nem pragmas gravados
+
+
+def test_banco_fora_do_modo_wal(tmp_path, capsys):
+    path = tmp_path / "rollback.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO task_state (plan_id, tid, status, aviso) VALUES (?, ?, 'concluido', '')",
+                 (DEFAULT_PLAN_ID, TASKS_RAW[0][1]))
+    conn.commit()
+    conn.close()
+    before = _digest(path)
+    assert main(["kpis", "--db", str(path)]) == 0
+    assert json.loads(capsys.readouterr().out)["kpis"]["concluidas"] >= 1
+    assert _digest(path) == before
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_strict_com_bloqueios(db_path, capsys):
+    assert main(["blockers", "--db", str(db_path), "--strict", "--format", "text"]) == 1
+    assert "aguarda licença" in capsys.readouterr().out
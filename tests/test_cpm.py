@@ -0,0 +1,56 @@
+"""
+test_cpm.py — CPMSchedule: atualização incremental contra o recálculo completo
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core.cpm import CPMSchedule
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+
+def _plan(n, seed):
+    tasks, deps = make_plan(n, seed=seed)
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return [list(t) for t in tasks], deps, state
+
+
+def _absolute(cpm):
+    """ES/EF/LS/LF e término em ordinais: independem da origem do plano."""
+    o = cpm.origin
+    return (
+        [(o + a, o + b, o + c, o + d) for a, b, c, d in zip(cpm.es, cpm.ef, cpm.ls, cpm.lf)],
+        o + cpm.finish,
+        cpm.critical_path(),
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_update_igual_ao_recalculo(seed):
+    rnd = random.Random(seed)
+    tasks, deps, state = _plan(300, seed)
+    cpm = CPMSchedule(TaskStore(tasks, deps), state)
+    for _ in range(10):
+        changes = {}
+        for t in rnd.sample(tasks, 5):
+            ch = {}
+            if rnd.random() < 0.7:
+                ini = date.fromisoformat(t[4]) + timedelta(days=rnd.randint(-5, 10))
+                ch["ini"], ch["fim"] = ini.isoformat(), (ini + timedelta(days=rnd.randrange(6))).isoformat()
+                t[4], t[5] = ch["ini"], ch["fim"]
+            if rnd.random() < 0.5:
+                ch["status"] = state[t[1]]["status"] = rnd.choice(("pendente", "concluido"))
+            changes[t[1]] = ch
+        cpm.update(changes)
+        assert _absolute(cpm) == _absolute(CPMSchedule(TaskStore(tasks, deps), state))
+
+
+def test_update_sem_mudanca_nao_refaz_o_plano():
+    tasks, deps, state = _plan(2000, 0)
+    cpm = CPMSchedule(TaskStore(tasks, deps), state)
+    before = _absolute(cpm)
+    touched = cpm.update({tasks[1000][1]: {"ini": tasks[1000][4]}})
+    assert touched < len(tasks) // 10
+    assert _absolute(cpm) == before
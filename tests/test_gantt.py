@@ -0,0 +1,101 @@
+"""
+test_gantt.py — Gantt em SVG: intervalo, geometria por zoom, fases recolhidas e escape
+"""
+import xml.etree.ElementTree as ET
+from datetime import date
+
+import pytest
+
+import gantt
+from core.cpm import CPMSchedule
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+NS = "{http://www.w3.org/2000/svg}"
+
+
+def _plan(n=120, seed=0):
+    tasks, deps = make_plan(n, n_fases=4, seed=seed)
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return tasks, TaskStore(tasks, deps), state
+
+
+def test_date_range():
+    tasks, store, _ = _plan()
+    first = min(date.fromisoformat(t[4]) for t in tasks).toordinal()
+    last = max(date.fromisoformat(t[5]) for t in tasks).toordinal()
+    assert gantt.date_range(store) == (first, last + 1)
+    today = date.today().toordinal()
+    assert gantt.date_range(TaskStore()) == (today, today + 1)
+
+
+@pytest.mark.parametrize("zoom", list(gantt.ZOOM_PX))
+def test_geometria_por_zoom(zoom):
+    tasks, store, _ = _plan()
+    ppd = gantt.ZOOM_PX[zoom]
+    origin, _ = gantt.date_range(store)
+    xs, ws = gantt.bar_geometry(store, zoom)
+    for t, x, w in zip(tasks, xs, ws):
+        a, b = date.fromisoformat(t[4]).toordinal(), date.fromisoformat(t[5]).toordinal()
+        assert x == pytest.approx((a - origin) * ppd)
+        assert w == pytest.approx((b - a + 1) * ppd)
+
+
+def test_marcacoes_semana_e_mes():
+    origin = date(2025, 2, 5).toordinal()              # quarta-feira
+    end = date(2025, 4, 10).toordinal()
+    weeks = gantt._ticks(origin, end, "semana")
+    assert weeks[0] == (5, "10/02")                    # primeira segunda-feira
+    assert all(b[0] - a[0] == 7 for a, b in zip(weeks, weeks[1:]))
+    assert gantt._ticks(origin, end, "mês") == [(0, "fev/25"), (24, "mar/25"), (55, "abr/25")]
+    assert len(gantt._ticks(origin, origin + 3, "dia")) == 3
+
+
+def _svg(store, state, **kw):
+    root = ET.fromstring(gantt.render_svg(store, state, **kw))   # XML bem formado
+    assert root.tag == f"{NS}svg"
+    return root
+
+
+def test_um_svg_com_uma_barra_por_tarefa():
+    tasks, store, state = _plan()
+    root = _svg(store, state)
+    bars = root.findall(f"{NS}g/{NS}rect")
+    assert len(bars) == len(tasks)
+    fill = {v: k for k, v in gantt.BAR_COLORS.items()}
+    assert [fill[r.get("fill")] for r in bars] == [state[t[1]]["status"] for t in tasks]
+
+
+def test_fase_recolhida_vira_barra_agregada():
+    tasks, store, state = _plan()
+    fase = store.fases[1]
+    rows = store.rows_fase(fase)
+    root = _svg(store, state, collapsed=[fase])
+    groups = root.findall(f"{NS}g")
+    assert len(groups) == len(tasks) - len(rows) + 1
+    done = sum(state[store.tid[i]]["status"] == "concluido" for i in rows)
+    titles = [g.find(f"{NS}title").text for g in groups]
+    assert f"{fase} · {len(rows)} tarefa(s) · {done} concluída(s)" in titles
+    assert not any(t.startswith(store.tid[rows[0]] + " ") for t in titles)
+
+
+def test_caminho_critico_destacado():
+    tasks, store, state = _plan()
+    cpm = CPMSchedule(store, state)
+    root = _svg(store, state, cpm=cpm)
+    marked = [r for r in root.iter(f"{NS}rect") if r.get("stroke") == "#ff5252"]
+    assert len(marked) == sum(cpm.is_critical(i) for i in range(len(store))) > 0
+
+
+def test_texto_escapado():
+    evil = '<script>alert("x")</script>&'
+    store = TaskStore([
+        (evil, "T<1>", evil, "R", "2025-02-03", "2025-02-20", "pendente", ""),
+        ("Fase 2", "T2", "ok", "R", "2025-02-03", "2025-02-03", "concluido", ""),
+    ])
+    state = {"T<1>": {"status": "pendente"}, "T2": {"status": "concluido"}}
+    for collapsed in ([], [evil]):
+        svg = gantt.render_svg(store, state, collapsed=collapsed)
+        assert "<script>" not in svg and "T<1>" not in svg
+        texts = [e.text for e in ET.fromstring(svg).iter() if e.text]
+        assert evil in texts
@@ -0,0 +1,70 @@
+"""
+test_leveling.py — Nivelamento: capacidade por responsável e dependências respeitadas
+"""
+import pytest
+
+from core.leveling import FIXED, level
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+
+def _plan(n, seed, in_progress=True):
+    tasks, deps = make_plan(n, seed=seed)
+    if not in_progress:
+        tasks = [t[:6] + ("pendente" if t[6] == "em andamento" else t[6],) + t[7:] for t in tasks]
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return TaskStore(tasks, deps), state
+
+
+def _concurrency(lev, rows):
+    """Maior número de linhas de ``rows`` ocupando o mesmo dia no plano nivelado."""
+    days = {}
+    for i in rows:
+        for d in range(lev.start[i], lev.finish[i]):
+            days[d] = days.get(d, 0) + 1
+    return max(days.values(), default=0)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("capacity", [{}, {"Infra": 2, "DBA": 3, "TI": 2}])
+def test_capacidade_e_dependencias(seed, capacity):
+    store, state = _plan(400, seed, in_progress=False)
+    lev = level(store, state, capacity)
+    assert lev.moved()                               # a capacidade de fato adiou tarefas
+    ini, fim = store.day_span()
+    busy = {}
+    for i in lev.busy:
+        busy.setdefault(store.resp[i], []).append(i)
+    for r, rows in busy.items():
+        assert _concurrency(lev, rows) <= lev.capacity[r]
+        assert lev.peaks()[r][1] <= lev.capacity[r]
+    for i, tid in enumerate(store.tid):
+        assert lev.finish[i] - lev.start[i] == fim[i] - ini[i] + 1
+        if state[tid]["status"] in FIXED:
+            continue
+        assert lev.start[i] >= ini[i]
+        for d in store.graph.preds[tid]:
+            assert lev.start[i] >= lev.finish[store.index[d]]
+
+
+def test_fixas_ficam_onde_estao():
+    store, state = _plan(400, 0)
+    lev = level(store, state)
+    ini, fim = store.day_span()
+    fixed = [i for i, t in enumerate(store.tid) if state[t]["status"] in FIXED]
+    assert fixed
+    for i in fixed:
+        assert (lev.start[i], lev.finish[i] - 1) == (ini[i], fim[i])
+    assert not set(lev.changes()) & {store.tid[i] for i in fixed}
+
+
+def test_capacidade_ilimitada_nao_adia():
+    # Plano gerado já respeita as dependências: com vagas de sobra nada se move
+    store, state = _plan(200, 1, in_progress=False)
+    assert level(store, state, default=len(store)).moved() == []
+
+
+def test_capacidade_invalida():
+    store, state = _plan(20, 0)
+    with pytest.raises(ValueError, match="capacidade inválida"):
+        level(store, state, {store.resps[0]: 0})
@@ -0,0 +1,116 @@
+"""
+test_metrics.py — Seções do rerun, HTML emitido e exposição no formato Prometheus
+"""
+import re
+import threading
+import urllib.request
+
+import pytest
+
+import metrics
+
+
+def _rerun(kind="full"):
+    rerun = metrics.Rerun(kind)
+    with rerun.section("css"):
+        metrics.emitted("<style>é</style>")             # bytes UTF-8, não caracteres
+    mark = rerun.begin("page")
+    metrics.emitted("<div>")
+    rerun.end(mark)
+    return rerun
+
+
+def test_secoes_e_bytes_emitidos():
+    rerun = _rerun()
+    assert [(name, size) for name, _, size in rerun.sections] == [("css", 17), ("page", 5)]
+    assert all(seconds >= 0 for _, seconds, _ in rerun.sections)
+    assert rerun.html == 22
+
+
+def test_rerun_corrente_e_por_thread():
+    rerun = metrics.Rerun()
+    other = []
+
+    def run():
+        other.append(metrics.Rerun("fragment"))
+        metrics.emitted("x" * 10)
+
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+    metrics.emitted("abc")
+    assert (rerun.html, other[0].html) == (3, 10)
+
+
+def test_finish_publica_uma_vez():
+    m = metrics.Metrics()
+    rerun = _rerun()
+    rerun.finish(m, "Tarefas", "admin")
+    rerun.finish(m, "Tarefas", "admin")                 # ex.: finally depois de um st.rerun()
+    text = m.render()
+    assert 'sesuite_reruns_total{page="Tarefas",role="admin",kind="full"} 1' in text
+    assert 'sesuite_section_html_bytes_sum{section="css",page="Tarefas",role="admin"} 17.000000' in text
+
+
+def test_formato_prometheus():
+    m = metrics.Metrics()
+    for kind in ("full", "fragment", "fragment"):
+        _rerun(kind).finish(m, 'Pá"gina\\x', "viewer")
+    lines = m.render().splitlines()
+    for name in metrics.HELP:
+        assert lines.count(f"# TYPE sesuite_{name} {metrics.HELP[name][0]}") == 1
+    assert 'sesuite_reruns_total{page="Pá\\"gina\\\\x",role="viewer",kind="fragment"} 2' in lines
+    # Buckets acumulados, terminando em +Inf == _count
+    buckets = [int(l.rsplit(" ", 1)[1]) for l in lines
+               if l.startswith('sesuite_section_seconds_bucket{section="page"')]
+    assert len(buckets) == len(metrics.SECONDS_BUCKETS) + 1
+    assert buckets == sorted(buckets) and buckets[-1] == 3
+    assert 'sesuite_section_seconds_count{section="page",page="Pá\\"gina\\\\x",role="viewer"} 3' in lines
+
+
+def test_histograma():
+    h = metrics.Histogram((1, 10))
+    for v in (0.5, 1, 5, 50):
+        h.observe(v)
+    assert h.counts == [2, 1, 1] and h.count == 4 and h.sum == pytest.approx(56.5)
+
+
+def test_write_respeita_o_intervalo(tmp_path):
+    m = metrics.Metrics()
+    path = tmp_path / "app.prom"
+    _rerun().finish(m, "Dashboard", "admin")
+    assert m.write(str(path), interval=60)
+    _rerun().finish(m, "Dashboard", "admin")
+    assert not m.write(str(path), interval=60)          # ainda dentro do intervalo
+    assert "kind=\"full\"} 1" in path.read_text(encoding="utf-8")
+    assert m.write(str(path), interval=0)
+    assert "kind=\"full\"} 2" in path.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_path.iterdir()] == ["app.prom"]
+
+
+def test_endpoint_http():
+    m = metrics.Metrics()
+    _rerun().finish(m, "Dashboard", "admin")
+    server = m.serve(0)
+    try:
+        assert m.serve(0) is server
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert resp.read().decode() == m.render()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_app_publica_as_secoes(app_test, tmp_path):
+    path = tmp_path / "app.prom"
+    app_test.secrets["METRICS_FILE"] = str(path)
+    app_test.run()
+    assert not app_test.exception
+    text = path.read_text(encoding="utf-8")
+    assert 'sesuite_reruns_total{page="Dashboard",role="admin",kind="full"} 1' in text
+    sections = set(re.findall(r'section_seconds_count\{section="(\w+)",page="Dashboard"', text))
+    assert {"css", "sync", "sidebar", "kpis", "hero", "page"} <= sections
+    page_bytes = re.search(r'section_html_bytes_sum\{section="page",page="Dashboard",role="admin"\} (\S+)', text)
+    assert float(page_bytes.group(1)) > 0
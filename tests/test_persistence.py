@@ -0,0 +1,137 @@
+"""
+test_persistence.py — PlanDB: compare-and-swap por tarefa entre sessões e diário
+"""
+import time
+
+import pytest
+
+from core.persistence import PlanDB
+
+PLAN = "plano"
+TASKS = [
+    ("Fase 1", "T1", "Instalar servidor", "Infra", "2025-02-03", "2025-02-04", "pendente", ""),
+    ("Fase 1", "T2", "Configurar banco", "DBA", "2025-02-05", "2025-02-06", "pendente", ""),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = PlanDB(str(tmp_path / "plan_state.db"), readers=1)
+    db.seed(PLAN, TASKS)
+    yield db
+    db.close()
+
+
+def test_cas_grava_na_revisao_esperada(db):
+    rev = db.load(PLAN)[1]["T1"]["rev"]
+    ok, version = db.compare_and_set(PLAN, "T1", rev, "em andamento", None, "ana")
+    assert ok
+    row = db.load(PLAN)[1]["T1"]
+    assert (row["status"], row["rev"]) == ("em andamento", version)
+    assert db.version(PLAN) == version
+
+
+def test_cas_recusa_revisao_desatualizada(db):
+    # Duas sessões leem a mesma revisão; a segunda a gravar perde
+    rev = db.load(PLAN)[1]["T1"]["rev"]
+    ok, version = db.compare_and_set(PLAN, "T1", rev, "concluido", "feito", "ana")
+    assert ok
+    ok, current = db.compare_and_set(PLAN, "T1", rev, "bloqueado", "", "bruno")
+    assert not ok
+    assert current == {"status": "concluido", "aviso": "feito", "rev": version}
+    # A tentativa recusada não grava nada nem avança a versão
+    assert db.version(PLAN) == version
+    assert db.load(PLAN)[1]["T1"]["status"] == "concluido"
+    assert [e[1:] for e in db.history(PLAN)[-1:]] == [("T1", "concluido")]
+
+
+def test_cas_ignora_escritas_em_outras_tarefas(db):
+    rev = db.load(PLAN)[1]["T1"]["rev"]
+    db.write_task(PLAN, "T2", "concluido", None, "bruno")
+    ok, _ = db.compare_and_set(PLAN, "T1", rev, "em andamento", None, "ana")
+    assert ok
+
+
+def test_cas_conflito_entre_instancias(db):
+    # Outro processo (outra instância sobre o mesmo arquivo) grava primeiro
+    other = PlanDB(db.path, readers=1)
+    try:
+        rev = db.load(PLAN)[1]["T2"]["rev"]
+        assert other.compare_and_set(PLAN, "T2", rev, "em andamento", None, "bruno")[0]
+        ok, current = db.compare_and_set(PLAN, "T2", rev, "concluido", None, "ana")
+        assert not ok and current["status"] == "em andamento"
+        assert db.load(PLAN)[1]["T2"]["status"] == "em andamento"
+    finally:
+        other.close()
+
+
+def test_cas_tarefa_inexistente(db):
+    with pytest.raises(KeyError):
+        db.compare_and_set(PLAN, "T9", 0, "concluido", None)
+
+
+# ── Diário / compactação ────────────────────────────────────
+DAY = 86400
+
+
+def _status(state):
+    return {tid: (row["status"], row["aviso"]) for tid, row in state.items()}
+
+
+def test_state_at_igual_depois_da_compactacao(tmp_path, monkeypatch):
+    clock = [time.mktime((2025, 1, 6, 12, 0, 0, 0, 0, -1))]   # meio-dia: longe da virada do dia
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    base = clock[0]
+    db = PlanDB(str(tmp_path / "plan_state.db"), readers=1)
+    try:
+        db.seed(PLAN, TASKS)
+        clock[0] = base + 60
+        db.write_task(PLAN, "T1", "em andamento", None, "ana")
+        clock[0] = base + 50 * DAY
+        db.write_task(PLAN, "T1", "concluido", None, "ana")
+        db.write_task(PLAN, "T2", "em andamento", None, "bruno")
+        clock[0] = base + 50 * DAY + 60
+        db.write_task(PLAN, "T2", "bloqueado", "aguarda licença", "bruno")
+        clock[0] = base + 190 * DAY
+        db.write_task(PLAN, "T2", "concluido", "", "bruno")
+
+        # Fim de cada dia com eventos (e antes da carga): granularidade que sobrevive à compactação
+        instants = [base - 3600, base + 3600, base + 50 * DAY + 3600, base + 190 * DAY + 3600]
+        before = [_status(db.state_at(PLAN, ts)) for ts in instants]
+        assert before[0] == {}
+        assert before[2] == {"T1": ("concluido", ""), "T2": ("bloqueado", "aguarda licença")}
+
+        clock[0] = base + 200 * DAY
+        assert db.compact(PLAN, older_than_days=90) == 6   # 2 da carga + 4 até o dia 50
+        assert [_status(db.state_at(PLAN, ts)) for ts in instants] == before
+        # Os eventos recentes continuam replicados por cima do último snapshot
+        assert _status(db.state_at(PLAN, clock[0])) == _status(db.load(PLAN)[1])
+        assert db.compact(PLAN, older_than_days=90) == 0
+    finally:
+        db.close()
+
+
+def test_history_depois_da_compactacao(tmp_path, monkeypatch):
+    clock = [time.mktime((2025, 1, 6, 12, 0, 0, 0, 0, -1))]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    base = clock[0]
+    db = PlanDB(str(tmp_path / "plan_state.db"), readers=1)
+    try:
+        db.seed(PLAN, TASKS)
+        db.write_task(PLAN, "T1", "em andamento", None)
+        clock[0] = base + DAY
+        db.write_task(PLAN, "T1", "concluido", None)
+        db.write_task(PLAN, "T2", "em andamento", None)
+        db.write_task(PLAN, "T2", "bloqueado", None)
+        clock[0] = base + 120 * DAY
+        db.write_task(PLAN, "T2", "concluido", None)
+        clock[0] = base + 121 * DAY
+        db.compact(PLAN, older_than_days=90)
+        # Trechos compactados ficam com resolução diária: a passagem intermediária de T2 some
+        assert [(tid, s) for _, tid, s in db.history(PLAN)] == [
+            ("T1", "em andamento"), ("T2", "pendente"),
+            ("T1", "concluido"), ("T2", "bloqueado"),
+            ("T2", "concluido"),
+        ]
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+"""
+test_plan_export.py — Conteúdo exportado em cada formato (CSV, JSON, Parquet)
+"""
+import csv
+import io
+import json
+
+import pytest
+
+from core import plan_export
+from core.cpm import CPMSchedule
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+
+@pytest.fixture(scope="module")
+def plan():
+    tasks, deps = make_plan(5000, seed=3)        # mais de um bloco de CHUNK_ROWS
+    tasks[0] = tasks[0][:2] + ('Nome com "aspas", vírgula; e acento',) + tasks[0][3:7] + ("aviso\nem duas linhas",)
+    store = TaskStore(tasks, deps)
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return store, state, CPMSchedule(store, state)
+
+
+def _expected(store, state, cpm):
+    return [dict(zip(plan_export.FIELDS, r)) for r in plan_export.iter_rows(store, state, cpm)]
+
+
+def test_linhas(plan):
+    store, state, cpm = plan
+    rows = _expected(store, state, cpm)
+    assert len(rows) == len(store)
+    for i, r in enumerate(rows):
+        tid = store.tid[i]
+        assert r["deps"].split(";") == list(store.graph.preds[tid]) if r["deps"] else not store.graph.preds[tid]
+        pend = [d for d in store.graph.preds[tid] if state[d]["status"] != "concluido"]
+        assert r["deps_pendentes"] == ";".join(pend)
+        assert (r["folga_dias"], r["critica"]) == (cpm.slack(i), cpm.is_critical(i))
+
+
+def test_csv(plan):
+    data = plan_export.export_bytes("csv", *plan)
+    assert data.startswith("﻿".encode())
+    rows = list(csv.DictReader(io.StringIO(data.decode("utf-8-sig"))))
+    expected = _expected(*plan)
+    assert len(rows) == len(expected)
+    for got, exp in zip(rows, expected):
+        assert got == {k: "" if v is None else str(v) for k, v in exp.items()}
+
+
+def test_json(plan):
+    assert json.loads(plan_export.export_bytes("json", *plan)) == _expected(*plan)
+    empty = TaskStore()
+    assert json.loads(plan_export.export_bytes("json", empty, {})) == []
+
+
+def test_parquet(plan):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(io.BytesIO(plan_export.export_bytes("parquet", *plan)))
+    assert table.column_names == list(plan_export.FIELDS)
+    assert table.to_pylist() == _expected(*plan)
+
+
+def test_write_file_igual_ao_download(plan, tmp_path):
+    for fmt in ("csv", "json"):
+        path = tmp_path / f"plano.{fmt}"
+        plan_export.write_file(path, fmt, *plan)
+        assert path.read_bytes() == plan_export.export_bytes(fmt, *plan)
+
+
+def test_formatos():
+    assert plan_export.formats()[:2] == ["csv", "json"]
@@ -0,0 +1,44 @@
+"""
+test_plan_graph.py — Contagens transitivas em uma passada contra a busca por tarefa
+"""
+import pytest
+
+from core import report
+from core.plan_graph import DepGraph, PlanGraphError
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+
+def _store(n, seed):
+    tasks, deps = make_plan(n, seed=seed)
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return TaskStore(tasks, deps), state
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_contagens_iguais_a_busca(seed):
+    store, state = _store(600, seed)
+    g = store.graph
+    pending = {t for t in store.tid if state[t]["status"] != "concluido"}
+    down, up = g.downstream_counts(), g.upstream_counts(pending)
+    for t in store.tid:
+        assert down[t] == len(g.downstream(t))
+        assert up[t] == sum(d in pending for d in g.upstream(t))
+
+
+def test_blockers_do_relatorio():
+    store, state = _store(600, 0)
+    rows = report.blockers(store, state)
+    assert rows
+    for b in rows:
+        chain = store.graph.blockers(b["id"], state)
+        assert sorted(b["pendentes"]) == sorted(d for d, depth in chain if depth == 1)
+        assert len(b["pendentes"]) + b["indiretas"] == len(chain)
+        assert b["trava"] == len(store.graph.downstream(b["id"]))
+
+
+def test_ciclo_e_id_inexistente():
+    with pytest.raises(PlanGraphError, match="Ciclo"):
+        DepGraph(["A", "B", "C"], {"A": ["C"], "B": ["A"], "C": ["B"]})
+    with pytest.raises(PlanGraphError, match="B → X"):
+        DepGraph(["A", "B"], {"B": ["X"]})
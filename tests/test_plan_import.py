@@ -0,0 +1,94 @@
+"""
+test_plan_import.py — build_store / load_plan: plano válido e caminhos de erro
+"""
+import io
+import json
+
+import pytest
+
+from core.plan_import import PlanImportError, build_store, load_plan
+
+
+def _rec(tid, deps=(), **kw):
+    rec = {"fase": "Fase 1", "tid": tid, "nome": f"Tarefa {tid}", "resp": "Infra",
+           "ini": "2025-02-03", "fim": "2025-02-04", "deps": list(deps)}
+    rec.update(kw)
+    return rec
+
+
+def _records(*recs):
+    return [(f"linha {n}", r) for n, r in enumerate(recs, start=2)]
+
+
+def test_plano_valido():
+    store = build_store(_records(_rec("T1"), _rec("T2", ["T1"]), _rec("T3", ["T1", "T2"], status="Concluido")))
+    assert store.ids == ["T1", "T2", "T3"]
+    assert store.deps == {"T2": ["T1"], "T3": ["T1", "T2"]}
+    assert store.graph.order == ["T1", "T2", "T3"]
+    assert store.status == ["pendente", "pendente", "concluido"]
+
+
+def test_id_duplicado():
+    with pytest.raises(PlanImportError) as exc:
+        build_store(_records(_rec("T1"), _rec("T2"), _rec("T1")))
+    assert exc.value.errors == ["linha 4: ID duplicado: T1 (primeira ocorrência em linha 2)"]
+
+
+def test_dependencia_inexistente():
+    with pytest.raises(PlanImportError) as exc:
+        build_store(_records(_rec("T1", ["T0"]), _rec("T2", ["T1", "T9", "T8"])))
+    assert exc.value.errors == [
+        "linha 2: T1 depende de ID inexistente: T0",
+        "linha 3: T2 depende de ID inexistente: T9, T8",
+    ]
+
+
+def test_ciclo():
+    with pytest.raises(PlanImportError) as exc:
+        build_store(_records(_rec("T1", ["T3"]), _rec("T2", ["T1"]), _rec("T3", ["T2"]), _rec("T4")))
+    [msg] = exc.value.errors
+    assert msg.startswith("Ciclo de dependências")
+    assert all(t in msg for t in ("T1", "T2", "T3")) and "T4" not in msg
+
+
+def test_depende_de_si_mesma():
+    with pytest.raises(PlanImportError) as exc:
+        build_store(_records(_rec("T1", ["T1"])))
+    assert exc.value.errors == ["linha 2: T1 depende de si mesma"]
+
+
+def test_erros_acumulados_ate_o_limite():
+    recs = _records(*[_rec(f"T{i}", fim="2025-01-01") for i in range(10)])
+    with pytest.raises(PlanImportError) as exc:
+        build_store(recs, max_errors=3)
+    assert len(exc.value.errors) == 3
+    assert "(+" not in str(exc.value)
+
+
+def test_arquivo_vazio():
+    with pytest.raises(PlanImportError, match="não tem tarefas"):
+        build_store([])
+
+
+def test_load_plan_json_com_erros_por_registro():
+    data = [
+        {"fase": "F", "id": "T1", "nome": "a", "resp": "DBA", "ini": "03/02/2025", "fim": "04/02/2025"},
+        {"fase": "F", "id": "T2", "nome": "b", "resp": "DBA", "ini": "2025-02-05", "fim": "2025-02-04"},
+        {"fase": "F", "id": "T3", "nome": "c", "resp": "DBA", "ini": "2025-02-05", "fim": "2025-02-06",
+         "status": "parado"},
+    ]
+    with pytest.raises(PlanImportError) as exc:
+        load_plan(io.BytesIO(json.dumps(data).encode()), "plano.json")
+    assert exc.value.errors == [
+        "registro 2: término 2025-02-04 antes do início 2025-02-05",
+        "registro 3: status desconhecido: 'parado'",
+    ]
+
+
+def test_load_plan_csv():
+    pytest.importorskip("pandas")
+    csv = "fase;id;nome;resp;ini;fim;deps\nF;T1;a;DBA;2025-02-03;2025-02-04;\nF;T2;b;DBA;2025-02-05;2025-02-06;T1\n"
+    store = load_plan(io.BytesIO(csv.encode()), "plano.csv")
+    assert store.deps == {"T2": ["T1"]}
+    with pytest.raises(PlanImportError, match="T2 depende de ID inexistente: T0"):
+        load_plan(io.BytesIO(csv.replace(";T1\n", ";T0\n").encode()), "plano.csv")
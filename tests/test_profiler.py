@@ -0,0 +1,107 @@
+"""
+test_profiler.py — Profile (cProfile + amostragem), flame graph e página do Profiler
+"""
+import pstats
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import pytest
+
+from profiler import Profile, flame_html
+
+NS = "{http://www.w3.org/2000/svg}"
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def _profile(runs=2, seconds=0.05):
+    prof = Profile(interval=0.001, root_file=__file__)
+    for _ in range(runs):
+        prof.start()
+        busy(seconds)
+        prof.stop()
+    return prof
+
+
+def test_execucoes_amostras_e_hotspots():
+    prof = _profile()
+    assert prof.runs == 2 and prof.wall >= 0.1
+    assert prof.samples == sum(prof.folded.values()) > 0
+    # Pilhas a partir deste arquivo (root_file), terminando em busy
+    assert all(s.startswith("test_execucoes_amostras_e_hotspots (test_profiler.py:") for s in prof.folded)
+    assert any(";busy (test_profiler.py:" in s for s in prof.folded)
+    top = prof.hotspots(5, "cumtime")
+    assert any(name.startswith("busy (test_profiler.py:") for name, *_ in top)
+    assert [r[3] for r in top] == sorted((r[3] for r in top), reverse=True)
+
+
+def test_execucao_interrompida_nao_conta():
+    prof = Profile(interval=0.001)
+    prof.stop()                                         # sem start: nada a fazer
+    prof.start()
+    busy(0.01)
+    prof.start()                                        # st.rerun no meio da execução anterior
+    busy(0.01)
+    prof.stop()
+    assert prof.runs == 1
+    assert prof._t0 is None
+
+
+def test_dump_e_folded(tmp_path):
+    prof = _profile(runs=1)
+    path = tmp_path / "rerun.prof"
+    path.write_bytes(prof.dump())
+    names = {func for _, _, func in pstats.Stats(str(path)).stats}
+    assert "busy" in names
+    lines = prof.folded_text().splitlines()
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert counts == sorted(counts, reverse=True) and sum(counts) == prof.samples
+
+
+def test_flame_html():
+    assert flame_html(Counter()) == ""
+    folded = Counter({"main;a;<script>x</script>": 3, "main;b": 1, "main;a": 4})
+    markup = flame_html(folded, width=800)
+    assert "<script>" not in markup and "&lt;script&gt;" in markup
+    svg = ET.fromstring(markup).find(f"{NS}svg")
+    widths = {g.find(f"{NS}title").text.split(" — ")[0]: float(g.find(f"{NS}rect").get("width"))
+              for g in svg.findall(f"{NS}g")}
+    assert widths["total"] == widths["main"] == pytest.approx(800)
+    assert widths["a"] == pytest.approx(700) and widths["b"] == pytest.approx(100)
+    assert widths["<script>x</script>"] == pytest.approx(300)
+    # Nós mais estreitos que min_px somem
+    assert "b —" not in flame_html(folded, width=800, min_px=150)
+
+
+def test_pagina_so_para_administradores(app_test):
+    from views import PROFILER_PAGE
+
+    app_test.session_state["user_role"] = "editor"
+    app_test.run()
+    assert PROFILER_PAGE not in app_test.sidebar.radio[0].options
+
+
+def test_perfil_das_proximas_execucoes(app_test):
+    from views import PROFILER_PAGE
+
+    app_test.run()
+    app_test.sidebar.radio[0].set_value(PROFILER_PAGE).run()
+    assert not app_test.exception
+    app_test.selectbox(key="profile_page").set_value("📅 Timeline")
+    app_test.number_input(key="profile_runs").set_value(2)
+    next(b for b in app_test.button if "Perfilar" in b.label).click().run()
+    assert not app_test.exception
+    # Executa a página escolhida 2 vezes e volta ao Profiler com o resultado
+    assert app_test.sidebar.radio[0].value == PROFILER_PAGE
+    assert "profiling" not in app_test.session_state
+    result = app_test.session_state["profile_result"]
+    assert result["page"] == "📅 Timeline" and result["profile"].runs == 2
+    assert any(c.value.startswith("📅 Timeline · 2 execução(ões)") for c in app_test.caption)
+    assert len(app_test.dataframe) == 1 and len(app_test.get("download_button")) == 2
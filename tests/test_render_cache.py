@@ -0,0 +1,64 @@
+"""
+test_render_cache.py — FragmentCache: acertos, limite em bytes e descarte por versão
+"""
+from render_cache import FragmentCache, fragment_key
+
+
+def _get(cache, key, html, scope=None, version=None):
+    calls = []
+    out = cache.get_or_render(key, lambda: calls.append(1) or html, scope=scope, version=version)
+    assert out == html
+    return bool(calls)
+
+
+def test_acerto_nao_renderiza_de_novo():
+    cache = FragmentCache()
+    assert _get(cache, "a", "<p>a</p>")
+    assert not _get(cache, "a", "<p>a</p>")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_chave_muda_com_versao_e_filtros():
+    assert fragment_key("p", 1, "tarefas", "Todas") == fragment_key("p", 1, "tarefas", "Todas")
+    assert fragment_key("p", 1, "tarefas", "Todas") != fragment_key("p", 2, "tarefas", "Todas")
+    assert fragment_key("p", 1, "tarefas", "Todas") != fragment_key("p", 1, "tarefas", "Fase 1")
+
+
+def test_limite_em_bytes_descarta_os_menos_usados():
+    cache = FragmentCache(max_bytes=250)
+    for k in "abc":
+        _get(cache, k, k * 100)
+    assert len(cache) == 2 and cache.bytes == 200
+    assert _get(cache, "a", "a" * 100)            # o mais antigo saiu
+    assert not _get(cache, "c", "c" * 100)
+    # Maior que o limite inteiro: devolvido, não guardado
+    assert _get(cache, "big", "x" * 300)
+    assert "big" not in cache._data and cache.bytes <= 250
+
+
+def test_limite_em_entradas():
+    cache = FragmentCache(max_entries=3)
+    for k in "abcde":
+        _get(cache, k, k)
+    assert list(cache._data) == ["c", "d", "e"] and cache.bytes == 3
+
+
+def test_versao_nova_descarta_as_anteriores_do_plano():
+    cache = FragmentCache()
+    _get(cache, "p1-v1-a", "a1", "p1", 1)
+    _get(cache, "p1-v1-b", "b1", "p1", 1)
+    _get(cache, "p2-v1-a", "x1", "p2", 1)
+    _get(cache, "p1-v2-a", "a2", "p1", 2)
+    assert set(cache._data) == {"p2-v1-a", "p1-v2-a"}
+    assert cache.bytes == 4
+    # Sessão atrasada renderizando a versão antiga: não volta para o cache
+    assert _get(cache, "p1-v1-a", "a1", "p1", 1)
+    assert "p1-v1-a" not in cache._data
+
+
+def test_clear():
+    cache = FragmentCache()
+    _get(cache, "a", "aaa", "p", 3)
+    cache.clear()
+    assert len(cache) == 0 and cache.bytes == 0
+    assert _get(cache, "a", "aaa", "p", 1)
@@ -0,0 +1,36 @@
+"""
+test_revocations.py — Tokens revogados: persistência e limpeza na expiração
+"""
+import time
+
+from revocations import RevokedTokens
+
+
+def test_revogacao_sobrevive_ao_restart(tmp_path):
+    db = str(tmp_path / "ratelimit.db")
+    exp = time.time() + 3600
+    rev = RevokedTokens(db)
+    rev.add("abc", exp)
+    assert "abc" in rev and "xyz" not in rev
+    rev.close()
+    rev = RevokedTokens(db)
+    assert "abc" in rev
+    rev.close()
+
+
+def test_revogacoes_vencidas_sao_apagadas(tmp_path):
+    db = str(tmp_path / "ratelimit.db")
+    now = time.time()
+    rev = RevokedTokens(db)
+    rev.add("velho", now - 1, now=now - 10)
+    assert "velho" not in rev                 # já expirou: a assinatura não vale mais
+    rev.add("novo", now + 3600, now=now)
+    assert len(rev) == 1
+    assert rev._db.execute("SELECT jti FROM revoked_token").fetchall() == [("novo",)]
+    rev.close()
+
+
+def test_so_memoria():
+    rev = RevokedTokens()
+    rev.add("abc", time.time() + 60)
+    assert "abc" in rev and len(rev) == 1
@@ -0,0 +1,93 @@
+"""
+test_rollups.py — StatusRollup: contadores incrementais contra a recontagem completa
+"""
+import random
+from collections import Counter
+
+import pytest
+
+from core.persistence import PlanDB
+from core.rollups import StatusRollup
+from core.task_store import TaskStore
+from synthetic import STATUSES, make_plan
+
+
+def _plan(n, seed):
+    tasks, deps = make_plan(n, seed=seed)
+    state = {t[1]: {"status": t[6], "aviso": t[7], "rev": 0} for t in tasks}
+    return tasks, TaskStore(tasks, deps), state
+
+
+def _recount(tasks, state, key=None):
+    return Counter(state[t[1]]["status"] for t in tasks if key is None or key(t))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_apply_igual_a_recontagem(seed):
+    rnd = random.Random(seed)
+    tasks, store, state = _plan(400, seed)
+    rollup = StatusRollup(store, state)
+    for _ in range(500):
+        tid = rnd.choice(store.tid)
+        old, new = state[tid]["status"], rnd.choice(STATUSES)
+        state[tid]["status"] = new
+        rollup.apply(tid, old, new)
+    assert rollup.check(state) == []
+    assert +rollup.total == _recount(tasks, state)
+    for fase in store.fases:
+        assert +rollup.fase_counts(fase) == _recount(tasks, state, lambda t: t[0] == fase)
+    for resp in store.resps:
+        assert +rollup.resp_counts(resp) == _recount(tasks, state, lambda t: t[3] == resp)
+
+
+def test_kpis():
+    tasks, store, state = _plan(200, 5)
+    c = _recount(tasks, state)
+    total, done, wip, blk, pend, pct = StatusRollup(store, state).kpis()
+    assert (total, done, wip, blk, pend) == (
+        200, c["concluido"], c["em andamento"], c["bloqueado"], c["pendente"])
+    assert pct == int(c["concluido"] / 200 * 100)
+    assert StatusRollup(TaskStore(), {}).kpis() == (0, 0, 0, 0, 0, 0)
+
+
+def test_chaves_desconhecidas_e_status_igual():
+    tasks, store, state = _plan(50, 1)
+    rollup = StatusRollup(store, state)
+    assert rollup.fase_counts("Fase 99") == Counter() and rollup.resp_counts("Ninguém") == Counter()
+    before = Counter(rollup.total)
+    tid = store.tid[0]
+    rollup.apply(tid, state[tid]["status"], state[tid]["status"])
+    assert rollup.total == before
+
+
+def test_check_aponta_e_repara_divergencia():
+    tasks, store, state = _plan(100, 2)
+    rollup = StatusRollup(store, state)
+    tid = store.tid[0]
+    state[tid]["status"] = "concluido" if state[tid]["status"] != "concluido" else "pendente"
+    diffs = rollup.check(state)                    # escrita sem apply: contadores ficam para trás
+    assert {d[0] for d in diffs} == {"total", "fase", "resp"}
+    assert rollup.check(state, repair=True) == diffs
+    assert rollup.check(state) == []
+
+
+def test_sessao_ve_escritas_de_outra_instancia(app_test):
+    at = app_test.run()
+    assert not at.exception
+    db = PlanDB(at.secrets["PLAN_DB_PATH"], readers=1)
+    try:
+        plan_id = at.session_state["project"]
+        _, rows = db.load(plan_id)
+        tids = list(rows)[:3]
+        for tid, status in zip(tids, ("concluido", "bloqueado", "em andamento")):
+            if rows[tid]["status"] == status:
+                status = "pendente"
+            db.write_task(plan_id, tid, status, None, "outra sessão")
+        _, rows = db.load(plan_id)
+    finally:
+        db.close()
+    at.run()
+    assert not at.exception
+    ts = at.session_state["task_state"]
+    assert all(ts[tid]["status"] == rows[tid]["status"] for tid in tids)
+    assert at.session_state["rollup"].check(ts) == []
@@ -0,0 +1,22 @@
+"""
+test_startup.py — Orçamento de partida do app e da linha de comando
+Roda benchmarks/startup.py num processo à parte: falha se os imports de topo
+do app.py ou do ``python -m core`` passarem do orçamento, ou se um módulo
+pesado (pandas, numpy, pyarrow, openpyxl) entrar na partida.
+"""
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+
+def test_startup_within_budget():
+    pytest.importorskip("streamlit")
+    proc = subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / "startup.py"), "--repeat", "5"],
+        cwd=ROOT, capture_output=True, text=True, timeout=600,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "ACIMA DO ORÇAMENTO" not in proc.stdout
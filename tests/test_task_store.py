@@ -0,0 +1,78 @@
+"""
+test_task_store.py — TaskStore: índices e consultas contra varreduras da lista de tarefas
+"""
+from datetime import date
+
+import pytest
+
+from core.task_store import TaskStore
+from synthetic import make_plan
+
+
+@pytest.fixture(scope="module")
+def plan():
+    tasks, deps = make_plan(600, n_fases=6, seed=3)
+    return tasks, TaskStore(tasks, deps)
+
+
+def test_linhas_e_lookup_por_id(plan):
+    tasks, store = plan
+    assert len(store) == len(tasks)
+    assert list(store) == tasks
+    assert store.ids == [t[1] for t in tasks]
+    for t in tasks[::37]:
+        assert t[1] in store
+        assert store.get(t[1]) == t
+    assert "T9999" not in store
+    assert store.get("T9999") is None
+    assert store.get("T9999", "x") == "x"
+
+
+def test_fases_e_responsaveis_em_ordem_de_insercao(plan):
+    tasks, store = plan
+    assert store.fases == list(dict.fromkeys(t[0] for t in tasks))
+    assert store.resps == list(dict.fromkeys(t[3] for t in tasks))
+    for fase in store.fases:
+        assert store.tasks_fase(fase) == [t for t in tasks if t[0] == fase]
+    for resp in store.resps:
+        assert store.tasks_resp(resp) == [t for t in tasks if t[3] == resp]
+    assert store.tasks_fase("Fase 99") == [] and store.tasks_resp("Ninguém") == []
+
+
+@pytest.mark.parametrize("fase", [None, "Fase 01", "Fase 04", "Fase 99"])
+@pytest.mark.parametrize("resp", [None, "DBA", "Consultor", "Ninguém"])
+def test_select_igual_a_varredura(plan, fase, resp):
+    tasks, store = plan
+    expected = [i for i, t in enumerate(tasks)
+                if (fase is None or t[0] == fase) and (resp is None or t[3] == resp)]
+    assert list(store.select(fase, resp)) == expected
+
+
+def test_id_duplicado():
+    store = TaskStore([("F", "T1", "a", "R", "2025-02-03", "2025-02-03", "pendente", "")])
+    with pytest.raises(ValueError, match="T1"):
+        store.append(("F", "T1", "b", "R", "2025-02-04", "2025-02-04", "pendente", ""))
+    assert len(store) == 1 and store.get("T1")[2] == "a"
+
+
+def test_day_span_e_set_dates():
+    tasks, deps = make_plan(20, seed=1)
+    store = TaskStore(tasks, deps)
+    ini, fim = store.day_span()
+    assert list(ini) == [date.fromisoformat(t[4]).toordinal() for t in tasks]
+    assert list(fim) == [date.fromisoformat(t[5]).toordinal() for t in tasks]
+
+    store.set_dates({"T05": ("2025-06-01", "2025-06-03"), "T99": ("2025-01-01", "2025-01-01")}, 7)
+    assert store.dates_rev == 7
+    assert store.get("T05")[4:6] == ("2025-06-01", "2025-06-03")
+    assert "T99" not in store
+    ini, fim = store.day_span()                   # convertido de novo depois da troca
+    assert (ini[4], fim[4]) == (date(2025, 6, 1).toordinal(), date(2025, 6, 3).toordinal())
+
+    store.append(("Fase 09", "T21", "nova", "DBA", "2025-07-01", "2025-07-02", "pendente", ""))
+    assert len(store.day_span()[0]) == 21          # tarefa nova entra no cache de datas
+
+
+def test_graph_montado_uma_vez(plan):
+    tasks, store = plan
+    assert store.graph is store.graph
@@ -0,0 +1,30 @@
+"""
+views — Páginas do app, uma por módulo
+Cada módulo expõe ``render(ctx)`` e só é importado quando a página é aberta
+no menu (``load``). Dependências pesadas ficam com a página que as usa:
+pandas no Burndown e no Profiler, exportação no Tarefas. A partida do app e
+as demais páginas não pagam por elas. ``ctx`` traz o estado do rerun (plano,
+estado das tarefas, rollup, CPM...) montado pelo app.py.
+"""
+import importlib
+
+PROFILER_PAGE = "🧪 Profiler"
+
+PAGES = {
+    "📊 Dashboard":  "dashboard",
+    "📋 Tarefas":    "tarefas",
+    "📅 Timeline":   "timeline",
+    "⚖️ Nivelamento": "nivelamento",
+    "📈 Burndown":   "burndown",
+    "🔴 Bloqueios":  "bloqueios",
+    "✏️ Atualizar":  "atualizar",
+    PROFILER_PAGE:   "profiler",
+}
+
+# Menu para todos os perfis (o Profiler só aparece para administradores)
+NAV_PAGES = [p for p in PAGES if p != PROFILER_PAGE]
+
+
+def load(page):
+    """Módulo da página (importado no primeiro uso; depois vem de ``sys.modules``)."""
+    return importlib.import_module(f"{__name__}.{PAGES[page]}")
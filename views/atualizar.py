@@ -0,0 +1,172 @@
+"""
+atualizar.py — Página Atualizar: status por tarefa (compare-and-swap) e por fase inteira
+Tudo roda num fragmento: salvar reexecuta só o cabeçalho de KPIs, o preview e
+os formulários — CSS, sidebar e demais páginas ficam como estão. Se o save
+muda o que a sidebar mostra (progresso geral, concluídas por responsável),
+o app inteiro reexecuta.
+"""
+import time
+from html import escape
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+import metrics
+from auth import get_permission
+from views.common import STATUS_OPT, latency_ms, md, record_latency, render_header, rtag, sidebar_counts
+
+
+def set_status(ctx, tid, status, aviso, expected_rev):
+    """Grava uma tarefa com compare-and-swap sobre ``rev``.
+
+    Retorna ``(True, versão)`` ou ``(False, linha_atual)`` se outra sessão gravou antes.
+    """
+    ok, res = ctx.db.compare_and_set(ctx.plan_id, tid, expected_rev, status, aviso, author=st.session_state.username)
+    ctx.sync_state()
+    return ok, res
+
+def set_many(ctx, changes):
+    """Grava ``[(tid, status, aviso), ...]`` numa transação (última escrita vence)."""
+    ctx.db.write_many(ctx.plan_id, changes, author=st.session_state.username)
+    ctx.sync_state()
+
+def rerun_panel(store):
+    """Reexecuta só o fragmento do Atualizar, ou o app todo se a sidebar ficou desatualizada.
+
+    Numa execução completa (fora de um rerun do fragmento) é sempre o app todo.
+    """
+    if sidebar_counts(store, st.session_state.rollup) != st.session_state.get("sidebar_shown"):
+        st.rerun(scope="app")
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def render(ctx):
+    store, graph = ctx.store, ctx.graph
+
+    def panel(frag_metrics):
+        frag_t0 = time.perf_counter()
+        with frag_metrics.section("sync"):
+            ctx.sync_state()
+        ts     = st.session_state.task_state
+        rollup = st.session_state.rollup
+        with frag_metrics.section("hero"):
+            render_header(store, ctx.plan_label, rollup)
+
+        md('<div class="sec-hdr">Atualizar Status de Tarefa</div>')
+        md('<div class="callout c-info"><b>Como usar</b>Selecione a tarefa, atualize o status e clique em Salvar. O dashboard e todos os painéis atualizam automaticamente.</div>')
+        if "flash" in st.session_state:
+            st.success(st.session_state.pop("flash"))
+        can_edit = get_permission("can_edit")
+        if not can_edit:
+            st.info("👁️ Seu perfil é somente leitura: você pode consultar as tarefas, mas não alterá-las.")
+
+        # ── Formulário individual ──────────────────────────────
+        tid_opts = [f"{tid} — {nome}" for tid, nome in zip(store.tid, store.nome)]
+
+        # selectbox fora do form para atualizar o preview ao vivo
+        sel     = st.selectbox("Tarefa", tid_opts, key="sel_tarefa")
+        tid_sel = sel.split(" — ")[0]
+
+        t_sel = store.get(tid_sel)
+        deps  = store.deps.get(tid_sel, [])
+
+        # Preview acima do form
+        deps_html = ""
+        for dep in deps:
+            dep_task = store.get(dep)
+            if dep_task:
+                dep_st = ts[dep]["status"]
+                color  = "#00e676" if dep_st == "concluido" else "#f5a623" if dep_st == "em andamento" else "#ff5252" if dep_st == "bloqueado" else "#8899aa"
+                deps_html += f'<div style="font-size:11px;font-family:IBM Plex Mono,monospace;color:{color};margin-bottom:3px">↳ {escape(dep)}: {escape(dep_task[2][:42])} <span style="color:{color}">[{dep_st}]</span></div>'
+
+        # Bloqueios indiretos (além das dependências diretas) e impacto adiante
+        chain    = [(d, n) for d, n in graph.blockers(tid_sel, ts) if n > 1]
+        chain_html = "".join(
+            f'<div style="font-size:11px;font-family:IBM Plex Mono,monospace;color:#8899aa;margin-bottom:3px">'
+            f'{"&nbsp;&nbsp;" * (n - 1)}↳ {escape(d)}: {escape(store.nome[store.index[d]][:42])} [{ts[d]["status"]}]</div>'
+            for d, n in chain
+        )
+        down     = sorted(graph.downstream(tid_sel), key=graph.pos.get)
+        down_str = escape(", ".join(down[:12])) + (f" +{len(down) - 12}" if len(down) > 12 else "")
+
+        md(f"""
+        <div style="background:#111827;border:1px solid #1a2235;border-radius:6px;padding:16px;margin-bottom:16px">
+          <div style="font-family:IBM Plex Mono,monospace;font-size:10px;color:#f5a623;margin-bottom:4px;letter-spacing:.06em">{escape(tid_sel)} · {escape(t_sel[0])}</div>
+          <div style="font-size:14px;color:#e8f0f8;font-weight:600;margin-bottom:8px">{escape(t_sel[2])}</div>
+          <div style="margin-bottom:8px">{rtag(t_sel[3])}</div>
+          <div style="font-size:11px;color:#8899aa;font-family:IBM Plex Mono,monospace">{t_sel[4]} → {t_sel[5]}</div>
+          {"<div style='margin-top:10px;font-size:9px;color:#8899aa;font-family:IBM Plex Mono,monospace;letter-spacing:.1em;text-transform:uppercase;margin-bottom:6px'>Dependências</div>" + deps_html if deps_html else ""}
+          {"<div style='margin-top:10px;font-size:9px;color:#8899aa;font-family:IBM Plex Mono,monospace;letter-spacing:.1em;text-transform:uppercase;margin-bottom:6px'>Bloqueios indiretos pendentes</div>" + chain_html if chain_html else ""}
+          {"<div style='margin-top:10px;font-size:9px;color:#8899aa;font-family:IBM Plex Mono,monospace;letter-spacing:.1em;text-transform:uppercase;margin-bottom:6px'>Impacta adiante</div><div style='font-size:11px;font-family:IBM Plex Mono,monospace;color:#8899aa'>" + down_str + "</div>" if down else ""}
+        </div>
+        """)
+
+        # Revisão que estava na tela quando o formulário foi exibido (base do compare-and-swap)
+        prev_base = st.session_state.get("edit_base", {})
+
+        # Form para evitar rerun dentro de colunas
+        with st.form("form_atualizar", clear_on_submit=False):
+            cur_status = ts[tid_sel]["status"]
+            cur_aviso  = ts[tid_sel]["aviso"]
+            new_status = st.selectbox("Novo Status", STATUS_OPT, index=STATUS_OPT.index(cur_status))
+            new_aviso  = st.text_area("Aviso / Bloqueio (opcional)", value=cur_aviso, height=80)
+            submitted  = st.form_submit_button("💾  Salvar Alteração", type="primary", use_container_width=True, disabled=not can_edit)
+        st.session_state.edit_base = {tid_sel: ts[tid_sel]["rev"]}
+
+        if submitted:
+            expected = prev_base.get(tid_sel, ts[tid_sel]["rev"])
+            ok, res = set_status(ctx, tid_sel, new_status, new_aviso.strip(), expected)
+            if ok:
+                st.session_state.flash = f"✅ **{tid_sel}** atualizado para **{new_status}**"
+                rerun_panel(store)
+            st.warning(
+                f"⚠️ **{tid_sel}** foi alterada em outra sessão enquanto você editava "
+                f"(agora: **{res['status']}**). Revise os valores e salve novamente."
+            )
+
+        # ── Atalho: marcar fase inteira ────────────────────────
+        st.divider()
+        md('<div style="font-size:10px;color:#8899aa;font-family:IBM Plex Mono,monospace;letter-spacing:.1em;text-transform:uppercase;margin-bottom:10px">Atalho — Marcar fase inteira</div>')
+
+        with st.form("form_bulk", clear_on_submit=False):
+            fase_sel    = st.selectbox("Fase", store.fases)
+            status_bulk = st.selectbox("Novo status para todas as tarefas", STATUS_OPT)
+            submitted_bulk = st.form_submit_button("Aplicar a toda a fase", use_container_width=True, disabled=not can_edit)
+
+        if submitted_bulk:
+            set_many(ctx, [(store.tid[i], status_bulk, None) for i in store.rows_fase(fase_sel)])
+            st.session_state.flash = f"✅ Todas as tarefas de **{fase_sel}** → **{status_bulk}**"
+            rerun_panel(store)
+
+        # ── Consistência dos contadores ────────────────────────
+        if st.button("🔁 Verificar contadores", help="Recalcula os totais do zero e corrige divergências"):
+            diffs = rollup.check(ts, repair=True)
+            if diffs:
+                st.warning(f"{len(diffs)} contador(es) divergente(s) corrigido(s).")
+            else:
+                st.success("Contadores consistentes.")
+
+        # ── Latência: rerun do fragmento × rerun completo ──────
+        record_latency("fragment", time.perf_counter() - frag_t0)
+        full_ms, frag_ms = latency_ms("full"), latency_ms("fragment")
+        if full_ms is not None and frag_ms is not None:
+            st.caption(
+                f"⏱ Rerun completo: {full_ms:.0f} ms · só o painel (fragmento): {frag_ms:.0f} ms "
+                f"— média das últimas execuções desta sessão"
+            )
+
+    @st.fragment
+    def atualizar_panel():
+        # Rerun só do fragmento: o rerun completo anterior já foi publicado
+        frag_metrics = metrics.Rerun("fragment") if ctx.run_metrics.finished else ctx.run_metrics
+        try:
+            panel(frag_metrics)
+        finally:
+            # Também quando o painel termina num st.rerun() (save)
+            if frag_metrics is not ctx.run_metrics:
+                ctx.publish_metrics(frag_metrics, ctx.page)
+
+    atualizar_panel()
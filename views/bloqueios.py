@@ -0,0 +1,94 @@
+"""
+bloqueios.py — Página Bloqueios: tarefas bloqueadas ou com aviso, dependências pendentes e impacto
+A tabela mostra só as dependências diretas pendentes (e quantas indiretas
+faltam), paginada; a cadeia completa de uma tarefa é montada sob demanda.
+"""
+from html import escape
+
+import streamlit as st
+
+from core import report
+from views.common import md, rtag, sbadge
+
+CHAIN_ROWS = 500
+
+
+def render(ctx):
+    store, ts = ctx.store, ctx.ts
+    md('<div class="sec-hdr">Bloqueios e Dependências <span class="sec-sub">Itens que exigem atenção imediata</span></div>')
+    md('<div class="callout c-warn"><b>Atenção</b>Tarefas com avisos técnicos ou dependências pendentes que bloqueiam o avanço. Resolva antes de prosseguir.</div>')
+
+    # Mesma seleção do relatório da linha de comando (core/report.py), uma vez por versão do plano
+    rep_key = (ctx.plan_id, st.session_state.state_version)
+    cached = st.session_state.get("bloqueios_rows")
+    if not cached or cached[0] != rep_key:
+        cached = (rep_key, report.blockers(store, ts))
+        st.session_state.bloqueios_rows = cached
+    blocked = cached[1]
+    if not blocked:
+        md('<div class="callout c-ok"><b>Tudo certo</b>Nenhum bloqueio ativo no momento 🎉</div>')
+        return
+
+    count = len(blocked)
+    pc1, pc2 = st.columns([1, 3])
+    with pc1:
+        page_size = st.selectbox("Por página", [25, 50, 100, 250], index=1)
+    n_pages = max(1, -(-count // page_size))
+    with pc2:
+        page = st.number_input(
+            f"Página (de {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+            key=f"bloqueios_pag_{page_size}",
+        )
+    first = (page - 1) * page_size
+    shown = blocked[first:first + page_size]
+
+    def _bloqueios_table():
+        rows = ""
+        for b in shown:
+            tid, aviso = b["id"], b["aviso"]
+            deps_html = "".join(
+                f'<br><span style="color:#f5a623;font-size:10px;font-family:IBM Plex Mono,monospace">'
+                f'↳ dep: {escape(dep)}: {escape(store.nome[store.index[dep]][:38])} [{ts[dep]["status"]}]</span>'
+                for dep in b["pendentes"]
+            )
+            if b["indiretas"]:
+                deps_html += f'<br><span style="color:#f5a623;font-size:10px;font-family:IBM Plex Mono,monospace">↳ + {b["indiretas"]} dependência(s) indireta(s) pendente(s)</span>'
+            if b["trava"]:
+                deps_html += f'<br><span style="color:#8899aa;font-size:10px;font-family:IBM Plex Mono,monospace">⤷ trava {b["trava"]} tarefa(s) adiante</span>'
+            rows += (
+                f"<tr>"
+                f"<td style='font-family:IBM Plex Mono,monospace;color:#ff5252'>{escape(tid)}</td>"
+                f"<td><strong style='color:#e8f0f8'>{escape(b['nome'])}</strong>{deps_html}</td>"
+                f"<td><span style='font-size:10px;color:#8899aa;font-family:IBM Plex Mono,monospace'>{escape(b['fase'])}</span></td>"
+                f"<td>{rtag(b['resp'])}</td>"
+                f"<td style='font-size:11px;color:#ffaa00'>{escape(aviso) if aviso else '—'}</td>"
+                f"<td>{sbadge(b['status'])}</td>"
+                f"</tr>"
+            )
+        return (
+            f"<table class='se-tbl'><thead><tr>"
+            f"<th>ID</th><th>Tarefa / Deps Pendentes</th><th>Fase</th><th>Resp.</th><th>Aviso Técnico</th><th>Status</th>"
+            f"</tr></thead><tbody>{rows}</tbody></table>"
+        )
+
+    md(f'<div style="font-size:11px;color:#8899aa;font-family:IBM Plex Mono,monospace;margin-bottom:10px">'
+       f'{first + 1}–{min(first + page_size, count)} de {count} bloqueio(s) exibido(s)</div>')
+    md(ctx.cached_html("bloqueios", _bloqueios_table, first, page_size))
+
+    # Cadeia completa: todas as dependências transitivas não concluídas, de uma tarefa por vez
+    with st.expander("🔗 Cadeia completa de bloqueio"):
+        tid_sel = st.selectbox(
+            "Tarefa", [b["id"] for b in shown],
+            format_func=lambda t: f"{t} — {store.nome[store.index[t]][:60]}",
+        )
+        chain = store.graph.blockers(tid_sel, ts)
+        if not chain:
+            st.caption("Nenhuma dependência pendente.")
+        else:
+            md("".join(
+                f'<div style="color:#f5a623;font-size:10px;font-family:IBM Plex Mono,monospace">'
+                f'{"&nbsp;&nbsp;" * (depth - 1)}↳ dep: {escape(dep)}: {escape(store.nome[store.index[dep]][:38])} [{ts[dep]["status"]}]</div>'
+                for dep, depth in chain[:CHAIN_ROWS]
+            ))
+            if len(chain) > CHAIN_ROWS:
+                st.caption(f"Mostrando {CHAIN_ROWS} de {len(chain)} dependências pendentes.")
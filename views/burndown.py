@@ -0,0 +1,71 @@
+"""
+burndown.py — Página Burndown: planejado × realizado, restante e vazão semanal
+Única página (com o Profiler) que usa pandas; o import só acontece aqui.
+"""
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from core import burndown
+from views.common import md
+
+
+@st.cache_resource(max_entries=4)
+def burndown_frames(_db, _store, plan_id, generation, version, day):
+    """Planejado × realizado e vazão semanal; refeitos quando a versão (ou o dia) muda."""
+    return burndown.build(_store, _db.history(plan_id), today=day)
+
+
+def render(ctx):
+    store = ctx.store
+    frames = burndown_frames(ctx.db, store, ctx.plan_id, store.generation, st.session_state.state_version, date.today())
+    md('<div class="sec-hdr">Burndown <span class="sec-sub">planejado (datas de término) × realizado (histórico de status)</span></div>')
+
+    bc1, bc2 = st.columns([1, 2])
+    with bc1:
+        recorte = st.radio("Recorte", ["Plano", "Fase", "Responsável"], horizontal=True)
+    with bc2:
+        if recorte == "Fase":
+            col = ("fase", st.selectbox("Fase", store.fases))
+        elif recorte == "Responsável":
+            col = ("resp", st.selectbox("Responsável", store.resps))
+        else:
+            col = burndown.TOTAL
+
+    burnup, restante, weekly = burndown.view(frames, col)
+    scope = int(frames["scope"][col])
+    past  = burnup.loc[:pd.Timestamp(date.today())]
+    prev_today = int(past["Planejado"].iloc[-1]) if len(past) else 0
+    done_today = int(past["Realizado"].iloc[-1]) if len(past) else 0
+    atraso     = prev_today - done_today
+    vel        = burndown.velocity(weekly)
+
+    md(f"""
+<div class="kpi-grid">
+  <div class="kpi-card"><div class="kpi-val kpi-blue">{scope}</div><div class="kpi-lbl">Escopo</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-muted">{prev_today}</div><div class="kpi-lbl">Previstas até hoje</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-green">{done_today}</div><div class="kpi-lbl">Concluídas</div></div>
+  <div class="kpi-card"><div class="kpi-val {'kpi-red' if atraso > 0 else 'kpi-green'}">{max(atraso, 0)}</div><div class="kpi-lbl">Em atraso</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-amber">{vel:.1f}</div><div class="kpi-lbl">Vazão / semana (4 sem.)</div></div>
+</div>
+    """)
+
+    gc1, gc2 = st.columns(2)
+    with gc1:
+        md('<div class="sec-hdr">Burnup</div>')
+        st.line_chart(burnup, color=["#2E75B6", "#00e676"], height=280)
+    with gc2:
+        md('<div class="sec-hdr">Restante</div>')
+        st.line_chart(restante, color=["#2E75B6", "#f5a623"], height=280)
+
+    md('<div class="sec-hdr">Vazão semanal <span class="sec-sub">tarefas concluídas por semana</span></div>')
+    st.bar_chart(weekly, color="#00e676", height=220)
+
+    remaining = scope - done_today
+    if remaining and vel:
+        fim_prev = date.today() + timedelta(weeks=remaining / vel)
+        md(
+            f'<div class="callout c-info"><b>Projeção</b>No ritmo das últimas 4 semanas ({vel:.1f}/semana), '
+            f'as {remaining} tarefa(s) restantes terminam por volta de {fim_prev.strftime("%d/%m/%Y")}.</div>'
+        )
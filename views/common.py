@@ -0,0 +1,104 @@
+"""
+common.py — Peças de interface compartilhadas pelas páginas e pelo app.py
+HTML via ``md`` (contado nas métricas), badges de status, tags de
+responsável, barras de progresso, cabeçalho com KPIs e a latência de rerun
+da sessão.
+"""
+from collections import deque
+from datetime import date
+from functools import lru_cache
+from html import escape
+
+import streamlit as st
+
+import gantt
+import metrics
+
+STATUS_OPT = ["pendente", "em andamento", "concluido", "bloqueado"]
+
+RESP_COLORS = {
+    "Gestor TI": "#2E75B6", "DBA": "#C55A11",    "Infra":     "#7030A0",
+    "SysAdmin":  "#375623", "Seguranca": "#833C0B", "TI": "#1F4E79", "Consultor": "#4472C4",
+}
+
+
+def md(body):
+    """HTML via st.markdown, contado no HTML emitido da seção corrente."""
+    metrics.emitted(body)
+    st.markdown(body, unsafe_allow_html=True)
+
+
+# ── Badges e barras ────────────────────────────────────────
+@lru_cache(maxsize=64)
+def sbadge(s):
+    m = {
+        "pendente":     ("b-pend", "◯ pendente"),
+        "em andamento": ("b-wip",  "⟳ em andamento"),
+        "concluido":    ("b-done", "✓ concluido"),
+        "bloqueado":    ("b-blk",  "✗ bloqueado"),
+    }
+    cls, lbl = m.get(s, ("b-pend", escape(s)))
+    return f'<span class="badge {cls}">{lbl}</span>'
+
+@lru_cache(maxsize=256)
+def rtag(r):
+    c = RESP_COLORS.get(r, "#8899aa")
+    return f'<span class="rt" style="background:{c}22;border:1px solid {c}55;color:{c}">{escape(r)}</span>'
+
+@lru_cache(maxsize=512)
+def pbar(pct, color="#00e676"):
+    return (
+        f'<div class="pbar-wrap">'
+        f'<div class="pbar-track"><div class="pbar-fill" style="width:{pct}%;background:{color}"></div></div>'
+        f'<span class="pbar-pct" style="color:{color}">{pct}%</span>'
+        f'</div>'
+    )
+
+
+# ── Sidebar ────────────────────────────────────────────────
+def sidebar_counts(store, rollup):
+    """O que a sidebar mostra do rollup: concluídas no total e por responsável."""
+    return rollup.kpis()[1], tuple(rollup.resp_counts(r)["concluido"] for r in store.resps)
+
+
+# ── Hero + KPIs ────────────────────────────────────────────
+def render_header(store, label, rollup):
+    total, done, wip, blk, pend, pct = rollup.kpis()
+    first, after_last = gantt.date_range(store)
+    ini, fim = date.fromordinal(first), date.fromordinal(after_last - 1)
+
+    md(f"""
+<div class="hero">
+  <div class="hero-title">SE Suite 2.1 — Plano de Ação</div>
+  <div class="hero-sub">SoftExpert Excellence Suite · Equipe mista · {escape(label)}</div>
+  <div class="hero-meta">
+    <div class="meta-item"><span class="meta-label">Início</span><span class="meta-val">{ini.strftime("%d/%m/%Y")}</span></div>
+    <div class="meta-item"><span class="meta-label">Fim</span><span class="meta-val">{fim.strftime("%d/%m/%Y")}</span></div>
+    <div class="meta-item"><span class="meta-label">Progresso</span><span class="meta-val" style="color:#00e676">{pct}% ({done}/{total})</span></div>
+    <div class="meta-item"><span class="meta-label">Em Andamento</span><span class="meta-val" style="color:#f5a623">{wip}</span></div>
+    <div class="meta-item"><span class="meta-label">Bloqueadas</span><span class="meta-val" style="color:#ff5252">{blk}</span></div>
+  </div>
+</div>
+    """)
+
+    # KPIs
+    md(f"""
+<div class="kpi-grid">
+  <div class="kpi-card"><div class="kpi-val kpi-blue">{total}</div><div class="kpi-lbl">Total</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-green">{done}</div><div class="kpi-lbl">Concluídas</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-amber">{wip}</div><div class="kpi-lbl">Em Andamento</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-red">{blk}</div><div class="kpi-lbl">Bloqueadas</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-muted">{pend}</div><div class="kpi-lbl">Pendentes</div></div>
+</div>
+    """)
+
+
+# ── Latência da sessão ─────────────────────────────────────
+def record_latency(kind, seconds):
+    """Guarda as últimas durações de rerun (``full`` ou ``fragment``) da sessão."""
+    lat = st.session_state.setdefault("latency", {"full": deque(maxlen=20), "fragment": deque(maxlen=20)})
+    lat[kind].append(seconds)
+
+def latency_ms(kind):
+    vals = st.session_state.get("latency", {}).get(kind)
+    return sum(vals) / len(vals) * 1000 if vals else None
@@ -0,0 +1,88 @@
+"""
+dashboard.py — Página Dashboard: progresso por fase, por responsável e bloqueios ativos
+"""
+from html import escape
+
+import streamlit as st
+
+from views.common import md, pbar, rtag, sbadge
+
+
+def render(ctx):
+    store, ts, rollup = ctx.store, ctx.ts, ctx.rollup
+    col1, col2 = st.columns(2)
+
+    def _fase_table():
+        fase_rows = ""
+        for fase in store.fases:
+            fcnt   = rollup.fase_counts(fase)
+            ftotal = len(store.rows_fase(fase))
+            fdone  = fcnt["concluido"]
+            fwip   = fcnt["em andamento"]
+            fblk   = fcnt["bloqueado"]
+            fpct   = int(fdone / ftotal * 100) if ftotal else 0
+            fase_rows += (
+                f"<tr>"
+                f"<td><strong style='color:#e8f0f8'>{escape(fase)}</strong></td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;text-align:center'>{ftotal}</td>"
+                f"<td style='text-align:center'>{sbadge('concluido')} {fdone}</td>"
+                f"<td style='text-align:center'>{sbadge('em andamento')} {fwip}</td>"
+                f"<td style='text-align:center'>{sbadge('bloqueado')} {fblk}</td>"
+                f"<td>{pbar(fpct)}</td>"
+                f"</tr>"
+            )
+        return (
+            f"<table class='se-tbl'><thead><tr>"
+            f"<th>Fase</th><th>Total</th><th>Concluído</th><th>Andamento</th><th>Bloqueado</th><th>Progresso</th>"
+            f"</tr></thead><tbody>{fase_rows}</tbody></table>"
+        )
+
+    def _resp_table():
+        resp_rows = ""
+        for resp in store.resps:
+            rtotal = len(store.rows_resp(resp))
+            if not rtotal: continue
+            rcnt   = rollup.resp_counts(resp)
+            rdone  = rcnt["concluido"]
+            rblk   = rcnt["bloqueado"]
+            rpct   = int(rdone / rtotal * 100) if rtotal else 0
+            blk_str = f" {sbadge('bloqueado')} {rblk}" if rblk else ""
+            resp_rows += (
+                f"<tr>"
+                f"<td>{rtag(resp)}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;text-align:center'>{rtotal}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;color:#00e676;text-align:center'>{rdone}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;text-align:center'>{rtotal-rdone}</td>"
+                f"<td>{pbar(rpct, '#2E75B6')}{blk_str}</td>"
+                f"</tr>"
+            )
+        return (
+            f"<table class='se-tbl'><thead><tr>"
+            f"<th>Responsável</th><th>Total</th><th>Feito</th><th>Restam</th><th>Progresso</th>"
+            f"</tr></thead><tbody>{resp_rows}</tbody></table>"
+        )
+
+    def _blk_list():
+        boxes = ""
+        for t in store:
+            s = ts[t[1]]
+            if s["status"] == "bloqueado" or s["aviso"]:
+                boxes += (
+                    f'<div class="blk-box">'
+                    f'<div class="blk-id">{escape(t[1])} — {escape(t[2])}</div>'
+                    f'<div class="blk-body">{escape(s["aviso"]) if s["aviso"] else "Marcada como bloqueada"}</div>'
+                    f'<div style="margin-top:5px">{rtag(t[3])} &nbsp; {sbadge(s["status"])}</div>'
+                    f'</div>'
+                )
+        return boxes or '<div class="callout c-ok"><b>Status</b>Nenhum bloqueio ativo 🎉</div>'
+
+    with col1:
+        md('<div class="sec-hdr">Por Fase</div>')
+        md(ctx.cached_html("dash_fase", _fase_table, ctx.as_of))
+
+    with col2:
+        md('<div class="sec-hdr">Por Responsável</div>')
+        md(ctx.cached_html("dash_resp", _resp_table, ctx.as_of))
+
+        md('<br><div class="sec-hdr">Bloqueios e Avisos Ativos</div>')
+        md(ctx.cached_html("dash_blk", _blk_list, ctx.as_of))
@@ -0,0 +1,114 @@
+"""
+nivelamento.py — Página Nivelamento: datas recalculadas pela capacidade de cada responsável
+Mostra a prévia (tarefas adiadas, picos de alocação, novo término) e só grava
+as datas no PlanDB quando o usuário aplica.
+"""
+from datetime import date
+from html import escape
+
+import streamlit as st
+
+import gantt
+from auth import get_permission
+from core.leveling import DEFAULT_CAPACITY, level
+from views.common import md, rtag
+
+PREVIEW_ROWS = 200
+
+
+@st.cache_resource(max_entries=4)
+def leveled(_store, _state, _cpm, plan_id, generation, version, dates_rev, capacity):
+    """Nivelamento por plano, versão, datas e capacidades (``capacity`` como tupla de pares)."""
+    return level(_store, _state, dict(capacity), cpm=_cpm)
+
+
+def apply_leveling(ctx, lev):
+    """Grava as datas niveladas, atualiza o plano em memória e o CPM da sessão."""
+    changes = lev.changes()
+    version = ctx.db.write_dates(
+        ctx.plan_id, {tid: (c["ini"], c["fim"]) for tid, c in changes.items()},
+        author=st.session_state.username,
+    )
+    rev, dates = ctx.db.dates(ctx.plan_id)      # inclui datas gravadas antes por outros processos
+    ctx.store.set_dates(dates, rev)
+    st.session_state.cpm.update(changes)
+    st.session_state.dates_rev = ctx.store.dates_rev
+    ctx.sync_state()
+    return version, len(changes)
+
+
+def render(ctx):
+    store = ctx.store
+    md('<div class="sec-hdr">Nivelamento de recursos <span class="sec-sub">dependências + capacidade por responsável · só adia tarefas</span></div>')
+    md('<div class="callout c-info"><b>Como funciona</b>Informe quantas tarefas cada responsável toca ao mesmo tempo. '
+       'As tarefas pendentes são reagendadas a partir das datas do plano, em ordem de folga; concluídas e em andamento '
+       'não mudam. Confira a prévia antes de aplicar.</div>')
+    if "flash_nivel" in st.session_state:
+        st.success(st.session_state.pop("flash_nivel"))
+
+    cols = st.columns(4)
+    capacity = tuple(
+        (resp, int(cols[k % 4].number_input(resp, min_value=1, max_value=99, value=DEFAULT_CAPACITY, key=f"cap_{resp}")))
+        for k, resp in enumerate(store.resps)
+    )
+    lev = leveled(store, ctx.ts, ctx.cpm, ctx.plan_id, store.generation, st.session_state.state_version, store.dates_rev, capacity)
+    diff = lev.diff()
+
+    after_last = gantt.date_range(store)[1]
+    fim_atual, fim_novo = date.fromordinal(after_last - 1), lev.end()
+    atraso = (fim_novo - fim_atual).days if fim_novo else 0
+    md(f"""
+<div class="kpi-grid">
+  <div class="kpi-card"><div class="kpi-val kpi-amber">{len(diff)}</div><div class="kpi-lbl">Tarefas adiadas</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-muted">{max((r[6] for r in diff), default=0)}d</div><div class="kpi-lbl">Maior adiamento</div></div>
+  <div class="kpi-card"><div class="kpi-val kpi-blue">{fim_atual.strftime("%d/%m/%Y")}</div><div class="kpi-lbl">Término atual</div></div>
+  <div class="kpi-card"><div class="kpi-val {'kpi-red' if atraso > 0 else 'kpi-green'}">{fim_novo.strftime("%d/%m/%Y") if fim_novo else "—"}</div><div class="kpi-lbl">Término nivelado (+{max(atraso, 0)}d)</div></div>
+</div>
+    """)
+
+    if not diff:
+        md('<div class="callout c-ok"><b>Nada a ajustar</b>As datas atuais já respeitam as dependências e a capacidade informada.</div>')
+        return
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        md('<div class="sec-hdr">Pico de alocação</div>')
+        peaks = lev.peaks()
+        rows = "".join(
+            f"<tr><td>{rtag(resp)}</td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;text-align:center'>{cap}</td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;text-align:center;color:{'#ff5252' if peaks[resp][0] > cap else '#8899aa'}'>{peaks[resp][0]}</td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;text-align:center;color:#00e676'>{peaks[resp][1]}</td></tr>"
+            for resp, cap in capacity if resp in peaks
+        )
+        md(
+            f"<table class='se-tbl'><thead><tr><th>Responsável</th><th>Capac.</th><th>Atual</th><th>Nivelado</th>"
+            f"</tr></thead><tbody>{rows}</tbody></table>"
+        )
+
+    with col2:
+        shown = f" · maiores {PREVIEW_ROWS} de {len(diff)}" if len(diff) > PREVIEW_ROWS else ""
+        md(f'<div class="sec-hdr">Prévia <span class="sec-sub">datas atuais → niveladas{shown}</span></div>')
+        rows = "".join(
+            f"<tr>"
+            f"<td style='font-family:IBM Plex Mono,monospace;color:#8899aa'>{escape(tid)}</td>"
+            f"<td><strong style='color:#e8f0f8'>{escape(store.nome[store.index[tid]][:48])}</strong></td>"
+            f"<td>{rtag(resp)}</td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px'>{ini} → <span style='color:#f5a623'>{novo_ini}</span></td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px'>{fim} → <span style='color:#f5a623'>{novo_fim}</span></td>"
+            f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px;text-align:center;color:#ff5252'>+{dias}d</td>"
+            f"</tr>"
+            for tid, resp, ini, fim, novo_ini, novo_fim, dias in diff[:PREVIEW_ROWS]
+        )
+        md(
+            f"<table class='se-tbl'><thead><tr><th>ID</th><th>Tarefa</th><th>Resp.</th><th>Início</th><th>Fim</th><th>Adia</th>"
+            f"</tr></thead><tbody>{rows}</tbody></table>"
+        )
+
+    can_edit = get_permission("can_edit")
+    if st.button(f"⚖️  Aplicar datas niveladas ({len(diff)} tarefas)", type="primary", disabled=not can_edit):
+        version, n = apply_leveling(ctx, lev)
+        st.session_state.flash_nivel = f"✅ Datas de {n} tarefa(s) atualizadas (versão {version} do plano)"
+        st.rerun()
+    if not can_edit:
+        st.caption("👁️ Seu perfil é somente leitura: a prévia fica disponível, mas aplicar exige permissão de edição.")
@@ -0,0 +1,55 @@
+"""
+profiler.py — Página Profiler (somente administradores): hotspots, flame graph e downloads
+"""
+import pandas as pd
+import streamlit as st
+
+from auth import get_permission
+from profiler import Profile, flame_html
+from views import NAV_PAGES
+from views.common import md
+
+
+def start_profiling(script):
+    """Callback do Profiler: liga o perfil e abre a página escolhida; o fim do script reexecuta até completar as execuções."""
+    page, runs = st.session_state.profile_page, int(st.session_state.profile_runs)
+    st.session_state.profiling = {
+        "page": page, "runs": runs, "left": runs, "profile": Profile(root_file=script),
+    }
+    st.session_state.pop("profile_result", None)
+    st.session_state.nav_to = page
+
+
+def render(ctx):
+    md('<div class="sec-hdr">Profiler <span class="sec-sub">cProfile + amostragem · próximas N execuções</span></div>')
+    if not get_permission("can_manage_users"):
+        st.error("Acesso restrito a administradores.")
+        st.stop()
+
+    c1, c2, c3 = st.columns([3, 1, 1])
+    c1.selectbox("Página", NAV_PAGES, key="profile_page")
+    c2.number_input("Execuções", min_value=1, max_value=50, value=5, key="profile_runs")
+    c3.button("▶ Perfilar", type="primary", use_container_width=True, on_click=start_profiling, args=(ctx.script,))
+
+    result = st.session_state.get("profile_result")
+    if result is None:
+        st.caption("Abre a página escolhida e a executa N vezes com o perfil ligado; o resultado aparece aqui.")
+    else:
+        prof = result["profile"]
+        st.caption(
+            f"{result['page']} · {prof.runs} execução(ões) · {prof.wall / max(prof.runs, 1) * 1000:.0f} ms por execução "
+            f"(com o perfil ligado) · {prof.samples} amostras"
+        )
+        sort = st.radio("Ordenar por", ["tottime", "cumtime"], horizontal=True,
+                        format_func={"tottime": "Tempo próprio", "cumtime": "Tempo acumulado"}.get)
+        st.dataframe(
+            pd.DataFrame(prof.hotspots(30, sort), columns=["Função", "Chamadas", "Próprio (s)", "Acumulado (s)"]),
+            hide_index=True, use_container_width=True,
+        )
+        md('<div class="sec-hdr">Flame graph <span class="sec-sub">amostras da thread do script · passe o mouse para detalhes</span></div>')
+        md(flame_html(prof.folded))
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇ Perfil (.prof)", prof.dump(), file_name="rerun.prof",
+                           mime="application/octet-stream", use_container_width=True)
+        d2.download_button("⬇ Pilhas (folded)", prof.folded_text(), file_name="rerun.folded.txt",
+                           mime="text/plain", use_container_width=True)
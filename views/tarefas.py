@@ -0,0 +1,135 @@
+"""
+tarefas.py — Página Tarefas: filtros, ordenação, paginação e exportação do plano
+O arquivo exportado só é montado quando o usuário clica em baixar
+(``data`` do download_button é uma função), não a cada render da página.
+"""
+from functools import partial
+from html import escape
+
+import streamlit as st
+
+from auth import get_permission
+from core import CPMSchedule, plan_export
+from views.common import STATUS_OPT, md, rtag, sbadge
+
+
+# ── Exportação (um arquivo por plano, versão e formato) ────
+@st.cache_resource(max_entries=6)
+def export_artifact(_store, _state, plan_id, generation, version, fmt):
+    """Bytes do arquivo exportado, montados no clique e guardados por versão do plano.
+
+    Roda fora do rerun (thread do download): ``_state`` é uma cópia do estado
+    da sessão e o CPM é recalculado a partir dela, não o da sessão, que os
+    reruns seguintes alteram no lugar.
+    """
+    return plan_export.export_bytes(fmt, _store, _state, CPMSchedule(_store, _state))
+
+
+def render(ctx):
+    store, ts, cpm = ctx.store, ctx.ts, ctx.cpm
+    version = st.session_state.state_version
+    md('<div class="sec-hdr">Tarefas <span class="sec-sub">Filtros abaixo</span></div>')
+
+    fc1, fc2, fc3 = st.columns(3)
+    with fc1:
+        f_fase = st.selectbox("Fase", ["Todas"] + store.fases)
+    with fc2:
+        f_resp = st.selectbox("Responsável", ["Todos"] + store.resps)
+    with fc3:
+        f_status = st.selectbox("Status", ["Todos"] + STATUS_OPT)
+
+    SORT_KEYS = {
+        "ID":          lambda i: i,
+        "Tarefa":      lambda i: store.nome[i],
+        "Fase":        lambda i: store.fase[i],
+        "Responsável": lambda i: store.resp[i],
+        "Início":      lambda i: store.ini[i],
+        "Fim":         lambda i: store.fim[i],
+        "Status":      lambda i: STATUS_OPT.index(ts[store.tid[i]]["status"]),
+        "Folga":       lambda i: cpm.slack(i),
+    }
+    sc1, sc2, sc3 = st.columns(3)
+    with sc1:
+        sort_col = st.selectbox("Ordenar por", list(SORT_KEYS))
+    with sc2:
+        sort_desc = st.selectbox("Ordem", ["Crescente", "Decrescente"]) == "Decrescente"
+    with sc3:
+        page_size = st.selectbox("Por página", [25, 50, 100, 250], index=1)
+
+    # Linhas filtradas/ordenadas: calculadas uma vez por mudança de filtro, ordenação ou versão do plano
+    filt_key = (f_fase, f_resp, f_status, sort_col, sort_desc, ctx.plan_id, version)
+    cached = st.session_state.get("tarefas_rows")
+    if not cached or cached[0] != filt_key:
+        sel_rows = store.select(
+            fase=None if f_fase == "Todas" else f_fase,
+            resp=None if f_resp == "Todos" else f_resp,
+        )
+        if f_status != "Todos":
+            sel_rows = [i for i in sel_rows if ts[store.tid[i]]["status"] == f_status]
+        sel_rows = sorted(sel_rows, key=SORT_KEYS[sort_col], reverse=sort_desc)
+        cached = (filt_key, sel_rows)
+        st.session_state.tarefas_rows = cached
+    sel_rows = cached[1]
+    count    = len(sel_rows)
+    n_pages  = max(1, -(-count // page_size))
+
+    page = st.number_input(
+        f"Página (de {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+        key=f"tarefas_pag_{hash(filt_key[:5])}_{page_size}",
+    )
+    first = (page - 1) * page_size
+
+    def _tarefas_table():
+        rows = ""
+        for i in sel_rows[first:first + page_size]:
+            fase, tid, nome, resp, ini, fim = store.fase[i], store.tid[i], store.nome[i], store.resp[i], store.ini[i], store.fim[i]
+            s  = ts[tid]
+            st_ = s["status"]
+            aviso = s["aviso"]
+            deps = store.deps.get(tid, [])
+
+            dep_str   = escape(", ".join(deps)) if deps else "—"
+            folga     = cpm.slack(i)
+            folga_str = (
+                "<span style='color:#ff5252' title='Caminho crítico'>◆ 0d</span>" if cpm.is_critical(i)
+                else "—" if st_ == "concluido" else f"{folga}d"
+            )
+            warn_icon = ' <span style="color:#ff5252;font-size:10px" title="' + escape(aviso) + '">[!]</span>' if aviso else ""
+            rows += (
+                f"<tr>"
+                f"<td style='font-family:IBM Plex Mono,monospace;color:#8899aa'>{escape(tid)}</td>"
+                f"<td><strong style='color:#e8f0f8'>{escape(nome)}</strong>{warn_icon}</td>"
+                f"<td><span style='font-size:10px;color:#8899aa;font-family:IBM Plex Mono,monospace'>{escape(fase)}</span></td>"
+                f"<td>{rtag(resp)}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px'>{ini}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px'>{fim}</td>"
+                f"<td>{sbadge(st_)}</td>"
+                f"<td style='font-family:IBM Plex Mono,monospace;font-size:10px;text-align:center'>{folga_str}</td>"
+                f"<td><span style='font-size:10px;color:#8899aa;font-family:IBM Plex Mono,monospace'>{dep_str}</span></td>"
+                f"</tr>"
+            )
+        return (
+            f"<table class='se-tbl'><thead><tr>"
+            f"<th>ID</th><th>Tarefa</th><th>Fase</th><th>Responsável</th><th>Início</th><th>Fim</th><th>Status</th><th>Folga</th><th>Depende de</th>"
+            f"</tr></thead><tbody>{rows}</tbody></table>"
+        )
+
+    shown = f"{first + 1}–{min(first + page_size, count)} de {count}" if count else "0"
+    md(f'<div style="font-size:11px;color:#8899aa;font-family:IBM Plex Mono,monospace;margin-bottom:10px">{shown} tarefa(s) exibida(s)</div>')
+    md(ctx.cached_html("tarefas", _tarefas_table, filt_key[:5], first, page_size))
+
+    if get_permission("can_export"):
+        with st.expander("⬇️ Exportar plano completo"):
+            ec1, ec2 = st.columns([1, 2])
+            with ec1:
+                fmt = st.selectbox("Formato", plan_export.formats(), format_func=str.upper)
+            with ec2:
+                st.caption("Plano, status, avisos, dependências pendentes, folga e caminho crítico")
+                st.download_button(
+                    f"Baixar {fmt.upper()}",
+                    data=partial(export_artifact, store, dict(ts), ctx.plan_id, store.generation, version, fmt),
+                    file_name=f"{ctx.plan_id}_v{version}.{fmt}",
+                    mime=plan_export.MIME[fmt],
+                    on_click="ignore",
+                    use_container_width=True,
+                )
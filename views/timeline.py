@@ -0,0 +1,69 @@
+"""
+timeline.py — Página Timeline: Gantt em SVG com zoom, fases recolhíveis e caminho crítico
+"""
+from datetime import date
+from html import escape
+
+import streamlit as st
+
+import gantt
+from views.common import md
+
+
+@st.cache_resource(max_entries=8)
+def gantt_geometry(_store, plan_id, generation, dates_rev, zoom):
+    """Offsets/larguras das barras do Gantt, calculados uma vez por plano (e datas) e zoom."""
+    return gantt.bar_geometry(_store, zoom)
+
+
+def render(ctx):
+    store, ts, cpm = ctx.store, ctx.ts, ctx.cpm
+    g_ini, g_end = gantt.date_range(store)
+    g_ini_str = date.fromordinal(g_ini).strftime("%d/%m/%Y")
+    g_fim_str = date.fromordinal(g_end - 1).strftime("%d/%m/%Y")
+    md(f'<div class="sec-hdr">Timeline <span class="sec-sub">{g_ini_str} → {g_fim_str} · Gantt</span></div>')
+
+    gc1, gc2 = st.columns([1, 3])
+    with gc1:
+        zoom = st.radio("Zoom", list(gantt.ZOOM_PX), horizontal=True)
+    with gc2:
+        # Planos grandes começam com as fases recolhidas
+        collapsed = st.multiselect(
+            "Recolher fases", store.fases,
+            default=store.fases if len(store) > 500 else [],
+        )
+
+    def _gantt():
+        return (
+            "<div style='overflow-x:auto;background:#0d1322;border:1px solid #1a2235;border-radius:6px;padding:6px 0'>"
+            + gantt.render_svg(
+                store, ts, zoom=zoom, collapsed=collapsed, cpm=cpm, fases=store.fases,
+                geometry=gantt_geometry(store, ctx.plan_id, store.generation, store.dates_rev, zoom),
+            )
+            + "</div>"
+        )
+
+    md(ctx.cached_html("gantt", _gantt, zoom, tuple(collapsed), ctx.as_of))
+
+    # Legenda
+    md("""
+    <div style="display:flex;gap:16px;margin-top:12px;flex-wrap:wrap">
+      <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:#8899aa">
+        <div style="width:20px;height:8px;background:linear-gradient(90deg,#1F4E79,#2E75B6);border-radius:1px"></div>Pendente</div>
+      <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:#8899aa">
+        <div style="width:20px;height:8px;background:linear-gradient(90deg,#1a5c35,#00e676);border-radius:1px"></div>Concluído</div>
+      <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:#8899aa">
+        <div style="width:20px;height:8px;background:linear-gradient(90deg,#5c3a0a,#f5a623);border-radius:1px"></div>Em Andamento</div>
+      <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:#8899aa">
+        <div style="width:20px;height:8px;background:linear-gradient(90deg,#5c0a0a,#ff5252);border-radius:1px"></div>Bloqueado</div>
+      <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:#8899aa">
+        <div style="width:20px;height:8px;box-shadow:inset 0 0 0 1px #ff5252;border-radius:1px"></div>Caminho crítico</div>
+    </div>
+    """)
+
+    crit = cpm.critical_path()
+    if crit:
+        md(
+            f'<div class="callout c-warn"><b>Caminho crítico · término previsto {cpm.date_of(cpm.finish - 1).strftime("%d/%m/%Y")}</b>'
+            f'{escape(" → ".join(crit))}</div>'
+        )